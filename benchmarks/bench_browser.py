@@ -0,0 +1,186 @@
+"""Time the hot paths of the browser on small and large pages.
+
+Run it with ``python benchmarks/bench_browser.py``.  Each operation is timed
+on a fresh page prepared outside of the timing, the best and median of the
+repetitions are reported in milliseconds.
+
+``--save`` stores the results in ``benchmarks/results/<version>.json``
+together with the Python version and the machine they were measured on;
+``--compare FILE`` compares the results with stored ones and exits with 1 if
+an operation got slower by more than ``--threshold``.  Only compare results
+measured on the same machine.
+"""
+
+import argparse
+import datetime
+import importlib.metadata
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+
+from zope.testbrowser.browser import Browser
+from zope.testbrowser.ftests.pagegen import PageApplication
+
+
+RESULTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+SIZES = {
+    'small': {'forms': 1, 'controls': 10, 'links': 10, 'selects': 1,
+              'options': 10, 'cookies': 5},
+    'large': {'forms': 6, 'controls': 250, 'links': 1000, 'selects': 1,
+              'options': 500, 'cookies': 50},
+}
+
+
+def opened(app):
+    browser = Browser(wsgi_app=app)
+    browser.open('http://localhost/')
+    return browser
+
+
+def parsed(app):
+    browser = opened(app)
+    browser.title
+    return browser
+
+
+def operations(size):
+    """Return (name, setup, operation) of the operations to time.
+
+    `setup` returns the argument `operation` is called with.
+    """
+    last = size['controls'] - 1
+    forms = size['forms'] - 1
+    label = 'Field %d.%d' % (forms, last)
+    name = 'f%d.c%d' % (forms, last)
+    link = 'Item %d' % (size['links'] - 1)
+    option = 'Option %d' % (size['options'] - 1)
+    cookie = 'cookie%d' % (size['cookies'] - 1)
+
+    def select(app):
+        return parsed(app).getControl(name='f%d.s0' % forms)
+
+    def display(control):
+        control.displayValue = [option]
+        return control.displayValue
+
+    def visited(app):
+        browser = opened(app)
+        browser.open('http://localhost/other')
+        return browser
+
+    return [
+        ('open', lambda app: Browser(wsgi_app=app),
+         lambda browser: browser.open('http://localhost/')),
+        ('parse', opened, lambda browser: browser.title),
+        ('getControl(label)', parsed,
+         lambda browser: browser.getControl(label)),
+        ('getControl(name)', parsed,
+         lambda browser: browser.getControl(name=name)),
+        ('getLink', parsed, lambda browser: browser.getLink(link)),
+        ('Form.submit', lambda app: parsed(app).getForm(index=forms),
+         lambda form: form.submit()),
+        ('ListControl.displayValue', select, display),
+        ('cookies', opened,
+         lambda browser: (browser.cookies[cookie], len(browser.cookies))),
+        ('goBack', visited, lambda browser: browser.goBack()),
+    ]
+
+
+def measure(setup, operation, repeat):
+    times = []
+    for i in range(repeat):
+        argument = setup()
+        times.append(timeit.timeit(lambda: operation(argument), number=1))
+    return {'best': min(times), 'median': statistics.median(times)}
+
+
+def run(repeat):
+    results = {}
+    for size_name, size in SIZES.items():
+        app = PageApplication(**size)
+        for name, setup, operation in operations(size):
+            results[f'{name}[{size_name}]'] = measure(
+                lambda: setup(app), operation, repeat)
+    return results
+
+
+def metadata():
+    return {
+        'version': importlib.metadata.version('zope.testbrowser'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'node': platform.node(),
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(
+            timespec='seconds'),
+    }
+
+
+def report(results, baseline=None, threshold=None):
+    """Print the results, returning the names of the regressed operations."""
+    regressions = []
+    header = '%-36s %10s %10s' % ('operation', 'best [ms]', 'median')
+    if baseline is not None:
+        header += ' %10s %8s' % ('baseline', 'ratio')
+    print(header)
+    for name, timing in results.items():
+        line = '%-36s %10.3f %10.3f' % (
+            name, timing['best'] * 1000, timing['median'] * 1000)
+        before = baseline.get(name) if baseline is not None else None
+        if before is not None:
+            ratio = timing['best'] / before['best']
+            line += ' %10.3f %8.2f' % (before['best'] * 1000, ratio)
+            if ratio > threshold:
+                line += '  slower'
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=7,
+                        help='timings per operation (default: %(default)s)')
+    parser.add_argument('--save', action='store_true',
+                        help='store the results in %s' % RESULTS)
+    parser.add_argument('--output', help='store the results in this file')
+    parser.add_argument('--compare', metavar='FILE',
+                        help='compare with results stored before')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='ratio of the best times above which an '
+                        'operation counts as slower (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            stored = json.load(f)
+        baseline = stored['results']
+        print('compared with %(version)s, Python %(python)s on %(node)s' %
+              stored['metadata'])
+    regressions = report(results, baseline, args.threshold)
+
+    output = args.output
+    if args.save and output is None:
+        output = os.path.join(
+            RESULTS, metadata()['version'] + '.json')
+    if output:
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, 'w') as f:
+            json.dump({'metadata': metadata(), 'results': results}, f,
+                      indent=2, sort_keys=True)
+            f.write('\n')
+        print('results stored in %s' % output)
+    if regressions:
+        print('%d operations got slower' % len(regressions))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""Compare the HTML parser backends on large pages.
+
+Run it with ``python benchmarks/bench_parsers.py``.  For each installed
+backend it reports how long it takes to parse a page and how long a complete
+``open()`` followed by a ``getControl()`` by label takes.
+"""
+
+import importlib.util
+import timeit
+
+from zope.testbrowser.browser import Browser
+from zope.testbrowser.document import Document
+from zope.testbrowser.ftests.pagegen import PageApplication
+from zope.testbrowser.ftests.pagegen import make_page
+
+
+BACKENDS = ('html.parser', 'lxml', 'html5lib')
+
+SHAPE = {'forms': 6, 'controls': 250, 'links': 500}
+
+
+def best_of(func, number, repeat=3):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def main():
+    body = make_page(**SHAPE)
+    app = PageApplication(**SHAPE)
+    text = body.decode('utf-8')
+    print('page size: %d KB' % (len(body) // 1024))
+    print('%-12s %12s %18s' % ('backend', 'parse [ms]', 'open+lookup [ms]'))
+    for backend in BACKENDS:
+        installed = importlib.util.find_spec(backend.split('.')[0])
+        if installed is None:
+            print('%-12s %12s' % (backend, 'not installed'))
+            continue
+
+        def parse():
+            Document(text, backend).forms
+
+        def lookup():
+            browser = Browser(wsgi_app=app)
+            browser.htmlParser = backend
+            browser.open('http://localhost/')
+            browser.getControl('Field 5.249')
+
+        print('%-12s %12.1f %18.1f' % (
+            backend, best_of(parse, 3) * 1000, best_of(lookup, 1) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Time control lookups on a survey-style page with many radio groups.
+
+Run it with ``python benchmarks/bench_radio.py``.  It compares building all
+controls of the form with the radio buttons grouped by name up front against
+scanning all elements of the form for every group.
+"""
+
+import timeit
+
+import webtest
+
+from zope.testbrowser.browser import Browser
+from zope.testbrowser.browser import controlFactory
+from zope.testbrowser.ftests.pagegen import PageApplication
+
+
+def build_controls(browser, form, grouped):
+    elems = form.elements
+    elemsbyname = None
+    if grouped:
+        elemsbyname = {}
+        for elem in elems:
+            elemsbyname.setdefault(elem.attrs.get('name'), []).append(elem)
+    for cname, wtcontrol in form.field_order:
+        if not isinstance(wtcontrol, webtest.forms.Checkbox):
+            controlFactory(cname, [wtcontrol], elems, browser, elemsbyname)
+
+
+def main():
+    app = PageApplication(controls=0, links=0, radio_groups=500)
+    browser = Browser(wsgi_app=app)
+    browser.open('http://localhost/')
+    form = browser._response.forms[0]
+    print('%-32s %10s' % ('operation', 'time [ms]'))
+    for grouped, title in ((True, 'build controls, grouped by name'),
+                           (False, 'build controls, linear scan')):
+        seconds = min(timeit.repeat(
+            lambda: build_controls(browser, form, grouped),
+            number=1, repeat=3))
+        print('%-32s %10.1f' % (title, seconds * 1000))
+
+    def lookup():
+        browser.open('http://localhost/')
+        browser.getControl(name='f0.q499').value = ['4']
+        browser.getControl('Answer 0.250.3').selected = True
+
+    seconds = min(timeit.repeat(lookup, number=1, repeat=3))
+    print('%-32s %10.1f' % ('open and select two answers', seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
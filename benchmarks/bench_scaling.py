@@ -0,0 +1,68 @@
+"""Show how lookups of the browser grow with the size of pages.
+
+Run it with ``python benchmarks/bench_scaling.py [SIZE ...]``.  Each lookup
+is timed on pages generated by ``zope.testbrowser.ftests.pagegen`` with SIZE
+elements of its kind, on an already parsed page.  The last column is the
+growth of the time from the previous size divided by the growth of the size,
+about 1 for lookups linear in the size of the page, 0 for constant ones.
+"""
+
+import math
+import sys
+import timeit
+
+from zope.testbrowser.browser import Browser
+from zope.testbrowser.ftests.pagegen import PageApplication
+
+
+SIZES = (10, 100, 1000)
+
+
+def lookups(n):
+    """Return (name, page shape, lookup) of the lookups to time."""
+    last = n - 1
+    return [
+        ('getControl(label)', {'controls': n},
+         lambda browser: browser.getControl('Field 0.%d' % last)),
+        ('getControl(label), nested', {'controls': n, 'nesting': 10},
+         lambda browser: browser.getControl('Field 0.%d' % last)),
+        ('getControl(name)', {'controls': n},
+         lambda browser: browser.getControl(name='f0.c%d' % last)),
+        ('getLink', {'links': n},
+         lambda browser: browser.getLink('Item %d' % last)),
+        ('radio group by label', {'controls': 0, 'radio_groups': n},
+         lambda browser: browser.getControl('Answer 0.%d.4' % last)),
+        ('displayValue, options', {'controls': 0, 'selects': 1, 'options': n},
+         lambda browser: setattr(browser.getControl(name='f0.s0'),
+                                 'displayValue', ['Option %d' % last])),
+    ]
+
+
+def measure(app, lookup, repeat=3):
+    times = []
+    for i in range(repeat):
+        browser = Browser(wsgi_app=app)
+        browser.open('http://localhost/')
+        browser.title
+        times.append(timeit.timeit(lambda: lookup(browser), number=1))
+    return min(times)
+
+
+def main(sizes=SIZES):
+    print('%-30s %8s %12s %8s' % ('lookup', 'size', 'time [ms]', 'growth'))
+    for index in range(len(lookups(1))):
+        previous = None
+        for n in sizes:
+            name, shape, lookup = lookups(n)[index]
+            seconds = measure(PageApplication(**shape), lookup)
+            growth = ''
+            if previous is not None:
+                growth = '%8.2f' % (
+                    math.log(seconds / previous[1]) /
+                    math.log(n / previous[0]))
+            print('%-30s %8d %12.3f %8s' % (name, n, seconds * 1000, growth))
+            previous = n, seconds
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1:]] or SIZES)
@@ -24,7 +24,14 @@ with open('CHANGES.rst') as f:
 
 long_description = (README + '\n\n' + CHANGES)
 
-tests_require = ['zope.testing', 'mock', 'zope.testrunner >= 6.4']
+tests_require = [
+    'zope.testing',
+    'mock',
+    'zope.testrunner >= 6.4',
+    # run the parser compatibility tests against these backends
+    'lxml',
+    'html5lib',
+]
 
 setup(
     name='zope.testbrowser',
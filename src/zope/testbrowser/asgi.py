@@ -0,0 +1,154 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Calling ASGI applications in-process
+"""
+
+import asyncio
+import http
+import inspect
+import threading
+
+
+__docformat__ = "reStructuredText"
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def is_asgi_app(app):
+    """Tell whether `app` is an ASGI 3 application rather than a WSGI one."""
+    if isinstance(app, ASGIAdapter):
+        return False
+    return (inspect.iscoroutinefunction(app) or
+            inspect.iscoroutinefunction(getattr(app, '__call__', None)))
+
+
+def get_loop():
+    """Return the event loop ASGI applications are run in for WSGI callers.
+
+    It is shared by all adapters and runs in a daemon thread, started on the
+    first request.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name='zope.testbrowser.asgi')
+            thread.daemon = True
+            thread.start()
+            _loop = loop
+    return _loop
+
+
+def make_scope(environ):
+    """Build the ASGI connection scope of an HTTP request from `environ`."""
+    headers = []
+    for key, value in environ.items():
+        if key.startswith('HTTP_'):
+            name = key[5:].replace('_', '-')
+        elif key in ('CONTENT_TYPE', 'CONTENT_LENGTH') and value:
+            name = key.replace('_', '-')
+        else:
+            continue
+        headers.append((name.lower().encode('latin-1'),
+                        value.encode('latin-1')))
+    raw_path = environ.get('PATH_INFO', '').encode('latin-1')
+    root_path = environ.get('SCRIPT_NAME', '').encode('latin-1')
+    protocol = environ.get('SERVER_PROTOCOL', 'HTTP/1.1')
+    return {
+        'type': 'http',
+        'asgi': {'version': '3.0', 'spec_version': '2.3'},
+        'http_version': protocol.partition('/')[2] or '1.1',
+        'method': environ['REQUEST_METHOD'],
+        'scheme': environ.get('wsgi.url_scheme', 'http'),
+        'path': (root_path + raw_path).decode('utf-8', 'replace'),
+        'raw_path': root_path + raw_path,
+        'query_string': environ.get('QUERY_STRING', '').encode('latin-1'),
+        'root_path': root_path.decode('utf-8', 'replace'),
+        'headers': headers,
+        'client': (environ.get('REMOTE_ADDR', '127.0.0.1'), 0),
+        'server': (environ.get('SERVER_NAME', 'localhost'),
+                   int(environ.get('SERVER_PORT') or 80)),
+        'extensions': {},
+    }
+
+
+class ASGIAdapter:
+    """A WSGI application calling the ASGI application `app`.
+
+    Browsers wrap ASGI applications passed as their `wsgi_app` in an adapter.
+    Requests of synchronous callers are run in the event loop returned by
+    `get_loop`, so requests of several threads are handled concurrently.
+    `handle` can be awaited to run a request in the event loop of the
+    caller, which ``AsyncBrowser`` does.
+
+    Only the ``http`` scope is supported, lifespan events are not sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def handle(self, environ, body):
+        """Run a request, returning status, reason, headers and body."""
+        scope = make_scope(environ)
+        done = asyncio.Event()
+        sent = False
+        response = {}
+        parts = []
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {'type': 'http.request', 'body': body,
+                        'more_body': False}
+            await done.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+                response['headers'] = [
+                    (name.decode('latin-1'), value.decode('latin-1'))
+                    for name, value in message.get('headers', ())]
+            elif message['type'] == 'http.response.body':
+                if 'status' not in response:
+                    raise RuntimeError(
+                        'http.response.body sent before http.response.start')
+                parts.append(message.get('body', b''))
+                if not message.get('more_body', False):
+                    done.set()
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            done.set()
+        if 'status' not in response:
+            raise RuntimeError('ASGI application sent no response')
+        status = response['status']
+        try:
+            reason = http.HTTPStatus(status).phrase
+        except ValueError:
+            reason = 'Unknown'
+        return status, reason, response['headers'], b''.join(parts)
+
+    def __call__(self, environ, start_response):
+        length = environ.get('CONTENT_LENGTH')
+        body = environ['wsgi.input'].read(int(length)) if length else b''
+        future = asyncio.run_coroutine_threadsafe(
+            self.handle(environ, body), get_loop())
+        status, reason, headers, body = future.result()
+        start_response(f'{status} {reason}', headers)
+        return [body]
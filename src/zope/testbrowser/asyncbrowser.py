@@ -0,0 +1,199 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""A browser for asyncio, to drive many sessions from one thread
+"""
+
+import asyncio
+import functools
+import time
+import urllib.parse
+import urllib.request
+
+import webtest
+import webtest.utils
+
+from zope.testbrowser import utils
+from zope.testbrowser.asgi import ASGIAdapter
+from zope.testbrowser.browser import REDIRECTS
+from zope.testbrowser.browser import Browser
+from zope.testbrowser.browser import TestbrowserApp
+from zope.testbrowser.pool import AsyncConnectionPool
+
+
+__docformat__ = "reStructuredText"
+
+# The environ key a response fetched over asyncio is passed in to webtest
+RESPONSE_KEY = 'zope.testbrowser.asyncbrowser.response'
+
+HOP_BY_HOP = ('connection', 'keep-alive', 'transfer-encoding', 'upgrade',
+              'proxy-authenticate', 'proxy-authorization', 'te', 'trailer')
+
+
+class PendingRequest:
+    """A request webtest prepared, to be sent by `AsyncTestbrowserApp`."""
+
+    def __init__(self, req, status, expect_errors):
+        self.req = req
+        self.status = status
+        self.expect_errors = expect_errors
+
+
+class ReplayApp:
+    """Answer requests carrying a response fetched before, else call `app`."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def __call__(self, environ, start_response):
+        fetched = environ.pop(RESPONSE_KEY, None)
+        if fetched is None:
+            return self.app(environ, start_response)
+        status, reason, headers, body = fetched
+        start_response(f'{status} {reason}', [
+            (name, value) for name, value in headers
+            if name.lower() not in HOP_BY_HOP])
+        return [body]
+
+
+class AsyncTestbrowserApp(TestbrowserApp):
+    """A `TestbrowserApp` which sends its requests with `send()`.
+
+    `do_request` only returns the prepared request, so the code of the
+    browser and of webtest building requests is used unchanged.  `send`
+    runs WSGI applications in `executor`, awaits ASGI applications and talks
+    to real servers over `pool`.
+    """
+
+    executor = None
+    pool = None
+
+    def __init__(self, app, *args, **kw):
+        super().__init__(ReplayApp(app), *args, **kw)
+
+    def do_request(self, req, status=None, expect_errors=None):
+        return PendingRequest(req, status, expect_errors)
+
+    async def send(self, pending):
+        """Send a request returned by `do_request`, returning the response."""
+        loop = asyncio.get_running_loop()
+        req = pending.req
+        if isinstance(self.app.app, ASGIAdapter):
+            self._assertAllowed(req.url)
+            # as webtest does before calling an application
+            self.cookiejar.add_cookie_header(
+                webtest.utils._RequestCookieAdapter(req))
+            start = time.perf_counter()
+            with utils.timed(self.timings, 'app', req.url), \
+                    utils.traced(self.memory, 'app'):
+                req.environ[RESPONSE_KEY] = await self.app.app.handle(
+                    req.environ, req.body)
+                return self._replay(req, pending, start)
+        if self.restricted:
+            return await loop.run_in_executor(self.executor, functools.partial(
+                TestbrowserApp.do_request,
+                self, req, pending.status, pending.expect_errors))
+
+        # robots.txt is cached, it only is fetched now and then
+        await loop.run_in_executor(self.executor, self._assertAllowed, req.url)
+        headers = dict(req.headers)
+        cookies = urllib.request.Request(req.url)
+        self.cookiejar.add_cookie_header(cookies)
+        if cookies.has_header('Cookie'):
+            headers['Cookie'] = cookies.get_header('Cookie')
+        body = req.body if req.content_length else None
+        start = time.perf_counter()
+        with utils.timed(self.timings, 'app', req.url), \
+                utils.traced(self.memory, 'app'):
+            req.environ[RESPONSE_KEY] = await self.pool.request(
+                req.method, req.url, body, headers)
+            return self._replay(req, pending, start)
+
+    def _replay(self, req, pending, start):
+        # Let webtest process the response like any other: merge cookies,
+        # decode the body, set its attributes.
+        response = webtest.TestApp.do_request(
+            self, req, pending.status, pending.expect_errors)
+        if self.recorder is not None:
+            self.recorder.record(req, response, time.perf_counter() - start)
+        response._last_fragment = self._last_fragment
+        return response
+
+
+class AsyncBrowser(Browser):
+    """A `Browser` for asyncio.
+
+    Everything sending a request returns an awaitable: `open`, `post`,
+    `reload`, `follow` and the `click` and `submit` methods of links,
+    controls and forms.  Everything else is the same as for `Browser`.
+
+    Requests to a `wsgi_app` are run in `executor`, the default executor of
+    the event loop if it is None.  ASGI applications are run in the event
+    loop of the browser.  Requests to real servers are sent over the
+    `asyncConnectionPool`.
+    """
+
+    AppClass = AsyncTestbrowserApp
+
+    # The zope.testbrowser.pool.AsyncConnectionPool used for requests to
+    # real servers.  Browsers get one of their own, unless one is set on the
+    # class to be shared by all of them.
+    asyncConnectionPool = None
+
+    # The asyncConnectionPool created for the browser, closed by close()
+    _ownAsyncConnectionPool = None
+
+    def __init__(self, wsgi_app=None, executor=None):
+        super().__init__(wsgi_app=wsgi_app)
+        self.testapp.executor = executor
+        if not self.testapp.restricted:
+            if self.asyncConnectionPool is None:
+                self.asyncConnectionPool = self._ownAsyncConnectionPool = (
+                    AsyncConnectionPool())
+            self.testapp.pool = self.asyncConnectionPool
+
+    def close(self):
+        """See `Browser.close`, closing the browser's own async pool, too.
+
+        The connections of the async pool belong to the event loop, so the
+        browser has to be closed before the loop is.
+        """
+        super().close()
+        if self._ownAsyncConnectionPool is not None:
+            self._ownAsyncConnectionPool.close()
+
+    @property
+    def stats(self):
+        """See `Browser.stats`, with the connections of the async pool."""
+        stats = super().stats
+        if not self.testapp.restricted:
+            stats['connections'] = self.asyncConnectionPool.stats()
+        return stats
+
+    async def _processRequest(self, url, make_request):
+        timings = self._startTimings()
+        with timings.phase('prepare'), self._preparedRequest(url) as reqargs:
+            self._storeResponse()
+            resp = await self.testapp.send(make_request(reqargs))
+            if self.followRedirects:
+                remaining_redirects = 100  # infinite loops protection
+                while resp.status_int in REDIRECTS and remaining_redirects:
+                    remaining_redirects -= 1
+                    self._req_referrer = url
+                    url = self._redirectTarget(url, resp, timings)
+                    with self._preparedRequest(url) as reqargs:
+                        resp = await self.testapp.send(
+                            self.testapp.get(url, **reqargs))
+                assert remaining_redirects > 0, (
+                    "redirects chain looks infinite")
+            self._finishRequest(resp)
@@ -14,24 +14,38 @@
 """Webtest-based Functional Doctest interfaces
 """
 
+import collections
+import collections.abc
+import hashlib
 import http.client
+import http.cookiejar
 import io
 import re
+import threading
 import time
+import tracemalloc
+import urllib.error
 import urllib.parse
 import urllib.request
 import urllib.robotparser
+import weakref
+import zlib
 from contextlib import contextmanager
 
 import webtest
-from bs4 import BeautifulSoup
-from soupsieve import escape as css_escape
+import webtest.app
 from wsgiproxy.proxies import TransparentProxy
 from zope.cachedescriptors.property import Lazy
 from zope.interface import implementer
 
 import zope.testbrowser.cookies
 from zope.testbrowser import interfaces
+from zope.testbrowser import utils
+from zope.testbrowser.asgi import ASGIAdapter
+from zope.testbrowser.asgi import is_asgi_app
+from zope.testbrowser.document import Document
+from zope.testbrowser.document import DocumentForm
+from zope.testbrowser.pool import ConnectionPool
 
 
 __docformat__ = "reStructuredText"
@@ -56,12 +70,328 @@ _allowed_2nd_level = {'example.com', 'example.net', 'example.org'}
 _allowed = {'localhost', '127.0.0.1'}
 _allowed.update(_allowed_2nd_level)
 
-REDIRECTS = (301, 302, 303, 307)
+REDIRECTS = (301, 302, 303, 307, 308)
+PERMANENT_REDIRECTS = (301, 308)
+
+
+def _proxied(url):
+    """Tell whether the ``*_proxy`` environment variables apply to `url`."""
+    parts = urllib.parse.urlsplit(url)
+    return (parts.scheme in urllib.request.getproxies() and
+            not urllib.request.proxy_bypass(parts.netloc))
+
+
+class RobotsCache:
+    """Parsed robots.txt files, cached per scheme and host.
+
+    An entry is reused for `ttl` seconds, unless the robots.txt response
+    carries ``Cache-Control`` or ``Expires`` headers, which then decide its
+    lifetime.  RFC 9309 asks crawlers not to use a cached robots.txt for more
+    than 24 hours, so no entry lives longer than `max_ttl` seconds.  At most
+    `maxsize` hosts are remembered, the least recently used one is dropped
+    first.
+
+    The files are fetched through `pool`, a
+    `zope.testbrowser.pool.ConnectionPool`, if one is given.
+    """
+
+    def __init__(self, ttl=3600, maxsize=128, max_ttl=86400, pool=None):
+        self.ttl = ttl
+        self.pool = pool
+        self.maxsize = maxsize
+        self.max_ttl = max_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()  # key -> (expires, parser)
+
+    def _now(self):
+        return time.time()
+
+    def _key(self, url):
+        parsed = urllib.parse.urlsplit(url)
+        return (parsed.scheme.lower(), parsed.netloc.lower())
+
+    def get(self, url):
+        """Return a `RobotFileParser` for the host `url` points to."""
+        key = self._key(url)
+        now = self._now()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        rp, lifetime = self._fetch(key, now)
+        if lifetime > 0:
+            self._entries[key] = (now + lifetime, rp)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.pop(key, None)
+        return rp
+
+    def invalidate(self, url=None):
+        """Forget the robots.txt of the host of `url`, or of all hosts."""
+        if url is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(self._key(url), None)
+
+    def stats(self):
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries)}
+
+    def _fetch(self, key, now):
+        robotsurl = urllib.parse.urlunsplit(key + ('/robots.txt', '', ''))
+        rp = urllib.robotparser.RobotFileParser()
+        rp.set_url(robotsurl)
+        code, headers, raw = self._open(robotsurl)
+        if code in (401, 403):
+            rp.disallow_all = True
+        elif 300 <= code < 500:
+            # not found, or still redirecting after 5 hops
+            rp.allow_all = True
+        elif code >= 500:
+            # server errors are transient, fetch again next time
+            return rp, 0
+        else:
+            rp.parse(raw.decode('utf-8').splitlines())
+
+        lifetime = utils.freshness_lifetime(headers, now, self.ttl)
+        return rp, min(lifetime, self.max_ttl)
+
+    def _open(self, url):
+        """Return the status code, headers and body of `url`.
+
+        Network errors are raised as `urllib.error.URLError`, as by
+        ``urlopen``, which is used if a proxy is configured for `url`.
+        """
+        if self.pool is not None and not _proxied(url):
+            try:
+                for hop in range(6):
+                    response, raw = self.pool.request('GET', url)
+                    location = response.getheader('Location')
+                    if response.status not in REDIRECTS or not location:
+                        break
+                    url = urllib.parse.urljoin(url, location)
+            except OSError as err:
+                raise urllib.error.URLError(err)
+            return response.status, response.headers, raw
+
+        # This is what RobotFileParser.read() does, but we need the headers
+        # of the response to know how long we may keep it.
+        try:
+            f = urllib.request.urlopen(url)
+        except urllib.error.HTTPError as err:
+            err.close()
+            return err.code, err.headers or {}, b''
+        with f:
+            return 200, f.headers, f.read()
+
+
+class RedirectCache:
+    """The targets of permanent redirects, by the URL redirected.
+
+    301 and 308 responses to GET requests are remembered, so that browsers
+    can go straight to the target when they open the URL again.  At most
+    `maxsize` URLs are remembered, the least recently used one is dropped
+    first.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._targets = collections.OrderedDict()  # url -> target
+
+    def add(self, url, target):
+        url = urllib.parse.urldefrag(url)[0]
+        if url == urllib.parse.urldefrag(target)[0]:
+            return
+        self._targets[url] = target
+        self._targets.move_to_end(url)
+        while len(self._targets) > self.maxsize:
+            self._targets.popitem(last=False)
+
+    def resolve(self, url):
+        """Return the URL `url` is permanently redirected to and the hops.
+
+        The hops are (url, target) tuples, none if `url` isn't known to be
+        redirected.  A chain of redirects is followed to its end, or until it
+        loops.  The fragment of `url` is kept unless the target has one.
+        """
+        key, fragment = urllib.parse.urldefrag(url)
+        target = self._targets.get(key)
+        if target is None:
+            self.misses += 1
+            return url, []
+        self.hits += 1
+        hops = []
+        seen = {key}
+        while target is not None:
+            self._targets.move_to_end(key)
+            hops.append((key, target))
+            url = target
+            key = urllib.parse.urldefrag(target)[0]
+            if key in seen:
+                break
+            seen.add(key)
+            target = self._targets.get(key)
+        if fragment and not urllib.parse.urldefrag(url)[1]:
+            url = f'{key}#{fragment}'
+        return url, hops
+
+    def invalidate(self, url=None):
+        """Forget the target of `url`, or all of them."""
+        if url is None:
+            self._targets.clear()
+        else:
+            self._targets.pop(urllib.parse.urldefrag(url)[0], None)
+
+    def stats(self):
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._targets)}
+
+
+class HeaderView(collections.abc.Mapping):
+    """The status and headers of a response, read only.
+
+    `status` is the status line, like ``'200 OK'``, split into the integer
+    `status_code` and the `reason`.
+
+    Header names are case-insensitive.  Like with ``http.client.HTTPMessage``
+    the first value of a repeated header is returned, all of them by
+    `get_all`.
+    """
+
+    def __init__(self, status, headerlist):
+        self.status = status
+        code, _, reason = status.partition(' ')
+        self.status_code = int(code)
+        self.reason = reason
+        self._items = sorted(headerlist)
+        self._values = {}
+        for name, value in self._items:
+            self._values.setdefault(name.lower(), []).append(value)
+
+    def __getitem__(self, name):
+        return self._values[name.lower()][0]
+
+    def __contains__(self, name):
+        return name.lower() in self._values
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def get_all(self, name, failobj=None):
+        return list(self._values.get(name.lower(), ())) or failobj
+
+    def items(self):
+        """All headers as (name, value) pairs, sorted by name."""
+        return list(self._items)
+
+    def message(self):
+        """Return a new ``http.client.HTTPMessage`` with a ``Status`` line."""
+        msg = http.client.HTTPMessage()
+        msg['Status'] = self.status
+        for name, value in self._items:
+            msg[name] = value
+        return msg
+
+
+class TestbrowserResponse(webtest.TestResponse):
+    """A response whose body is parsed only once.
+
+    `html` and `forms` are both derived from the same `document`.
+    """
+
+    parse_cache = None
+    # The RequestTimings and RequestMemory of the request the response
+    # answered
+    timings = None
+    memory = None
+
+    @Lazy
+    def document(self):
+        with utils.timed(self.timings, 'parse'), \
+                utils.traced(self.memory, 'parse'):
+            if self.parse_cache is None:
+                return Document(self.testbody, self.parser_features)
+            return self.parse_cache.get(
+                self.body, self.charset, self.parser_features,
+                lambda: self.testbody)
+
+    @Lazy
+    def header_view(self):
+        return HeaderView(self.status, self.headerlist)
+
+    @property
+    def html(self):
+        if 'html' not in self.content_type:
+            raise AttributeError(
+                "Not an HTML response body (content-type: %s)"
+                % self.content_type)
+        return self.document.soup
+
+    def _parse_forms(self):
+        forms = self._forms_indexed = {}
+        for i, element in enumerate(self.document.forms):
+            form = DocumentForm(self, self.document, element)
+            forms[i] = form
+            if form.id:
+                forms[form.id] = form
+
+
+class TestbrowserRequest(webtest.TestRequest):
+    ResponseClass = TestbrowserResponse
+
+
+class TimedCookieJar(zope.testbrowser.cookies.IndexedCookieJar):
+    """A cookie jar timing its work as the ``cookies`` phase of requests."""
+
+    def __init__(self, app, policy=None):
+        super().__init__(policy)
+        self.app = app
+
+    def add_cookie_header(self, request):
+        with utils.timed(self.app.timings, 'cookies'):
+            super().add_cookie_header(request)
+
+    def extract_cookies(self, response, request):
+        with utils.timed(self.app.timings, 'cookies'):
+            super().extract_cookies(response, request)
 
 
 class TestbrowserApp(webtest.TestApp):
     _last_fragment = ""
     restricted = False
+    RequestClass = TestbrowserRequest
+    # A zope.testbrowser.httpcache.HTTPCache, see Browser.httpCache
+    http_cache = None
+    # A recorder of the requests sent, see Browser.recorder
+    recorder = None
+    # A zope.testbrowser.profiling.Profiler, see Browser.profiler
+    profiler = None
+    # The RequestTimings and RequestMemory of the request in progress
+    timings = None
+    memory = None
+
+    def __init__(self, app, *args, **kw):
+        if kw.get('cookiejar') is None:
+            kw['cookiejar'] = TimedCookieJar(
+                self, policy=webtest.app.CookiePolicy())
+        super().__init__(app, *args, **kw)
+
+    @Lazy
+    def robots(self):
+        return RobotsCache()
 
     def _assertAllowed(self, url):
         parsed = urllib.parse.urlparse(url)
@@ -76,12 +406,8 @@ class TestbrowserApp(webtest.TestApp):
 
             raise HostNotAllowed(url)
         else:
-            # Unrestricted mode: retrieve robots.txt and check against it
-            robotsurl = urllib.parse.urlunsplit(
-                (parsed.scheme, parsed.netloc, '/robots.txt', '', ''))
-            rp = urllib.robotparser.RobotFileParser()
-            rp.set_url(robotsurl)
-            rp.read()
+            # Unrestricted mode: check against the host's robots.txt
+            rp = self.robots.get(url)
             if not rp.can_fetch("*", url):
                 msg = "request disallowed by robots.txt"
                 raise RobotExclusionError(url, 403, msg, [], None)
@@ -89,13 +415,34 @@ class TestbrowserApp(webtest.TestApp):
     def do_request(self, req, status, expect_errors):
         self._assertAllowed(req.url)
 
-        response = super().do_request(req, status,
-                                      expect_errors)
+        def send(req):
+            return self._send(req, status, expect_errors)
+
+        if self.http_cache is None:
+            response = send(req)
+        else:
+            response = self.http_cache.request(self, req, send)
         # Store _last_fragment in response to preserve fragment for history
         # (goBack() will not lose fragment).
         response._last_fragment = self._last_fragment
         return response
 
+    def _send(self, req, status, expect_errors):
+        # Send a request to the application, unlike cached responses they
+        # are recorded.
+        with utils.timed(self.timings, 'app', req.url), \
+                utils.traced(self.memory, 'app'):
+            start = time.perf_counter()
+            if self.profiler is None:
+                response = super().do_request(req, status, expect_errors)
+            else:
+                with self.profiler.profiling(req.url):
+                    response = super().do_request(req, status, expect_errors)
+            if self.recorder is not None:
+                self.recorder.record(
+                    req, response, time.perf_counter() - start)
+            return response
+
     def _remove_fragment(self, url):
         # HACK: we need to preserve fragment part of url, but webtest strips it
         # from url on every request. So we override this protected method,
@@ -137,7 +484,52 @@ class Browser(SetattrErrorsMixin):
     _req_content_type = None
     _req_referrer = None
     _history = None
-    __html = None
+    _links = None
+    lastRequestTimings = None
+    lastRequestMemory = None
+
+    AppClass = TestbrowserApp
+
+    # BeautifulSoup tree builder used to parse HTML: 'html.parser', 'lxml',
+    # 'html5lib' or a TreeBuilder.  Set it on the class to change the default
+    # of all browsers.
+    htmlParser = 'html.parser'
+
+    # A zope.testbrowser.document.ParseCache to reuse parsed pages, shared
+    # with all browsers using the same cache.  Off by default.
+    parseCache = None
+
+    # The zope.testbrowser.pool.ConnectionPool used for requests to real
+    # servers.  Browsers without a `wsgi_app` get a pool of their own, unless
+    # one is set on the class to be shared by all of them.
+    connectionPool = None
+
+    # The connectionPool created for the browser, closed by close()
+    _ownConnectionPool = None
+
+    # A zope.testbrowser.httpcache.HTTPCache storing responses as their
+    # Cache-Control and Expires headers allow.  Off by default.
+    httpCache = None
+
+    # A zope.testbrowser.recording.Recorder capturing the requests sent,
+    # including redirects, or a zope.testbrowser.har.HARLog writing them to
+    # a HAR file.  Off by default.
+    recorder = None
+
+    # A zope.testbrowser.profiling.Profiler profiling the application while
+    # it answers requests.  Off by default.
+    profiler = None
+
+    # Whether to measure the memory allocated by requests with tracemalloc,
+    # see lastRequestMemory.  Off by default.
+    traceMemory = False
+
+    # A RedirectCache of the permanent redirects seen, so that the URLs
+    # redirected are not requested again when opened.  Off by default.
+    redirectCache = None
+
+    # The redirects skipped by open() for the next request
+    _skippedRedirects = ()
 
     def __init__(self, url=None, wsgi_app=None):
         self.timer = Timer()
@@ -146,9 +538,18 @@ class Browser(SetattrErrorsMixin):
         self.followRedirects = True
 
         if wsgi_app is None:
-            self.testapp = TestbrowserApp(TransparentProxy())
+            if self.connectionPool is None:
+                self.connectionPool = self._ownConnectionPool = (
+                    ConnectionPool())
+                # close the connections of browsers discarded unclosed
+                weakref.finalize(self, self._ownConnectionPool.close)
+            self.testapp = self.AppClass(
+                TransparentProxy(client=self.connectionPool))
+            self.testapp.robots.pool = self.connectionPool
         else:
-            self.testapp = TestbrowserApp(wsgi_app)
+            if is_asgi_app(wsgi_app):
+                wsgi_app = ASGIAdapter(wsgi_app)
+            self.testapp = self.AppClass(wsgi_app)
             self.testapp.restricted = True
 
         self._req_headers = {}
@@ -159,6 +560,15 @@ class Browser(SetattrErrorsMixin):
         if url is not None:
             self.open(url)
 
+    def close(self):
+        """Close the idle connections of the browser's own connection pool.
+
+        A pool set on the class is shared with other browsers and left open.
+        The browser can still be used afterwards, it opens new connections.
+        """
+        if self._ownConnectionPool is not None:
+            self._ownConnectionPool.close()
+
     @property
     def url(self):
         """See zope.testbrowser.interfaces.IBrowser"""
@@ -176,16 +586,33 @@ class Browser(SetattrErrorsMixin):
         """See zope.testbrowser.interfaces.IBrowser"""
         return self.timer.elapsedSeconds
 
+    @property
+    def stats(self):
+        """Counters of the caches and the history of the browser."""
+        stats = {'robots': self.testapp.robots.stats()}
+        if self.parseCache is not None:
+            stats['parse'] = self.parseCache.stats()
+        if self.httpCache is not None:
+            stats['http'] = self.httpCache.stats()
+        if self.redirectCache is not None:
+            stats['redirects'] = self.redirectCache.stats()
+        stats['history'] = self._history.stats()
+        if not self.testapp.restricted:
+            stats['connections'] = self.connectionPool.stats()
+        return stats
+
+    @property
+    def history(self):
+        """The `History` of the browser, to set its limits."""
+        return self._history
+
     @property
     def title(self):
         """See zope.testbrowser.interfaces.IBrowser"""
         if not self.isHtml:
             raise BrowserStateError('not viewing HTML')
 
-        titles = self._html.find_all('title')
-        if not titles:
-            return None
-        return self.toStr(titles[0].text)
+        return self.toStr(self._document.title)
 
     def reload(self):
         """See zope.testbrowser.interfaces.IBrowser"""
@@ -193,11 +620,15 @@ class Browser(SetattrErrorsMixin):
             raise BrowserStateError("no URL has yet been .open()ed")
 
         def make_request(args):
+            if self.httpCache is not None:
+                # like other browsers, ask caches to validate what they have
+                return self.testapp.request(self._response.request,
+                                            cache_control='max-age=0')
             return self.testapp.request(self._response.request)
 
         # _req_referrer is left intact, so will be the referrer (if any) of
         # the request being reloaded.
-        self._processRequest(self.url, make_request)
+        return self._processRequest(self.url, make_request)
 
     def goBack(self, count=1):
         """See zope.testbrowser.interfaces.IBrowser"""
@@ -215,14 +646,12 @@ class Browser(SetattrErrorsMixin):
     @property
     def headers(self):
         """See zope.testbrowser.interfaces.IBrowser"""
-        resptxt = []
-        resptxt.append('Status: %s' % self._response.status)
-        for h, v in sorted(self._response.headers.items()):
-            resptxt.append(str(f"{h}: {v}"))
+        return self._response.header_view.message()
 
-        inp = '\n'.join(resptxt)
-        stream = io.BytesIO(inp.encode('latin1'))
-        return http.client.parse_headers(stream)
+    @property
+    def responseHeaders(self):
+        """See zope.testbrowser.interfaces.IBrowser"""
+        return self._response.header_view
 
     @property
     def cookies(self):
@@ -241,6 +670,8 @@ class Browser(SetattrErrorsMixin):
     def open(self, url, data=None, referrer=None):
         """See zope.testbrowser.interfaces.IBrowser"""
         url = self._absoluteUrl(url)
+        if data is None and self.redirectCache is not None:
+            url, self._skippedRedirects = self.redirectCache.resolve(url)
         if data is not None:
             def make_request(args):
                 return self.testapp.post(url, data, **args)
@@ -249,7 +680,7 @@ class Browser(SetattrErrorsMixin):
                 return self.testapp.get(url, **args)
 
         self._req_referrer = referrer
-        self._processRequest(url, make_request)
+        return self._processRequest(url, make_request)
 
     def post(self, url, data, content_type=None, referrer=None):
         if content_type is not None:
@@ -270,32 +701,70 @@ class Browser(SetattrErrorsMixin):
                 return self._submit(form, coord=coord, **args)
 
         self._req_referrer = self.url
-        self._processRequest(url, make_request)
+        return self._processRequest(url, make_request)
+
+    def _startTimings(self):
+        timings = RequestTimings()
+        timings.skipped.extend(self._skippedRedirects)
+        self._skippedRedirects = ()
+        self.lastRequestTimings = self.testapp.timings = timings
+        memory = None
+        if self.traceMemory:
+            memory = RequestMemory()
+        self.lastRequestMemory = self.testapp.memory = memory
+        return timings
+
+    def _storeResponse(self):
+        with utils.traced(self.lastRequestMemory, 'history'):
+            self._history.add(self._response)
 
     def _processRequest(self, url, make_request):
-        with self._preparedRequest(url) as reqargs:
-            self._history.add(self._response)
+        timings = self._startTimings()
+        with timings.phase('prepare'), self._preparedRequest(url) as reqargs:
+            self._storeResponse()
             resp = make_request(reqargs)
             if self.followRedirects:
                 remaining_redirects = 100  # infinite loops protection
                 while resp.status_int in REDIRECTS and remaining_redirects:
                     remaining_redirects -= 1
                     self._req_referrer = url
-                    url = urllib.parse.urljoin(url, resp.headers['location'])
+                    url = self._redirectTarget(url, resp, timings)
                     with self._preparedRequest(url) as reqargs:
                         resp = self.testapp.get(url, **reqargs)
                 assert remaining_redirects > 0, (
                     "redirects chain looks infinite")
-            self._setResponse(resp)
-            self._checkStatus()
+            self._finishRequest(resp)
+
+    def _redirectTarget(self, url, resp, timings):
+        """Return the URL the redirect `resp` to a request of `url` leads to.
+
+        With a `redirectCache`, permanent redirects of GET requests are
+        remembered and the redirects known to follow are skipped.
+        """
+        target = urllib.parse.urljoin(url, resp.headers['location'])
+        if self.redirectCache is None:
+            return target
+        if (resp.status_int in PERMANENT_REDIRECTS and
+                resp.request.method == 'GET'):
+            self.redirectCache.add(url, target)
+        target, skipped = self.redirectCache.resolve(target)
+        timings.skipped.extend(skipped)
+        return target
+
+    def _finishRequest(self, resp):
+        self.testapp.timings = self.testapp.memory = None
+        resp.timings = self.lastRequestTimings
+        resp.memory = self.lastRequestMemory
+        resp.parser_features = self.htmlParser
+        resp.parse_cache = self.parseCache
+        self._setResponse(resp)
+        self._checkStatus()
 
     def _checkStatus(self):
-        # if the headers don't have a status, I suppose there can't be an error
-        if 'Status' in self.headers:
-            code, msg = self.headers['Status'].split(' ', 1)
-            code = int(code)
-            if self.raiseHttpErrors and code >= 400:
-                raise HTTPError(self.url, code, msg, [], None)
+        code = self._response.status_int
+        if self.raiseHttpErrors and code >= 400:
+            msg = self._response.status.partition(' ')[2]
+            raise HTTPError(self.url, code, msg, [], None)
 
     def _submit(self, form, name=None, index=None, coord=None, **args):
         # A reimplementation of webtest.forms.Form.submit() to allow to insert
@@ -320,31 +789,31 @@ class Browser(SetattrErrorsMixin):
 
     def getLink(self, text=None, url=None, id=None, index=0):
         """See zope.testbrowser.interfaces.IBrowser"""
-        qa = 'a' if id is None else 'a#%s' % css_escape(id)
-        qarea = 'area' if id is None else 'area#%s' % css_escape(id)
-        html = self._html
-        links = html.select(qa)
-        links.extend(html.select(qarea))
-
-        matching = []
-        for elem in links:
-            matches = (isMatching(elem.text, text) and
-                       isMatching(elem.get('href', ''), url))
-
-            if matches:
-                matching.append(elem)
-
-        if index >= len(matching):
+        links = self._linkIndex
+        entry = links.find(text, url, id, index)
+        if entry is None:
             raise LinkNotFoundError()
-        elem = matching[index]
-
-        baseurl = self._getBaseUrl()
+        elem, linktext, href, absurl = entry
+        return Link(elem, self, links.baseurl, absurl)
 
-        return Link(elem, self, baseurl)
+    @property
+    def _linkIndex(self):
+        if self._links is None:
+            # The index is kept with the document, so that it is shared when
+            # the document is.
+            document = self._document
+            baseurl = self._getBaseUrl()
+            links = document.link_indexes.get(baseurl)
+            if links is None:
+                with utils.timed(self._response.timings, 'index'):
+                    links = document.link_indexes[baseurl] = LinkIndex(
+                        document.links, baseurl)
+            self._links = links
+        return self._links
 
     def follow(self, *args, **kw):
         """Select a link and follow it."""
-        self.getLink(*args, **kw).click()
+        return self.getLink(*args, **kw).click()
 
     def _getBaseUrl(self):
         # Look for <base href> tag and use it as base, if it exists
@@ -353,13 +822,7 @@ class Browser(SetattrErrorsMixin):
             return url
 
         # we suspect there is a base tag in body, try to find href there
-        html = self._html
-        if not html.head:
-            return url
-        base = html.head.base
-        if not base:
-            return url
-        return base['href'] or url
+        return self._document.base_href or url
 
     def getForm(self, id=None, name=None, action=None, index=None):
         """See zope.testbrowser.interfaces.IBrowser"""
@@ -368,7 +831,7 @@ class Browser(SetattrErrorsMixin):
         allforms = self._getAllResponseForms()
         for form in allforms:
             if ((id is not None and form.id == id) or
-                (name is not None and form.html.form.get('name') == name) or
+                (name is not None and form.element.get('name') == name) or
                 (action is not None and re.search(action, form.action)) or
                     id == name == action is None):
                 matching_forms.append(form)
@@ -385,13 +848,22 @@ class Browser(SetattrErrorsMixin):
 
     def getControl(self, label=None, name=None, index=None):
         """See zope.testbrowser.interfaces.IBrowser"""
+        return self._getControl(
+            label, name, self._getAllResponseForms(), index)
+
+    def _getControl(self, label, name, forms, index):
+        # Look only as far as needed to decide: up to the requested index, or
+        # until a second match shows that the lookup is ambiguous.  Only in
+        # the latter case all controls are looked at, for the error message.
+        forms = list(forms)
+        limit = 2 if index is None else index + 1
         intermediate, msg, available = self._getAllControls(
-            label, name, self._getAllResponseForms(),
-            include_subcontrols=True)
-        control = disambiguate(intermediate, msg, index,
-                               controlFormTupleRepr,
-                               available)
-        return control
+            label, name, forms, include_subcontrols=True, limit=limit)
+        if index is None and len(intermediate) > 1:
+            intermediate, msg, available = self._getAllControls(
+                label, name, forms, include_subcontrols=True)
+        return disambiguate(intermediate, msg, index,
+                            controlFormTupleRepr, available)
 
     def _getAllResponseForms(self):
         """ Return set of response forms in the order they appear in
@@ -400,7 +872,8 @@ class Browser(SetattrErrorsMixin):
         idxkeys = [k for k in respforms.keys() if isinstance(k, int)]
         return [respforms[k] for k in sorted(idxkeys)]
 
-    def _getAllControls(self, label, name, forms, include_subcontrols=False):
+    def _getAllControls(self, label, name, forms, include_subcontrols=False,
+                        limit=None):
         onlyOne([label, name], '"label" and "name"')
 
         # might be an iterator, and we need to iterate twice
@@ -408,84 +881,79 @@ class Browser(SetattrErrorsMixin):
 
         available = None
         if label is not None:
-            res = self._findByLabel(label, forms, include_subcontrols)
+            res = self._findByLabel(label, forms, include_subcontrols, limit)
             msg = 'label %r' % label
         elif name is not None:
             include_subcontrols = False
-            res = self._findByName(name, forms)
+            res = self._findByName(name, forms, limit)
             msg = 'name %r' % name
         if not res:
             available = list(self._findAllControls(forms, include_subcontrols))
         return res, msg, available
 
-    def _findByLabel(self, label, forms, include_subcontrols=False):
+    def _findByLabel(self, label, forms, include_subcontrols=False,
+                     limit=None):
         # forms are iterable of mech_forms
+        label = normalizeWhitespace(label)
         matches = re.compile(r'(^|\b|\W)%s(\b|\W|$)'
-                             % re.escape(normalizeWhitespace(label))).search
+                             % re.escape(label)).search
         found = []
-        for wtcontrol in self._findAllControls(forms, include_subcontrols):
-            control = getattr(wtcontrol, 'control', wtcontrol)
-            if control.type == 'hidden':
+        for form in forms:
+            if label not in form.label_text:
+                # none of the controls of this form can have a matching label
                 continue
-            for label in wtcontrol.labels:
-                if matches(label):
+            for wtcontrol in self._findAllControls([form],
+                                                   include_subcontrols):
+                control = getattr(wtcontrol, 'control', wtcontrol)
+                if control.type == 'hidden':
+                    continue
+                if any(matches(lbl) for lbl in wtcontrol.labels):
                     found.append(wtcontrol)
-                    break
+                    if len(found) == limit:
+                        return found
         return found
 
     def _indexControls(self, form):
-        # Unfortunately, webtest will remove all 'name' attributes from
-        # form.html after parsing. But we need them (at least to locate labels
-        # for radio buttons). So we are forced to reparse part of html, to
-        # extract elements.
-        html = BeautifulSoup(form.text, 'html.parser')
-        tags = ('input', 'select', 'textarea', 'button')
-        return html.find_all(tags)
-
-    def _findByName(self, name, forms):
-        return [c for c in self._findAllControls(forms) if c.name == name]
-
-    def _findAllControls(self, forms, include_subcontrols=False):
-        res = []
+        # The elements of the form in the parsed document, in the order
+        # webtest numbers its fields.
+        return form.elements
+
+    def _findByName(self, name, forms, limit=None):
+        found = []
+        for form in forms:
+            if name not in form.names:
+                continue
+            for c in self._findAllControls([form], name=name):
+                if c.name == name:
+                    found.append(c)
+                    if len(found) == limit:
+                        return found
+        return found
+
+    def _findAllControls(self, forms, include_subcontrols=False, name=None):
+        """Yield the controls of `forms`, building them when first needed.
+
+        If `name` is given, only the controls of fields with this name are
+        built and yielded.
+        """
         for f in forms:
-            if f not in self._controls:
-                fc = []
-                allelems = self._indexControls(f)
-                already_processed = set()
-                for cname, wtcontrol in f.field_order:
-                    # we need to group checkboxes by name, but leave
-                    # the other controls in the original order,
-                    # even if the name repeats
-                    if isinstance(wtcontrol, webtest.forms.Checkbox):
-                        if cname in already_processed:
-                            continue
-                        already_processed.add(cname)
-                        wtcontrols = f.fields[cname]
-                    else:
-                        wtcontrols = [wtcontrol]
-                    for c in controlFactory(cname, wtcontrols, allelems, self):
-                        fc.append((c, False))
-
-                        for subcontrol in c.controls:
-                            fc.append((subcontrol, True))
-
-                self._controls[f] = fc
-
-            controls = [c for c, subcontrol in self._controls[f]
-                        if not subcontrol or include_subcontrols]
-            res.extend(controls)
-
-        return res
+            formcontrols = self._controls.get(f)
+            if formcontrols is None:
+                formcontrols = self._controls[f] = FormControls(f, self)
+            yield from formcontrols.controls(include_subcontrols, name)
 
     def _changed(self):
         self._counter += 1
         self._contents = None
         self._controls = {}
-        self.__html = None
+        self._links = None
 
     @contextmanager
     def _preparedRequest(self, url):
         self.timer.start()
+        self.testapp.http_cache = self.httpCache
+        self.testapp.recorder = self.recorder
+        self.testapp.profiler = self.profiler
 
         headers = {}
         if self._req_referrer is not None:
@@ -494,7 +962,8 @@ class Browser(SetattrErrorsMixin):
         if self._req_content_type:
             headers['Content-Type'] = self._req_content_type
 
-        headers['Connection'] = 'close'
+        if self.testapp.restricted:
+            headers['Connection'] = 'close'
         headers['Host'] = urllib.parse.urlparse(url).netloc
         headers['User-Agent'] = 'Python-urllib/2.4'
 
@@ -547,14 +1016,16 @@ class Browser(SetattrErrorsMixin):
             return s.decode(self._response.charset)
         return s
 
+    @property
+    def _document(self):
+        return self._response.document
+
     @property
     def _html(self):
-        if self.__html is None:
-            self.__html = self._response.html
-        return self.__html
+        return self._document.soup
 
 
-def controlFactory(name, wtcontrols, elemindex, browser):
+def controlFactory(name, wtcontrols, elemindex, browser, elemsbyname=None):
     assert len(wtcontrols) > 0
 
     first_wtc = wtcontrols[0]
@@ -569,15 +1040,19 @@ def controlFactory(name, wtcontrols, elemindex, browser):
         controls = []
         for wtc in wtcontrols:
             controls.append(simpleControlFactory(
-                wtc, wtc.form, elemindex, browser))
+                wtc, wtc.form, elemindex, browser, elemsbyname))
 
     return controls
 
 
-def simpleControlFactory(wtcontrol, form, elemindex, browser):
+def simpleControlFactory(wtcontrol, form, elemindex, browser,
+                         elemsbyname=None):
     if isinstance(wtcontrol, webtest.forms.Radio):
-        elems = [e for e in elemindex
-                 if e.attrs.get('name') == wtcontrol.name]
+        if elemsbyname is None:
+            elems = [e for e in elemindex
+                     if e.attrs.get('name') == wtcontrol.name]
+        else:
+            elems = elemsbyname[wtcontrol.name]
         return RadioListControl(wtcontrol, form, elems, browser)
 
     elem = elemindex[wtcontrol.pos]
@@ -594,23 +1069,120 @@ def simpleControlFactory(wtcontrol, form, elemindex, browser):
         return Control(wtcontrol, form, elem, browser)
 
 
+class LinkIndex:
+    """The links of a page, prepared for repeated lookups.
+
+    For each `a` and `area` element the index keeps its whitespace-normalized
+    text and ``href``, the absolute URL it points to and its id.
+    """
+
+    def __init__(self, elems, baseurl):
+        self.baseurl = baseurl
+        self.links = []
+        self.byId = {}
+        for elem in elems:
+            href = elem.get('href')
+            absurl = None
+            if href is not None:
+                absurl = str(urllib.parse.urljoin(baseurl, href))
+            entry = (elem, normalizeWhitespace(elem.text),
+                     normalizeWhitespace(href or ''), absurl)
+            self.links.append(entry)
+            linkid = elem.get('id')
+            if linkid is not None:
+                self.byId.setdefault(linkid, []).append(entry)
+
+    def find(self, text=None, url=None, id=None, index=0):
+        """Return the `index`-th matching entry, or None.
+
+        `text` and `url` are matched like `isMatching` does.  The search
+        stops at the entry asked for.
+        """
+        links = self.links if id is None else self.byId.get(id, ())
+        matchtext = compileMatcher(text)
+        matchurl = compileMatcher(url)
+        for entry in links:
+            if matchtext(entry[1]) and matchurl(entry[2]):
+                if not index:
+                    return entry
+                index -= 1
+        return None
+
+
+class FormControls:
+    """The controls of a form, built field by field as they are needed."""
+
+    def __init__(self, form, browser):
+        self.form = form
+        self.browser = browser
+        self._built = {}
+
+    @Lazy
+    def _elemsbyname(self):
+        # radio buttons are grouped by name
+        elemsbyname = {}
+        with utils.timed(self.form.response.timings, 'index'):
+            for elem in self.browser._indexControls(self.form):
+                elemsbyname.setdefault(
+                    elem.attrs.get('name'), []).append(elem)
+        return elemsbyname
+
+    def controls(self, include_subcontrols=False, name=None):
+        form = self.form
+        already_processed = set()
+        for cname, wtcontrol in form.field_order:
+            if name is not None and cname != name:
+                continue
+            # we need to group checkboxes by name, but leave
+            # the other controls in the original order,
+            # even if the name repeats
+            if isinstance(wtcontrol, webtest.forms.Checkbox):
+                if cname in already_processed:
+                    continue
+                already_processed.add(cname)
+                key = ('checkbox', cname)
+                wtcontrols = form.fields[cname]
+            else:
+                key = id(wtcontrol)
+                wtcontrols = [wtcontrol]
+
+            built = self._built.get(key)
+            if built is None:
+                elemsbyname = self._elemsbyname
+                with utils.timed(form.response.timings, 'index'):
+                    built = self._built[key] = [
+                        [c, None] for c in controlFactory(
+                            cname, wtcontrols,
+                            self.browser._indexControls(form),
+                            self.browser, elemsbyname)]
+            for entry in built:
+                yield entry[0]
+                if include_subcontrols:
+                    if entry[1] is None:
+                        entry[1] = list(entry[0].controls)
+                    yield from entry[1]
+
+
 @implementer(interfaces.ILink)
 class Link(SetattrErrorsMixin):
 
-    def __init__(self, link, browser, baseurl=""):
+    def __init__(self, link, browser, baseurl="", url=None):
         self._link = link
         self.browser = browser
         self._baseurl = baseurl
+        self._url = url
         self._browser_counter = self.browser._counter
         self._enable_setattr_errors = True
 
     def click(self):
         if self._browser_counter != self.browser._counter:
             raise interfaces.ExpiredError
-        self.browser.open(self.url, referrer=self.browser.url)
+        return self.browser.open(self.url, referrer=self.browser.url)
 
     @property
     def url(self):
+        if self._url is not None:
+            return self._url
         relurl = self._link['href']
         return self.browser._absoluteUrl(relurl)
 
@@ -736,8 +1308,8 @@ class Control(SetattrErrorsMixin):
 
     @Lazy
     def labels(self):
-        return [self.browser.toStr(label)
-                for label in getControlLabels(self._elem, self._form.html)]
+        labels = getControlLabels(self._elem, self._form.label_index)
+        return [self.browser.toStr(label) for label in labels]
 
     @property
     def controls(self):
@@ -775,7 +1347,7 @@ class SubmitControl(Control):
     def click(self):
         if self._browser_counter != self.browser._counter:
             raise interfaces.ExpiredError
-        self.browser._clickSubmit(self._form, self._control)
+        return self.browser._clickSubmit(self._form, self._control)
 
     @Lazy
     def labels(self):
@@ -1058,7 +1630,7 @@ class ImageControl(Control):
     def click(self, coord=(1, 1)):
         if self._browser_counter != self.browser._counter:
             raise interfaces.ExpiredError
-        self.browser._clickSubmit(self._form, self._control, coord)
+        return self.browser._clickSubmit(self._form, self._control, coord)
 
     def mechRepr(self):
         return "ImageControl???"  # TODO
@@ -1159,8 +1731,8 @@ class RadioItemControl(ItemControl):
 
     @Lazy
     def labels(self):
-        return [self.browser.toStr(label)
-                for label in getControlLabels(self._elem, self._form.html)]
+        labels = getControlLabels(self._elem, self._form.label_index)
+        return [self.browser.toStr(label) for label in labels]
 
     def __repr__(self):
         return (
@@ -1219,8 +1791,8 @@ class CheckboxItemControl(ItemControl):
 
     @Lazy
     def labels(self):
-        return [self.browser.toStr(label)
-                for label in getControlLabels(self._elem, self._form.html)]
+        labels = getControlLabels(self._elem, self._form.label_index)
+        return [self.browser.toStr(label) for label in labels]
 
     def __repr__(self):
         return (
@@ -1277,7 +1849,7 @@ class Form(SetattrErrorsMixin):
 
     @property
     def name(self):
-        return str(self._form.html.form.get('name'))
+        return str(self._form.element.get('name'))
 
     @property
     def id(self):
@@ -1297,21 +1869,18 @@ class Form(SetattrErrorsMixin):
                         if isinstance(c, (ImageControl, SubmitControl))]
             control = disambiguate(
                 controls, msg, index, controlFormTupleRepr, available)
-            self.browser._clickSubmit(form, control._control, coord)
+            return self.browser._clickSubmit(form, control._control, coord)
         else:  # JavaScript sort of submit
             if index is not None or coord is not None:
                 raise ValueError(
                     'May not use index or coord without a control')
-            self.browser._clickSubmit(form)
+            return self.browser._clickSubmit(form)
 
     def getControl(self, label=None, name=None, index=None):
         """See zope.testbrowser.interfaces.IBrowser"""
         if self._browser_counter != self.browser._counter:
             raise interfaces.ExpiredError
-        intermediate, msg, available = self.browser._getAllControls(
-            label, name, [self._form], include_subcontrols=True)
-        return disambiguate(intermediate, msg, index,
-                            controlFormTupleRepr, available)
+        return self.browser._getControl(label, name, [self._form], index)
 
     @property
     def controls(self):
@@ -1380,18 +1949,17 @@ def getControl(controls, label=None, value=None, index=None):
     return res
 
 
-def getControlLabels(celem, html):
+def getControlLabels(celem, labelindex):
     labels = []
 
     # In case celem is contained in label element, use its text as a label
     if celem.parent.name == 'label':
         labels.append(normalizeWhitespace(celem.parent.text))
 
-    # find all labels, connected by 'for' attribute
+    # add all labels, connected by 'for' attribute
     controlid = celem.attrs.get('id')
     if controlid:
-        forlbls = html.select('label[for="%s"]' % controlid)
-        labels.extend([normalizeWhitespace(label.text) for label in forlbls])
+        labels.extend(labelindex.get(controlid, ()))
 
     return [label for label in labels if label is not None]
 
@@ -1419,6 +1987,20 @@ def isMatching(string, expr):
         return normalizeWhitespace(expr) in normalizeWhitespace(string)
 
 
+def compileMatcher(expr):
+    """Return a predicate telling whether a string matches ``expr``
+
+    This is `isMatching` for many whitespace-normalized strings: ``expr`` is
+    prepared only once.
+    """
+    if expr is None:
+        return lambda string: True
+    if isinstance(expr, RegexType):
+        return expr.match
+    expr = normalizeWhitespace(expr)
+    return lambda string: expr in string
+
+
 class Timer:
     start_time = 0
     end_time = 0
@@ -1455,31 +2037,349 @@ class Timer:
         self.stop()
 
 
+class Phase:
+    """Wall clock and CPU seconds spent in a phase of a request.
+
+    The time of nested phases is not included.  `detail` is the URL of the
+    hop for ``app`` phases.
+    """
+
+    def __init__(self, name, wall, cpu, detail=None):
+        self.name = name
+        self.wall = wall
+        self.cpu = cpu
+        self.detail = detail
+
+    def __repr__(self):
+        detail = ' ' + self.detail if self.detail else ''
+        return '<Phase {}{} {:.3f}ms wall {:.3f}ms cpu>'.format(
+            self.name, detail, self.wall * 1000, self.cpu * 1000)
+
+
+class RequestTimings:
+    """The phases of a request, see IBrowser.lastRequestTimings.
+
+    `phases` lists them in the order they ended.  CPU time is the time of the
+    thread running a phase.  `skipped` lists the (url, target) redirects not
+    requested, as they were known from the ``Browser.redirectCache``.
+    """
+
+    def __init__(self):
+        self.phases = []
+        self.skipped = []
+        self._nested = []  # [wall, cpu] of the phases nested in open ones
+
+    @contextmanager
+    def phase(self, name, detail=None):
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        self._nested.append([0.0, 0.0])
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            nested_wall, nested_cpu = self._nested.pop()
+            if self._nested:
+                self._nested[-1][0] += wall
+                self._nested[-1][1] += cpu
+            self.phases.append(Phase(name, max(0.0, wall - nested_wall),
+                                     max(0.0, cpu - nested_cpu), detail))
+
+    @property
+    def wall(self):
+        return sum(phase.wall for phase in self.phases)
+
+    @property
+    def cpu(self):
+        return sum(phase.cpu for phase in self.phases)
+
+    @property
+    def hops(self):
+        """The ``app`` phases, one per request sent."""
+        return [phase for phase in self.phases if phase.name == 'app']
+
+    def byPhase(self):
+        """Return the wall and CPU seconds and the count of each phase."""
+        totals = {}
+        for phase in self.phases:
+            total = totals.setdefault(
+                phase.name, {'wall': 0.0, 'cpu': 0.0, 'count': 0})
+            total['wall'] += phase.wall
+            total['cpu'] += phase.cpu
+            total['count'] += 1
+        return totals
+
+    def __repr__(self):
+        return '<RequestTimings {}>'.format(' '.join(
+            '{}={:.3f}ms'.format(name, total['wall'] * 1000)
+            for name, total in self.byPhase().items()))
+
+
+class MemoryPhase:
+    """Bytes allocated in a phase of a request, see `RequestMemory`."""
+
+    def __init__(self, name, peak, retained):
+        self.name = name
+        self.peak = peak
+        self.retained = retained
+
+    def __repr__(self):
+        return '<MemoryPhase {} peak={} retained={}>'.format(
+            self.name, self.peak, self.retained)
+
+
+class RequestMemory:
+    """The memory allocated by a request, see IBrowser.lastRequestMemory.
+
+    `phases` lists them in the order they ended.  `peak` is the most memory
+    allocated at once during a phase and `retained` the memory still
+    allocated at its end, both in bytes and relative to its start.  They are
+    measured with tracemalloc, which is started for the phases and stopped
+    again after them if it isn't tracing yet; memory allocated meanwhile by
+    other threads is counted as well.
+
+    tracemalloc has a single peak for the whole process, so only one request
+    can be traced at a time: opening a phase while the phases of another
+    request are open, e.g. of concurrent sessions of an ``AsyncBrowser`` or
+    of the users of a ``LoadRunner``, raises a `BrowserStateError`.
+    """
+
+    # The RequestMemory with open phases and whether tracemalloc was started
+    # for them, shared by all requests as tracemalloc is.
+    _lock = threading.Lock()
+    _tracing = None
+    _started = False
+
+    def __init__(self):
+        self.phases = []
+        self._peaks = []  # the peaks of the open phases, if nested
+
+    def _open(self):
+        cls = RequestMemory
+        with cls._lock:
+            if cls._tracing is not None and cls._tracing is not self:
+                raise BrowserStateError(
+                    'Cannot trace the memory of two requests at once.')
+            if not self._peaks:
+                cls._tracing = self
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    cls._started = True
+
+    def _close(self):
+        cls = RequestMemory
+        with cls._lock:
+            if not self._peaks:
+                cls._tracing = None
+                if cls._started:
+                    cls._started = False
+                    tracemalloc.stop()
+
+    @contextmanager
+    def phase(self, name):
+        self._open()
+        start = tracemalloc.get_traced_memory()[0]
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1],
+                                  tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        self._peaks.append(start)
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self._peaks.pop())
+            if self._peaks:
+                # the nested peak is part of the open phase
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            self.phases.append(
+                MemoryPhase(name, max(0, peak - start), current - start))
+            self._close()
+
+    @property
+    def peak(self):
+        return max((phase.peak for phase in self.phases), default=0)
+
+    @property
+    def retained(self):
+        return sum(phase.retained for phase in self.phases)
+
+    def byPhase(self):
+        """Return the peak and retained bytes and the count of each phase.
+
+        The peak of a phase occurring more than once is its highest one.
+        """
+        totals = {}
+        for phase in self.phases:
+            total = totals.setdefault(
+                phase.name, {'peak': 0, 'retained': 0, 'count': 0})
+            total['peak'] = max(total['peak'], phase.peak)
+            total['retained'] += phase.retained
+            total['count'] += 1
+        return totals
+
+    def __repr__(self):
+        return '<RequestMemory {}>'.format(' '.join(
+            '{}={:.1f}KiB/{:.1f}KiB'.format(
+                name, total['peak'] / 1024, total['retained'] / 1024)
+            for name, total in self.byPhase().items()))
+
+
+class CompressedResponse:
+    """A response kept in the history with its body compressed.
+
+    Only what is needed to rebuild an equivalent response is kept: the
+    status, headers and body of the response and the environment and body of
+    its request.  Response bodies are stored in the `History` once per
+    content hash.
+    """
+
+    def __init__(self, response, digest):
+        self.digest = digest
+        self.status = response.status
+        self.headerlist = list(response.headerlist)
+        request = response.request
+        self.environ = {
+            k: v for k, v in request.environ.items()
+            if k != 'wsgi.input' and isinstance(v, (str, int, tuple))}
+        self.request_body = zlib.compress(request.body) if (
+            request.content_length) else None
+        self.attrs = {name: getattr(response, name)
+                      for name in self.copied if hasattr(response, name)}
+
+    # Attributes set on responses by webtest and the browser, they only refer
+    # to objects shared by all responses.
+    copied = ('app', 'test_app', '_use_unicode', '_last_fragment',
+              'parser_features', 'parse_cache')
+
+    def restore(self, body):
+        request = TestbrowserRequest(dict(self.environ))
+        if self.request_body is None:
+            request.environ['wsgi.input'] = io.BytesIO()
+        else:
+            request.body = zlib.decompress(self.request_body)
+        response = TestbrowserResponse(
+            body=body, status=self.status, headerlist=list(self.headerlist))
+        response.request = request
+        response.errors = ''
+        for name, value in self.attrs.items():
+            setattr(response, name, value)
+        return response
+
+
 class History:
     """
+    The pages visited before the current one.
 
     Though this will become public, the implied interface is not yet stable.
 
+    All entries are kept as they are, unless limits are set:
+
+    - `maxlen` is the number of entries going back is possible for,
+    - only the `live` most recent entries are kept as response objects,
+      older ones are compressed and rebuilt when going back to them,
+    - `maxbytes` limits the size of the bodies of all entries, counting the
+      uncompressed size of live and the compressed size of other entries.
+      Once exceeded, the oldest live entries are compressed first, then the
+      oldest entries are dropped.
+
+    Identical bodies of compressed entries are stored only once.
     """
 
-    def __init__(self):
+    def __init__(self, maxlen=None, maxbytes=None, live=None):
+        self.maxlen = maxlen
+        self.maxbytes = maxbytes
+        self.live = live
         self._history = []  # LIFO
+        self._bodies = {}  # digest -> [compressed body, reference count]
+        self._live = 0  # number of entries that are responses
+        self.bytes = 0
 
     def add(self, response):
         self._history.append(response)
+        if response is not None:
+            self._live += 1
+            self.bytes += len(response.body)
+        self._enforceLimits()
 
     def back(self, n, _response):
         response = _response
         while n > 0 or response is None:
             try:
-                response = self._history.pop()
+                entry = self._history.pop()
             except IndexError:
                 raise BrowserStateError("already at start of history")
+            response = self._release(entry, restore=n <= 1)
             n -= 1
         return response
 
     def clear(self):
         del self._history[:]
+        self._bodies.clear()
+        self._live = 0
+        self.bytes = 0
+
+    def stats(self):
+        return {'size': len(self._history),
+                'live': self._live,
+                'bodies': len(self._bodies),
+                'bytes': self.bytes}
+
+    def _enforceLimits(self):
+        history = self._history
+        if self.maxlen is not None:
+            while len(history) > self.maxlen:
+                self._release(history.pop(0))
+        if self.live is not None and self._live > self.live:
+            self._compressOldest(self._live - self.live)
+        if self.maxbytes is not None:
+            while self.bytes > self.maxbytes and history:
+                if not self._compressOldest(1):
+                    self._release(history.pop(0))
+
+    def _compressOldest(self, count):
+        """Compress the `count` oldest live entries, returning how many were.
+
+        Only responses of the browser can be rebuilt, others are kept live.
+        """
+        compressed = 0
+        for i, entry in enumerate(self._history):
+            if compressed == count:
+                break
+            if isinstance(entry, TestbrowserResponse):
+                self._history[i] = self._compress(entry)
+                compressed += 1
+        return compressed
+
+    def _compress(self, response):
+        body = response.body
+        digest = hashlib.sha256(body).digest()
+        stored = self._bodies.get(digest)
+        if stored is None:
+            stored = self._bodies[digest] = [zlib.compress(body), 0]
+            self.bytes += len(stored[0])
+        stored[1] += 1
+        self._live -= 1
+        self.bytes -= len(body)
+        return CompressedResponse(response, digest)
+
+    def _release(self, entry, restore=False):
+        """Forget about `entry`, returning it as a response if `restore`."""
+        if entry is None:
+            return None
+        if not isinstance(entry, CompressedResponse):
+            self._live -= 1
+            self.bytes -= len(entry.body)
+            return entry
+        stored = self._bodies[entry.digest]
+        stored[1] -= 1
+        if not stored[1]:
+            del self._bodies[entry.digest]
+            self.bytes -= len(stored[0])
+        if restore:
+            return entry.restore(zlib.decompress(stored[0]))
+        return entry
 
 
 class AmbiguityError(ValueError):
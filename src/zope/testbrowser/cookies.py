@@ -13,6 +13,7 @@
 ##############################################################################
 
 import datetime
+import http.cookiejar
 import http.cookies
 import time
 import urllib.parse
@@ -79,6 +80,72 @@ def expiration_string(expires):  # this is not protected so usable in tests.
 # end Cookies class helpers
 
 
+def request_domains(request):
+    """Return the cookie domains the host of `request` may get cookies of.
+
+    These are the domains ``DefaultCookiePolicy.domain_return_ok`` accepts:
+    the host and its parent domains, with and without a leading dot, for the
+    request host and the effective request host, e.g. ``localhost.local``.
+    The most specific ones come first.
+    """
+    domains = []
+    for host in http.cookiejar.eff_request_host(request):
+        if not host.startswith('.'):
+            host = '.' + host
+        start = 0
+        while start != -1:
+            domains.extend((host[start + 1:], host[start:]))
+            start = host.find('.', start + 1)
+    domains.append('')
+    return list(dict.fromkeys(domains))
+
+
+class IndexedCookieJar(http.cookiejar.CookieJar):
+    """A cookie jar finding the cookies of a request without a full scan.
+
+    The jar keeps its cookies by domain, path and name.  ``CookieJar`` asks
+    its policy about every domain in the jar to find the cookies of a
+    request, this one only looks up the domains the host of the request may
+    get cookies of, so the time taken grows with the number of cookies of
+    the host instead of the number of hosts in the jar.  Policies with an
+    own ``domain_return_ok`` get all domains, as with ``CookieJar``.
+
+    Expired cookies, which ``CookieJar`` looks for in all domains before
+    each request, are only looked for once the first expiration date of the
+    cookies set has passed.
+    """
+
+    # Timestamp from which on cookies of the jar may have expired.
+    _next_expiry = None
+
+    def set_cookie(self, cookie):
+        with self._cookies_lock:
+            super().set_cookie(cookie)
+            if cookie.expires is not None and (
+                    self._next_expiry is None
+                    or cookie.expires < self._next_expiry):
+                self._next_expiry = cookie.expires
+
+    def clear_expired_cookies(self):
+        with self._cookies_lock:
+            if self._next_expiry is None or time.time() < self._next_expiry:
+                return
+            super().clear_expired_cookies()
+            self._next_expiry = min(
+                (cookie.expires for cookie in self
+                 if cookie.expires is not None), default=None)
+
+    def _cookies_for_request(self, request):
+        if (type(self._policy).domain_return_ok is not
+                http.cookiejar.DefaultCookiePolicy.domain_return_ok):
+            return super()._cookies_for_request(request)
+        cookies = []
+        for domain in request_domains(request):
+            if domain in self._cookies:
+                cookies.extend(self._cookies_for_domain(domain, request))
+        return cookies
+
+
 @zope.interface.implementer(interfaces.ICookies)
 class Cookies(MutableMapping):
     """Cookies for testbrowser.
@@ -0,0 +1,361 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Parsed HTML documents
+
+A response body is parsed once.  Forms, their controls and labels, links, the
+``<base href>`` and the title are all looked up in that one tree.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import webtest.forms
+from bs4 import BeautifulSoup
+from bs4.builder import TreeBuilder
+from zope.cachedescriptors.property import Lazy
+
+from zope.testbrowser import utils
+
+
+__docformat__ = "reStructuredText"
+
+CONTROL_TAGS = ('input', 'select', 'textarea', 'button')
+
+
+def parse(body, parser='html.parser'):
+    """Parse `body` with the given BeautifulSoup tree builder.
+
+    `parser` is either a features string understood by BeautifulSoup, like
+    ``'html.parser'``, ``'lxml'`` or ``'html5lib'``, or a `TreeBuilder`
+    subclass or instance.
+    """
+    if isinstance(parser, TreeBuilder) or (
+            isinstance(parser, type) and issubclass(parser, TreeBuilder)):
+        return BeautifulSoup(body, builder=parser)
+    return BeautifulSoup(body, parser)
+
+
+class Document:
+    """The parsed tree of an HTML response body and lookups derived from it.
+
+    `features` selects the tree builder, see `parse`.
+    """
+
+    def __init__(self, body, features='html.parser'):
+        self.features = features
+        self.soup = parse(body, features)
+        self._label_indexes = {}
+        self._label_texts = {}
+        # LinkIndex objects of the browser, by base URL
+        self.link_indexes = {}
+
+    @Lazy
+    def title(self):
+        title = self.soup.find('title')
+        if title is None:
+            return None
+        return title.text
+
+    @Lazy
+    def base_href(self):
+        head = self.soup.head
+        if head is None or head.base is None:
+            return None
+        return head.base.get('href')
+
+    @Lazy
+    def forms(self):
+        """All form elements in document order."""
+        return self.soup.find_all('form')
+
+    @Lazy
+    def links(self):
+        """All `a` elements, followed by all `area` elements."""
+        return self.soup.find_all('a') + self.soup.find_all('area')
+
+    @Lazy
+    def control_elements(self):
+        """All control elements in document order."""
+        return self.soup.find_all(CONTROL_TAGS)
+
+    @Lazy
+    def _controls_by_form_id(self):
+        # A form with an id owns all controls inside of it as well as those
+        # pointing at it with their `form` attribute.  This is computed in a
+        # single pass for all forms at once.
+        index = {}
+        for elem in self.control_elements:
+            ids = {p.attrs.get('id') for p in elem.parents if p.name == 'form'}
+            ids.add(elem.attrs.get('form'))
+            ids.discard(None)
+            for form_id in ids:
+                index.setdefault(form_id, []).append(elem)
+        return index
+
+    def label_index(self, scope):
+        """Map ids to the texts of the labels within `scope` naming them.
+
+        `scope` is an element of the document, usually a form.  The texts are
+        whitespace-normalized and listed in document order.  The index is
+        built with a single pass over `scope` and then kept.
+        """
+        index = self._label_indexes.get(id(scope))
+        if index is None:
+            index = {}
+            for label in scope.find_all('label'):
+                for_id = label.attrs.get('for')
+                if for_id:
+                    index.setdefault(for_id, []).append(
+                        ' '.join(label.text.split()))
+            self._label_indexes[id(scope)] = index
+        return index
+
+    def label_text(self, form):
+        """Return all text the labels of the controls of `form` are taken from.
+
+        The labels of a control are whitespace-normalized parts of this text,
+        so a label lookup can skip forms whose text doesn't contain what it is
+        looking for.
+        """
+        text = self._label_texts.get(id(form))
+        if text is None:
+            parts = [form.get_text()]
+            for elem in self.form_elements(form):
+                # controls placed outside of the form, and button values
+                if elem.parent.name == 'label':
+                    parts.append(elem.parent.get_text())
+                if not any(parent is form for parent in elem.parents):
+                    # the text of buttons and options outside of the form
+                    parts.append(elem.get_text())
+                if elem.name == 'button' or (
+                        elem.name == 'input' and
+                        elem.attrs.get('type', '').lower() in (
+                            'submit', 'image', 'button')):
+                    parts.append(elem.attrs.get('value', ''))
+                elif elem.name == 'select':
+                    parts.extend(option.attrs.get('label', '')
+                                 for option in elem('option'))
+            text = ' '.join(' '.join(parts).split())
+            self._label_texts[id(form)] = text
+        return text
+
+    def form_elements(self, form):
+        """Return the control elements of `form` in document order.
+
+        The position of an element in this list is the `pos` webtest assigns
+        to the field created for it.
+        """
+        form_id = form.attrs.get('id')
+        if form_id:
+            return self._controls_by_form_id.get(form_id, [])
+        return form.find_all(CONTROL_TAGS)
+
+
+class ParseCache:
+    """Parsed documents, looked up by the content of the response.
+
+    Responses with the same body, charset and parser share one `Document`,
+    with all the indexes built for it, no matter which browser requested
+    them.  A cache can be shared by any number of browsers, also across
+    threads.
+
+    The memory used by the cached trees is estimated as `tree_factor` times
+    the size of their bodies; once the estimate exceeds `maxbytes`, the least
+    recently used documents are dropped.
+    """
+
+    tree_factor = 30
+
+    def __init__(self, maxbytes=128 * 1024 * 1024):
+        self.maxbytes = maxbytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (cost, document)
+        self._lock = threading.Lock()
+
+    def _key(self, body, charset, features):
+        if isinstance(features, list):
+            features = tuple(features)
+        return (hashlib.sha256(body).digest(), charset, features)
+
+    def get(self, body, charset, features, text):
+        """Return the document for `body`, parsing `text` if needed.
+
+        `text` is the decoded `body` or a callable returning it.
+        """
+        key = self._key(body, charset, features)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        if callable(text):
+            text = text()
+        document = Document(text, features)
+        cost = len(body) * self.tree_factor
+        with self._lock:
+            if cost <= self.maxbytes and key not in self._entries:
+                self._entries[key] = (cost, document)
+                self.size += cost
+                while self.size > self.maxbytes:
+                    oldcost, old = self._entries.popitem(last=False)[1]
+                    self.size -= oldcost
+        return document
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'bytes': self.size}
+
+
+class DocumentForm(webtest.forms.Form):
+    """A `webtest.forms.Form` for a form element of a parsed `Document`.
+
+    Unlike `webtest.forms.Form` it does not parse the HTML of the form again.
+    """
+
+    def __init__(self, response, document, element):
+        self.response = response
+        self.document = document
+        self.element = element
+
+        attrs = element.attrs
+        self.action = attrs.get('action', '')
+        self.method = attrs.get('method', 'GET')
+        self.id = attrs.get('id')
+        self.enctype = attrs.get('enctype',
+                                 'application/x-www-form-urlencoded')
+
+    # The fields are parsed on first use, most pages have forms a test never
+    # looks at.
+
+    @Lazy
+    def fields(self):
+        with utils.timed(self.response.timings, 'index'):
+            self._parse_fields()
+        return self.fields
+
+    @Lazy
+    def field_order(self):
+        with utils.timed(self.response.timings, 'index'):
+            self._parse_fields()
+        return self.field_order
+
+    @Lazy
+    def text(self):
+        return str(self.element)
+
+    @Lazy
+    def html(self):
+        # Only kept for code expecting the attribute of webtest forms, the
+        # browser itself uses the element in the document tree.
+        return parse(self.text, self.document.features)
+
+    @Lazy
+    def elements(self):
+        """The control elements of the form, indexed by field position."""
+        with utils.timed(self.response.timings, 'index'):
+            return self.document.form_elements(self.element)
+
+    @Lazy
+    def names(self):
+        """The names of the form's controls."""
+        return {elem.attrs.get('name') for elem in self.elements}
+
+    @property
+    def label_index(self):
+        """Label texts within the form, by the id they are `for`."""
+        return self.document.label_index(self.element)
+
+    @property
+    def label_text(self):
+        """See `Document.label_text`."""
+        return self.document.label_text(self.element)
+
+    def _parse_fields(self):
+        # Port of webtest.forms.Form._parse_fields, working on the elements of
+        # the document tree instead of parsing the form once more.
+        fields = OrderedDict()
+        field_order = []
+        for pos, node in enumerate(self.elements):
+            attrs = dict(node.attrs)
+            tag = node.name
+            name = attrs.pop('name', None)
+
+            if tag == 'textarea':
+                text = node.text
+                if text.startswith('\r\n'):
+                    text = text[2:]
+                elif text.startswith('\n'):
+                    text = text[1:]
+                attrs['value'] = text
+
+            tag_type = attrs.get('type', 'text').lower()
+            if tag == 'select':
+                tag_type = 'select'
+                if 'multiple' in attrs:
+                    tag_type = 'multiple_select'
+            if tag == 'button':
+                tag_type = 'submit'
+
+            FieldClass = self.FieldClass.classes.get(tag_type,
+                                                     self.FieldClass)
+
+            # https://github.com/Pylons/webtest/issues/131
+            for attr in ('form', 'tag', 'pos'):
+                attrs.pop(attr, None)
+
+            if tag == 'input':
+                if tag_type == 'radio':
+                    field = fields.get(name)
+                    if not field:
+                        field = FieldClass(self, tag, name, pos, **attrs)
+                        fields.setdefault(name, []).append(field)
+                        field_order.append((name, field))
+                    else:
+                        field = field[0]
+                    field.options.append((attrs.get('value'),
+                                          'checked' in attrs,
+                                          None))
+                    field.optionPositions.append(pos)
+                    if 'checked' in attrs:
+                        field.selectedIndex = len(field.options) - 1
+                    continue
+                elif tag_type == 'file':
+                    attrs.pop('value', None)
+
+            field = FieldClass(self, tag, name, pos, **attrs)
+            fields.setdefault(name, []).append(field)
+            field_order.append((name, field))
+
+            if tag == 'select':
+                for option in node('option'):
+                    field.options.append(
+                        (option.attrs.get('value', option.text),
+                         'selected' in option.attrs,
+                         option.text.strip()))
+
+        self.field_order = field_order
+        self.fields = fields
@@ -0,0 +1,127 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""A WSGI application generating pages of a given size and shape.
+
+The pages are made for benchmarks and scaling tests.  Their elements are
+named after their position, so that the first and last ones can be looked
+up:
+
+- ``links`` links ``Item <i>`` to ``/item/<i>``,
+- ``forms`` forms posting to ``/``, each with
+
+  - ``controls`` text inputs ``f<f>.c<c>`` labelled ``Field <f>.<c>``, by
+    labels referring to them by id or, if ``nesting`` is not 0, by labels
+    containing them with their text nested in ``nesting`` ``<span>``
+    elements,
+  - ``selects`` selects ``f<f>.s<s>`` labelled ``Select <f>.<s>`` with
+    ``options`` options ``Option <o>`` of the value ``<o>``,
+  - ``radio_groups`` fieldsets of ``radios`` radio buttons ``f<f>.q<g>``
+    labelled ``Answer <f>.<g>.<r>`` of the value ``<r>``,
+  - a submit button ``Save``.
+
+Responses set ``cookies`` cookies ``cookie<i>=value<i>``.
+"""
+
+import urllib.parse
+
+
+DEFAULTS = {
+    'forms': 1,
+    'controls': 10,
+    'nesting': 0,
+    'selects': 0,
+    'options': 10,
+    'radio_groups': 0,
+    'radios': 5,
+    'links': 10,
+    'cookies': 0,
+}
+
+
+def _control(f, c, nesting):
+    label = 'Field %d.%d' % (f, c)
+    control = '<input name="f%d.c%d" value="value %d" />' % (f, c, c)
+    if nesting:
+        return '<div><label>{}{}{}{}</label></div>'.format(
+            '<span>' * nesting, label, '</span>' * nesting, control)
+    return ('<div><label for="f{f}-c{c}">{label}</label>'
+            '<input id="f{f}-c{c}"{rest}</div>').format(
+                f=f, c=c, label=label, rest=control[len('<input'):])
+
+
+def _shape(shape):
+    unknown = set(shape) - set(DEFAULTS)
+    if unknown:
+        raise TypeError('unknown page shape: %s' % ', '.join(sorted(unknown)))
+    return dict(DEFAULTS, **shape)
+
+
+def make_page(**shape):
+    """Return the HTML of a page of the given shape, see `DEFAULTS`."""
+    shape = _shape(shape)
+    parts = ['<html><head><title>Generated</title></head><body>']
+    for i in range(shape['links']):
+        parts.append('<a href="/item/%d">Item %d</a>' % (i, i))
+    for f in range(shape['forms']):
+        parts.append('<form action="/" method="post">')
+        for c in range(shape['controls']):
+            parts.append(_control(f, c, shape['nesting']))
+        for s in range(shape['selects']):
+            parts.append('<label for="f%d-s%d">Select %d.%d</label>'
+                         '<select id="f%d-s%d" name="f%d.s%d">'
+                         % (f, s, f, s, f, s, f, s))
+            for o in range(shape['options']):
+                parts.append('<option value="%d">Option %d</option>'
+                             % (o, o))
+            parts.append('</select>')
+        for g in range(shape['radio_groups']):
+            parts.append('<fieldset><legend>Question %d.%d</legend>' % (f, g))
+            for r in range(shape['radios']):
+                parts.append(
+                    '<label><input type="radio" name="f%d.q%d" value="%d" />'
+                    ' Answer %d.%d.%d</label>' % (f, g, r, f, g, r))
+            parts.append('</fieldset>')
+        parts.append('<input type="submit" name="save" value="Save" />')
+        parts.append('</form>')
+    parts.append('</body></html>')
+    return ''.join(parts).encode('utf-8')
+
+
+class PageApplication:
+    """Serve pages of the shape given as keyword arguments, see `DEFAULTS`.
+
+    The shape can be changed per request in the query string, e.g.
+    ``/?forms=6&controls=250``.  All paths serve the page, generated once per
+    shape.
+    """
+
+    def __init__(self, **shape):
+        self.shape = _shape(shape)
+        self.pages = {}
+
+    def __call__(self, environ, start_response):
+        shape = dict(self.shape)
+        query = urllib.parse.parse_qsl(environ.get('QUERY_STRING', ''))
+        shape.update((name, int(value)) for name, value in query
+                     if name in DEFAULTS)
+        key = tuple(sorted(shape.items()))
+        body = self.pages.get(key)
+        if body is None:
+            body = self.pages[key] = make_page(**shape)
+        headers = [('Content-Type', 'text/html; charset=UTF-8'),
+                   ('Content-Length', str(len(body)))]
+        headers.extend(('Set-Cookie', 'cookie%d=value%d; Path=/' % (i, i))
+                       for i in range(shape['cookies']))
+        start_response('200 OK', headers)
+        return [body]
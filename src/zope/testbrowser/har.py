@@ -0,0 +1,150 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Logging browser sessions in the HTTP Archive (HAR) 1.2 format
+"""
+
+import datetime
+import http.cookies
+import importlib.metadata
+import json
+import threading
+import time
+import urllib.parse
+
+
+__docformat__ = "reStructuredText"
+
+HAR_VERSION = '1.2'
+
+
+def _pairs(items):
+    return [{'name': name, 'value': value} for name, value in items]
+
+
+def _cookies(values):
+    cookies = []
+    for value in values:
+        jar = http.cookies.SimpleCookie()
+        try:
+            jar.load(value)
+        except http.cookies.CookieError:
+            continue
+        cookies.extend({'name': morsel.key, 'value': morsel.value}
+                       for morsel in jar.values())
+    return cookies
+
+
+class HARLog:
+    """A log of the requests of browsers, written to `path` as HAR 1.2.
+
+    Assign it to ``Browser.recorder``, it is a recorder like
+    ``zope.testbrowser.recording.Recorder``.  Every request is written to the
+    file as soon as its response arrived, so the log takes no memory however
+    long the session.  The file is a valid HAR file once the log is closed.
+
+    The bodies of textual responses are included with `bodies`.  The time of
+    a request is reported as waiting for the response, the other phases are
+    not known to the browser.
+    """
+
+    def __init__(self, path, bodies=False):
+        self.path = path
+        self.bodies = bodies
+        self.entries = 0
+        self._lock = threading.Lock()
+        self._file = open(path, 'w', encoding='utf-8')
+        header = json.dumps({'log': {
+            'version': HAR_VERSION,
+            'creator': {'name': 'zope.testbrowser',
+                        'version': importlib.metadata.version(
+                            'zope.testbrowser')},
+            'pages': [],
+            'entries': []}})
+        # everything but the end of the entries and of the log
+        self._file.write(header[:-len(']}}')])
+        self._file.flush()
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def record(self, req, response, seconds):
+        """Log the webob request `req`, answered by `response`."""
+        entry = json.dumps(self._entry(req, response, seconds))
+        with self._lock:
+            if self.entries:
+                self._file.write(',')
+            self._file.write('\n' + entry)
+            self._file.flush()
+            self.entries += 1
+
+    def _entry(self, req, response, seconds):
+        started = datetime.datetime.fromtimestamp(
+            time.time() - seconds, datetime.timezone.utc)
+        milliseconds = round(seconds * 1000, 3)
+        body = req.body
+        request = {
+            'method': req.method,
+            'url': req.url,
+            'httpVersion': req.http_version or 'HTTP/1.1',
+            'cookies': _cookies(
+                [req.headers['Cookie']] if 'Cookie' in req.headers else []),
+            'headers': _pairs(req.headers.items()),
+            'queryString': _pairs(urllib.parse.parse_qsl(
+                req.query_string, keep_blank_values=True)),
+            'headersSize': -1,
+            'bodySize': len(body),
+        }
+        if body:
+            request['postData'] = {
+                'mimeType': req.content_type,
+                'text': body.decode('utf-8', 'replace')}
+
+        content = {'size': len(response.body),
+                   'mimeType': response.headers.get('Content-Type', '')}
+        if self.bodies and response.charset:
+            content['text'] = response.text
+        reason = response.status.partition(' ')[2]
+        return {
+            'startedDateTime': started.isoformat(timespec='milliseconds'),
+            'time': milliseconds,
+            'request': request,
+            'response': {
+                'status': response.status_int,
+                'statusText': reason,
+                'httpVersion': 'HTTP/1.1',
+                'cookies': _cookies(response.headers.getall('Set-Cookie')),
+                'headers': _pairs(response.headerlist),
+                'content': content,
+                'redirectURL': response.headers.get('Location', ''),
+                'headersSize': -1,
+                'bodySize': len(response.body),
+            },
+            'cache': {},
+            'timings': {'blocked': -1, 'dns': -1, 'connect': -1, 'ssl': -1,
+                        'send': 0, 'wait': milliseconds, 'receive': 0},
+        }
+
+    def close(self):
+        """Finish the file."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.write('\n]}}\n')
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,220 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""A private HTTP cache for the browser, following RFC 9111
+"""
+
+import time
+import urllib.parse
+from collections import OrderedDict
+
+from zope.testbrowser import utils
+
+
+__docformat__ = "reStructuredText"
+
+# Status codes which may be stored without explicit freshness information,
+# RFC 9110, 15.1
+HEURISTICALLY_CACHEABLE = (200, 203, 204, 300, 301, 308, 404, 405, 410, 414,
+                           501)
+
+# Headers of a 304 response which do not replace the stored ones
+NOT_UPDATED = ('content-length', 'transfer-encoding', 'connection')
+
+
+class CacheEntry:
+    """A stored response."""
+
+    def __init__(self, response, vary, now):
+        self.status = response.status
+        self.headerlist = list(response.headerlist)
+        self.body = response.body
+        self.vary = vary
+        self.update(response.headers, now)
+
+    def update(self, headers, now):
+        try:
+            age = max(0, int(headers.get('Age', 0)))
+        except ValueError:
+            age = 0
+        self.stored = now - age
+        self.lifetime = utils.freshness_lifetime(headers, now, 0)
+
+    def refresh(self, response, now):
+        """Update the entry from the headers of a 304 response."""
+        names = {name.lower() for name, value in response.headerlist
+                 if name.lower() not in NOT_UPDATED}
+        self.headerlist = [
+            (name, value) for name, value in self.headerlist
+            if name.lower() not in names] + [
+            (name, value) for name, value in response.headerlist
+            if name.lower() in names]
+        self.update(response.headers, now)
+
+    def age(self, now):
+        return max(0, int(now - self.stored))
+
+    def header(self, name):
+        for key, value in self.headerlist:
+            if key.lower() == name:
+                return value
+        return None
+
+
+class HTTPCache:
+    """Responses of GET requests, stored as their headers allow.
+
+    A stored response is returned as long as it is fresh.  Once it is stale,
+    or when the request asks for it to be validated, the request is sent with
+    ``If-None-Match`` and ``If-Modified-Since`` headers built from the
+    validators of the stored response.  The stored body is reused when the
+    application answers ``304 Not Modified``.
+
+    This is a private cache: responses to requests with ``Authorization`` and
+    responses marked ``private`` are stored as well.  At most `maxsize`
+    responses are kept, the least recently used one is dropped first.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # url -> CacheEntry
+
+    def _now(self):
+        return time.time()
+
+    def request(self, app, req, send):
+        """Return the response to `req`, calling `send` for a new one.
+
+        `app` is the ``webtest.TestApp`` responses are created for.
+        """
+        if req.method not in ('GET', 'HEAD'):
+            response = send(req)
+            self._invalidate(req, response)
+            return response
+
+        directives = utils.parse_cache_control(
+            req.headers.get('Cache-Control'))
+        if ('no-store' in directives or 'If-None-Match' in req.headers or
+                'If-Modified-Since' in req.headers):
+            # conditional requests made by the caller are passed through
+            return send(req)
+
+        now = self._now()
+        entry = self._entries.get(req.url)
+        if entry is not None and entry.vary != self._vary(req, entry):
+            entry = None
+        if entry is not None and req.method == 'GET':
+            self._entries.move_to_end(req.url)
+            validate = ('no-cache' in directives or
+                        'no-cache' in req.headers.get('Pragma', '') or
+                        directives.get('max-age') == '0')
+            if not validate and entry.age(now) < entry.lifetime:
+                self.hits += 1
+                return self._response(app, req, entry, now)
+            response = self._validate(req, entry, send)
+            if response.status_int == 304:
+                self.revalidated += 1
+                entry.refresh(response, now)
+                return self._response(app, req, entry, now)
+        else:
+            response = send(req)
+
+        self.misses += 1
+        self._store(req, response, now)
+        return response
+
+    def _validate(self, req, entry, send):
+        # The conditional headers are only added while sending, the request
+        # is kept by the response and sent again by Browser.reload().
+        added = []
+        for validator, condition in (('etag', 'If-None-Match'),
+                                     ('last-modified', 'If-Modified-Since')):
+            value = entry.header(validator)
+            if value is not None:
+                req.headers[condition] = value
+                added.append(condition)
+        try:
+            return send(req)
+        finally:
+            for condition in added:
+                del req.headers[condition]
+
+    def _vary(self, req, response_or_entry):
+        if isinstance(response_or_entry, CacheEntry):
+            vary = response_or_entry.header('vary')
+        else:
+            vary = response_or_entry.headers.get('Vary')
+        if not vary:
+            return ()
+        names = sorted(name.strip().lower() for name in vary.split(','))
+        return tuple((name, req.headers.get(name)) for name in names)
+
+    def _store(self, req, response, now):
+        if req.method != 'GET':
+            return
+        directives = utils.parse_cache_control(
+            response.headers.get('Cache-Control'))
+        vary = response.headers.get('Vary', '')
+        explicit = ('max-age' in directives or
+                    'Expires' in response.headers)
+        if ('no-store' in directives or '*' in vary or
+                not (explicit or
+                     response.status_int in HEURISTICALLY_CACHEABLE)):
+            self._entries.pop(req.url, None)
+            return
+        entry = CacheEntry(response, self._vary(req, response), now)
+        if not (entry.lifetime or entry.header('etag') or
+                entry.header('last-modified')):
+            # could neither be used nor validated
+            self._entries.pop(req.url, None)
+            return
+        self._entries[req.url] = entry
+        self._entries.move_to_end(req.url)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _invalidate(self, req, response):
+        # RFC 9111, 4.4: unsafe requests invalidate the target URI and the
+        # URIs the response points at
+        if response.status_int >= 400:
+            return
+        self._entries.pop(req.url, None)
+        for name in ('Location', 'Content-Location'):
+            value = response.headers.get(name)
+            if value:
+                self._entries.pop(urllib.parse.urljoin(req.url, value), None)
+
+    def _response(self, app, req, entry, now):
+        headerlist = [(name, value) for name, value in entry.headerlist
+                      if name.lower() != 'age']
+        headerlist.append(('Age', str(entry.age(now))))
+        response = app.RequestClass.ResponseClass(
+            body=entry.body, status=entry.status, headerlist=headerlist)
+        response.request = req
+        response.app = app.app
+        response.test_app = app
+        response._use_unicode = app.use_unicode
+        response.errors = ''
+        return response
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        return {'hits': self.hits,
+                'revalidated': self.revalidated,
+                'misses': self.misses,
+                'size': len(self._entries)}
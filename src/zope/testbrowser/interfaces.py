@@ -126,6 +126,14 @@ class IBrowser(zope.interface.Interface):
                      "``httplib.HTTPMessage``."),
         required=True)
 
+    responseHeaders = zope.schema.Field(
+        title="Response headers",
+        description=("Read-only, case-insensitive mapping of the headers of "
+                     "the HTTP response, with the ``status_code`` and "
+                     "``reason`` of the response as attributes.  Unlike "
+                     "``headers`` it is built only once per response."),
+        required=True)
+
     contents = zope.schema.Text(
         title="Contents",
         description="The complete response body of the HTTP request.",
@@ -222,6 +230,38 @@ class IBrowser(zope.interface.Interface):
         required=True,
         readonly=True)
 
+    lastRequestTimings = zope.schema.Field(
+        title="Timings of the phases of the last request",
+        description=(
+            """Return the wall clock and CPU time of the phases of the last
+        request, a ``RequestTimings`` object.
+
+        The phases are ``prepare`` (the work of the browser building the
+        requests and processing the responses), ``app`` (each hop sent to the
+        application or server), ``cookies``, ``parse`` and ``index``
+        (building the indexes of forms, controls and links).  The page is
+        parsed and indexed when it is first needed, these phases are added
+        when that happens.  Redirects skipped thanks to the
+        ``redirectCache`` of the browser are listed as ``skipped``.
+        """),
+        required=False,
+        readonly=True)
+
+    lastRequestMemory = zope.schema.Field(
+        title="Memory allocated by the last request",
+        description=(
+            """Return the memory allocated in the phases of the last request, a
+        ``RequestMemory`` object, if ``traceMemory`` is true, None otherwise.
+
+        The phases are ``app`` (each hop sent to the application, including
+        the response body), ``history`` (storing the previous response in the
+        history) and ``parse`` (parsing the page when it is first needed).
+        Each of them has the peak and the retained bytes allocated, measured
+        with tracemalloc.  Only one request can be traced at a time.
+        """),
+        required=False,
+        readonly=True)
+
     def getControl(label=None, name=None, index=None):
         """Get a control from the page.
 
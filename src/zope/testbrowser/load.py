@@ -0,0 +1,419 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Running browser scenarios as load tests
+"""
+
+import collections
+import concurrent.futures
+import math
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import urllib.parse
+
+from zope.testbrowser.browser import Browser
+
+
+__docformat__ = "reStructuredText"
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def url_key(url):
+    """Group requests by their URL without query string and fragment."""
+    parts = urllib.parse.urlsplit(url)
+    return urllib.parse.urlunsplit(parts[:3] + ('', ''))
+
+
+class LatencyHistogram:
+    """Latencies counted in buckets, in the manner of HDR histograms.
+
+    Latencies are kept in microseconds, exactly up to 127 and in buckets of
+    less than 1/64 of their value above, so percentiles are off by less than
+    1.6%.  Histograms are small and can be merged, whatever the number of
+    latencies counted.
+    """
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    @staticmethod
+    def _bucket(seconds):
+        value = int(seconds * 1e6)
+        shift = max(0, value.bit_length() - 7)
+        return (shift << 7) | (value >> shift)
+
+    @staticmethod
+    def _value(bucket):
+        # the middle of the bucket, in seconds
+        shift = bucket >> 7
+        low = (bucket & 127) << shift
+        return (low + ((1 << shift) - 1) / 2) / 1e6
+
+    def add(self, seconds):
+        bucket = self._bucket(seconds)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other):
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                if self.min is None or value < self.min:
+                    self.min = value
+                if self.max is None or value > self.max:
+                    self.max = value
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def percentile(self, p):
+        """Return the `p` percentile, by nearest rank."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                break
+        return min(max(self._value(bucket), self.min), self.max)
+
+
+class LoadStats:
+    """Histograms and errors per URL, iterations and failures of scenarios.
+
+    Users report their stats now and then, they are merged by the runner.
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.errors = collections.Counter()
+        self.iterations = 0
+        # exceptions raised by scenarios, by their repr
+        self.failures = collections.Counter()
+
+    def add(self, url, seconds, failed):
+        histogram = self.histograms.get(url)
+        if histogram is None:
+            histogram = self.histograms[url] = LatencyHistogram()
+        histogram.add(seconds)
+        if failed:
+            self.errors[url] += 1
+
+    def merge(self, other):
+        for url, histogram in other.histograms.items():
+            mine = self.histograms.get(url)
+            if mine is None:
+                mine = self.histograms[url] = LatencyHistogram()
+            mine.merge(histogram)
+        self.errors.update(other.errors)
+        self.iterations += other.iterations
+        self.failures.update(other.failures)
+
+
+class LoadBrowser(Browser):
+    """A `Browser` recording the time of each request, redirects included.
+
+    Samples are appended to `samples` as (url, seconds, failed) tuples, a list
+    of the browser's own, so that no locking is needed.  After each request
+    the browser sleeps for `thinkTime` seconds, which may be a callable
+    returning the time.
+    """
+
+    thinkTime = 0
+
+    def __init__(self, url=None, wsgi_app=None):
+        self.samples = []
+        super().__init__(url, wsgi_app)
+
+    def _processRequest(self, url, make_request):
+        failed = True
+        # The timer of the browser is restarted for each redirect, the sample
+        # is the time of the whole request.
+        start = time.perf_counter()
+        try:
+            result = super()._processRequest(url, make_request)
+            failed = False
+            return result
+        finally:
+            self.samples.append(
+                (url, time.perf_counter() - start, failed))
+            think = self.thinkTime
+            if callable(think):
+                think = think()
+            if think:
+                time.sleep(think)
+
+
+class URLStats:
+    """Latencies of the requests to one URL."""
+
+    def __init__(self, url, histogram, errors):
+        self.url = url
+        self.histogram = histogram
+        self.errors = errors
+
+    @property
+    def count(self):
+        return self.histogram.count
+
+    @property
+    def mean(self):
+        return self.histogram.mean
+
+    @property
+    def max(self):
+        return self.histogram.max
+
+    def percentile(self, p):
+        return self.histogram.percentile(p)
+
+    def asDict(self):
+        stats = {'count': self.count, 'errors': self.errors,
+                 'mean': self.mean, 'max': self.max}
+        for p in PERCENTILES:
+            stats['p%d' % p] = self.percentile(p)
+        return stats
+
+
+class LoadResult:
+    """The outcome of `LoadRunner.run`, built from the merged `LoadStats`."""
+
+    def __init__(self, stats, seconds):
+        self.seconds = seconds
+        self.iterations = stats.iterations
+        self.failures = stats.failures
+        self.urls = {}
+        total = LatencyHistogram()
+        for url in sorted(stats.histograms):
+            histogram = stats.histograms[url]
+            self.urls[url] = URLStats(url, histogram, stats.errors[url])
+            total.merge(histogram)
+        self.total = URLStats(None, total, sum(stats.errors.values()))
+
+    @property
+    def requests(self):
+        return self.total.count
+
+    @property
+    def errors(self):
+        return self.total.errors
+
+    @property
+    def throughput(self):
+        """Requests per second."""
+        return self.requests / self.seconds if self.seconds else 0.0
+
+    def report(self):
+        """Return a table of the latencies in milliseconds, per URL."""
+        columns = ['count', 'errors', 'mean'] + [
+            'p%d' % p for p in PERCENTILES] + ['max']
+        rows = [(url, stats.asDict()) for url, stats in self.urls.items()]
+        rows.append(('Total', self.total.asDict()))
+        width = max(len(url) for url, stats in rows)
+        lines = ['{:<{}} '.format('URL', width) +
+                 ' '.join('%8s' % c for c in columns)]
+        for url, stats in rows:
+            cells = []
+            for column in columns:
+                value = stats[column]
+                if value is None:
+                    cells.append('%8s' % '-')
+                elif column in ('count', 'errors'):
+                    cells.append('%8d' % value)
+                else:
+                    cells.append('%8.1f' % (value * 1000))
+            lines.append('{:<{}} '.format(url, width) + ' '.join(cells))
+        lines.append(
+            '%d requests in %.2f seconds, %.1f requests/second, '
+            '%d iterations, %d failed' % (
+                self.requests, self.seconds, self.throughput,
+                self.iterations, sum(self.failures.values())))
+        return '\n'.join(lines)
+
+
+class LoadRunner:
+    """Run `scenario` for `users` browsers at once, in a thread pool.
+
+    `scenario` is called with a browser for each iteration.  All browsers
+    share `wsgi_app`, without one they talk to real servers.  The browsers
+    are started evenly spread over `rampup` seconds.  Each of them runs the
+    scenario `iterations` times, or until `duration` seconds passed since the
+    start of the run, whatever comes first; a started iteration is always
+    completed.  Without both, each browser runs the scenario once.
+    `think_time` is the time a browser waits after each request, in seconds
+    or as a callable returning them, e.g. ``lambda: random.uniform(1, 3)``.
+
+    Latencies are grouped by the URL given by `key`, by default the URL of
+    the request without query string.
+    """
+
+    BrowserClass = LoadBrowser
+
+    # Seconds after which the users report their stats while running, at the
+    # end of an iteration.  None to report at the end only.
+    reportInterval = None
+
+    def __init__(self, scenario, wsgi_app=None, users=1, iterations=None,
+                 duration=None, rampup=0, think_time=0, key=url_key):
+        if iterations is None and duration is None:
+            iterations = 1
+        self.scenario = scenario
+        self.wsgi_app = wsgi_app
+        self.users = users
+        self.iterations = iterations
+        self.duration = duration
+        self.rampup = rampup
+        self.think_time = think_time
+        self.key = key
+
+    def _now(self):
+        return time.perf_counter()
+
+    def _report(self, stats):
+        with self._lock:
+            self._stats.merge(stats)
+
+    def _user(self, number, start):
+        delay = start + self.rampup * number / self.users - self._now()
+        if delay > 0:
+            time.sleep(delay)
+        browser = self.BrowserClass(wsgi_app=self.wsgi_app)
+        browser.thinkTime = self.think_time
+        stats = LoadStats()
+        reported = self._now()
+        try:
+            while (self.iterations is None or
+                   stats.iterations < self.iterations):
+                now = self._now()
+                if self.duration is not None and now - start >= self.duration:
+                    break
+                if (self.reportInterval is not None and
+                        now - reported >= self.reportInterval):
+                    self._report(stats)
+                    stats, reported = LoadStats(), now
+                stats.iterations += 1
+                try:
+                    self.scenario(browser)
+                except Exception as e:
+                    stats.failures[repr(e)] += 1
+                for url, seconds, failed in browser.samples:
+                    stats.add(self.key(url), seconds, failed)
+                del browser.samples[:]
+        finally:
+            self._report(stats)
+            browser.close()
+
+    def _runUsers(self, numbers):
+        """Run the users with the given `numbers`, returning the seconds."""
+        start = self._now()
+        with concurrent.futures.ThreadPoolExecutor(len(numbers)) as executor:
+            futures = [executor.submit(self._user, number, start)
+                       for number in numbers]
+            for future in futures:
+                future.result()
+        return self._now() - start
+
+    def run(self):
+        """Run the scenario, returning a `LoadResult`."""
+        self._stats = LoadStats()
+        self._lock = threading.Lock()
+        seconds = self._runUsers(range(self.users))
+        return LoadResult(self._stats, seconds)
+
+
+class ProcessLoadRunner(LoadRunner):
+    """Run `scenario` in `processes` worker processes, by default one per CPU.
+
+    Each worker builds an application of its own by calling `app_factory`,
+    e.g. the ``make_wsgi_app`` method of a ``zope.testbrowser.wsgi.Layer``,
+    and runs its share of the `users` in a thread pool like `LoadRunner`.
+    The workers send the histograms of their users to the runner every
+    `reportInterval` seconds, which merges them into one result.
+
+    `scenario`, `app_factory`, `key` and `think_time` are passed to the
+    workers, so they must be picklable, e.g. functions defined at module
+    level.
+    """
+
+    reportInterval = 1
+
+    def __init__(self, scenario, app_factory, processes=None, **kw):
+        super().__init__(scenario, **kw)
+        self.app_factory = app_factory
+        self.processes = min(processes or os.cpu_count() or 1, self.users)
+
+    def _report(self, stats):
+        self._queue.put(('stats', stats))
+
+    def _work(self, numbers, results):
+        self._queue = results
+        try:
+            self.wsgi_app = self.app_factory()
+            seconds = self._runUsers(numbers)
+        except BaseException as e:
+            results.put(('error', repr(e)))
+        else:
+            results.put(('done', seconds))
+
+    def run(self):
+        """Run the scenario, returning a `LoadResult`."""
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(
+                target=self._work,
+                args=(range(i, self.users, self.processes), results))
+            for i in range(self.processes)]
+        for worker in workers:
+            worker.start()
+        stats = LoadStats()
+        seconds = 0
+        finished = 0
+        try:
+            while finished < len(workers):
+                try:
+                    kind, value = results.get(timeout=1)
+                except queue.Empty:
+                    if any(worker.exitcode for worker in workers):
+                        raise RuntimeError('a load worker process died')
+                    continue
+                if kind == 'stats':
+                    stats.merge(value)
+                elif kind == 'done':
+                    finished += 1
+                    seconds = max(seconds, value)
+                else:
+                    raise RuntimeError('a load worker failed: ' + value)
+        finally:
+            for worker in workers:
+                if finished < len(workers):
+                    worker.terminate()
+                worker.join()
+        return LoadResult(stats, seconds)
@@ -0,0 +1,324 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Persistent HTTP connections for browsers talking to real servers
+"""
+
+import asyncio
+import http.client
+import ssl
+import threading
+import time
+import urllib.parse
+
+
+__docformat__ = "reStructuredText"
+
+
+class ConnectionPool:
+    """Keep-alive HTTP connections, pooled per scheme, host and port.
+
+    At most `maxsize` connections to the same host are open at a time,
+    a request waits for one to become free once the limit is reached.
+    Connections which were not used for `idle_timeout` seconds are closed.
+    `timeout` is the socket timeout of new connections.
+
+    The pool can be shared by browsers in different threads.  It also is a
+    client for ``wsgiproxy.proxies.Proxy``.
+    """
+
+    def __init__(self, maxsize=4, idle_timeout=30, timeout=None):
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.requests = 0
+        self.connections = 0  # opened so far
+        self.reused = 0
+        self._idle = {}  # key -> [(last used, connection)], LIFO
+        self._busy = {}  # key -> number of connections in use
+        self._cond = threading.Condition()
+
+    def _now(self):
+        return time.monotonic()
+
+    def _connect(self, key):
+        scheme, host, port = key
+        if scheme == 'https':
+            return http.client.HTTPSConnection(
+                host, port, timeout=self.timeout)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def _acquire(self, key):
+        """Return a connection to `key` and whether it was used before."""
+        with self._cond:
+            while True:
+                self._closeExpired()
+                idle = self._idle.get(key)
+                busy = self._busy.get(key, 0)
+                if idle:
+                    conn = idle.pop()[1]
+                    self._busy[key] = busy + 1
+                    self.reused += 1
+                    return conn, True
+                if busy < self.maxsize:
+                    self._busy[key] = busy + 1
+                    self.connections += 1
+                    break
+                self._cond.wait()
+        return self._connect(key), False
+
+    def _release(self, key, conn, reusable):
+        with self._cond:
+            self._busy[key] -= 1
+            if reusable:
+                self._idle.setdefault(key, []).append((self._now(), conn))
+            else:
+                conn.close()
+            self._cond.notify()
+
+    def _closeExpired(self):
+        deadline = self._now() - self.idle_timeout
+        for key, idle in list(self._idle.items()):
+            while idle and idle[0][0] <= deadline:
+                idle.pop(0)[1].close()
+            if not idle:
+                del self._idle[key]
+
+    def request(self, method, url, body=None, headers=None):
+        """Send a request, returning the response and its body.
+
+        The body is read completely, so that the connection can be reused.
+        A request failing because the server closed a reused connection in the
+        meantime is sent again on a new one.
+        """
+        parsed = urllib.parse.urlsplit(url)
+        scheme = parsed.scheme.lower()
+        port = parsed.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parsed.hostname, port)
+        path = urllib.parse.urlunsplit(('', '', parsed.path or '/',
+                                        parsed.query, ''))
+        with self._cond:
+            self.requests += 1
+        while True:
+            conn, reused = self._acquire(key)
+            try:
+                conn.request(method, path, body, headers or {})
+                response = conn.getresponse()
+                data = response.read()
+            except (ConnectionError, http.client.BadStatusLine):
+                self._release(key, conn, False)
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                self._release(key, conn, False)
+                raise
+            self._release(key, conn, not response.will_close)
+            return response, data
+
+    def __call__(self, uri, method, body, headers):
+        # The client interface of wsgiproxy, see wsgiproxy.proxies.HttpClient
+        headers.pop('Transfer-Encoding', None)
+        if headers.get('Content-Length'):
+            body = body.read(int(headers['Content-Length']))
+        else:
+            body = None
+        response, data = self.request(method, uri, body, headers)
+        status = f'{response.status} {response.reason}'
+        resp_headers = [(k, v) for k, v in response.getheaders()
+                        if k.lower() != 'transfer-encoding']
+        return (status, response.getheader('location', None),
+                resp_headers, [data])
+
+    def close(self):
+        """Close all idle connections."""
+        with self._cond:
+            for idle in self._idle.values():
+                for last_used, conn in idle:
+                    conn.close()
+            self._idle.clear()
+
+    def stats(self):
+        with self._cond:
+            return {'requests': self.requests,
+                    'connections': self.connections,
+                    'reused': self.reused,
+                    'idle': sum(len(idle) for idle in self._idle.values()),
+                    'busy': sum(self._busy.values())}
+
+
+class AsyncConnectionPool:
+    """Keep-alive HTTP connections for asyncio, pooled like `ConnectionPool`.
+
+    A pool must only be used from one event loop.  Only what a browser needs
+    of HTTP/1.1 is spoken: bodies are sent with a ``Content-Length`` and read
+    by their length, chunked or up to the end of the connection.
+    """
+
+    def __init__(self, maxsize=4, idle_timeout=30, timeout=None,
+                 ssl_context=None):
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self.requests = 0
+        self.connections = 0
+        self.reused = 0
+        self._idle = {}  # key -> [(last used, reader, writer)], LIFO
+        self._limits = {}  # key -> asyncio.Semaphore
+        self._busy = {}
+
+    def _now(self):
+        return time.monotonic()
+
+    async def _connect(self, key):
+        scheme, host, port = key
+        context = None
+        if scheme == 'https':
+            context = self.ssl_context or ssl.create_default_context()
+        return await asyncio.open_connection(host, port, ssl=context)
+
+    def _closeExpired(self):
+        deadline = self._now() - self.idle_timeout
+        for key, idle in list(self._idle.items()):
+            while idle and idle[0][0] <= deadline:
+                idle.pop(0)[2].close()
+            if not idle:
+                del self._idle[key]
+
+    async def request(self, method, url, body=None, headers=None):
+        """Send a request, returning status, reason, headers and body.
+
+        The headers are a list of (name, value) pairs.
+        """
+        parsed = urllib.parse.urlsplit(url)
+        scheme = parsed.scheme.lower()
+        port = parsed.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parsed.hostname, port)
+        path = urllib.parse.urlunsplit(('', '', parsed.path or '/',
+                                        parsed.query, ''))
+        headers = dict(headers or {})
+        headers.setdefault('Host', parsed.netloc)
+        if body is not None:
+            headers['Content-Length'] = str(len(body))
+        head = ''.join(
+            [f'{method} {path} HTTP/1.1\r\n'] +
+            [f'{name}: {value}\r\n' for name, value in headers.items()] +
+            ['\r\n']).encode('latin-1')
+
+        self.requests += 1
+        limit = self._limits.get(key)
+        if limit is None:
+            limit = self._limits[key] = asyncio.Semaphore(self.maxsize)
+        async with limit:
+            self._busy[key] = self._busy.get(key, 0) + 1
+            try:
+                return await asyncio.wait_for(
+                    self._exchange(key, method, head, body), self.timeout)
+            finally:
+                self._busy[key] -= 1
+
+    async def _exchange(self, key, method, head, body):
+        while True:
+            self._closeExpired()
+            idle = self._idle.get(key)
+            if idle:
+                reader, writer = idle.pop()[1:]
+                reused = True
+                self.reused += 1
+            else:
+                reader, writer = await self._connect(key)
+                reused = False
+                self.connections += 1
+            try:
+                writer.write(head + (body or b''))
+                await writer.drain()
+                result, keep = await self._readResponse(reader, method)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if reused:
+                    # closed by the server while idle, use a new connection
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            if keep:
+                self._idle.setdefault(key, []).append(
+                    (self._now(), reader, writer))
+            else:
+                writer.close()
+            return result
+
+    async def _readResponse(self, reader, method):
+        while True:
+            line = await reader.readuntil(b'\r\n')
+            version, _, rest = line.decode('latin-1').strip().partition(' ')
+            code, _, reason = rest.partition(' ')
+            status = int(code)
+            headers = []
+            while True:
+                line = (await reader.readuntil(b'\r\n')).decode('latin-1')
+                if line == '\r\n':
+                    break
+                name, _, value = line.partition(':')
+                headers.append((name.strip(), value.strip()))
+            if status >= 200 or status == 101:
+                break
+            # skip informational responses
+
+        fields = {name.lower(): value for name, value in headers}
+        tokens = [t.strip().lower()
+                  for t in fields.get('connection', '').split(',')]
+        keep = 'close' not in tokens and (
+            version != 'HTTP/1.0' or 'keep-alive' in tokens)
+        if method == 'HEAD' or status in (204, 304):
+            body = b''
+        elif 'chunked' in fields.get('transfer-encoding', '').lower():
+            body = await self._readChunked(reader)
+            headers = [(name, value) for name, value in headers
+                       if name.lower() != 'transfer-encoding']
+        elif 'content-length' in fields:
+            body = await reader.readexactly(int(fields['content-length']))
+        else:
+            body = await reader.read()
+            keep = False
+        return (status, reason, headers, body), keep
+
+    async def _readChunked(self, reader):
+        parts = []
+        while True:
+            size = (await reader.readuntil(b'\r\n')).split(b';')[0]
+            size = int(size.strip(), 16)
+            if not size:
+                break
+            parts.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        # trailers
+        while await reader.readuntil(b'\r\n') != b'\r\n':
+            pass
+        return b''.join(parts)
+
+    def close(self):
+        """Close all idle connections."""
+        for idle in self._idle.values():
+            for last_used, reader, writer in idle:
+                writer.close()
+        self._idle.clear()
+
+    def stats(self):
+        return {'requests': self.requests,
+                'connections': self.connections,
+                'reused': self.reused,
+                'idle': sum(len(idle) for idle in self._idle.values()),
+                'busy': sum(self._busy.values())}
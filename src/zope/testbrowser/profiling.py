@@ -0,0 +1,170 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Profiling the application under test, per URL
+"""
+
+import cProfile
+import os
+import pstats
+import re
+import threading
+from contextlib import contextmanager
+
+from zope.testbrowser.load import url_key
+
+
+__docformat__ = "reStructuredText"
+
+TOTAL = '_total'
+
+# Call chains deeper than this are cut off in collapsed stacks.
+MAX_DEPTH = 200
+
+
+def _label(func):
+    filename, line, name = func
+    if filename == '~':
+        # a built-in function, e.g. "<method 'append' of 'list' objects>"
+        label = name
+    else:
+        label = f'{name} ({os.path.basename(filename)}:{line})'
+    return label.replace(';', ',')
+
+
+def collapsed(stats):
+    """Return `stats` as lines of collapsed stacks, in microseconds.
+
+    That is the input format of ``flamegraph.pl``, speedscope and others.
+    A profile only knows the callers of each function, so the stacks are
+    rebuilt from the call graph, sharing the time of a function between its
+    callers as it was measured for each of them.
+    """
+    callees = {}
+    roots = []
+    for func, (cc, nc, tt, ct, callers) in stats.stats.items():
+        if not callers:
+            roots.append(func)
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    times = {}
+
+    def walk(func, stack, seconds):
+        cumulative = stats.stats[func][3]
+        share = seconds / cumulative if cumulative else 0.0
+        stack = stack + (_label(func),)
+        own = stats.stats[func][2] * share
+        if own:
+            times[stack] = times.get(stack, 0.0) + own
+        if len(stack) >= MAX_DEPTH:
+            return
+        for callee, edge in callees.get(func, ()):
+            if _label(callee) not in stack:  # skip recursive calls
+                walk(callee, stack, edge * share)
+
+    for root in roots:
+        walk(root, (), stats.stats[root][3])
+    lines = []
+    for stack, seconds in sorted(times.items()):
+        microseconds = round(seconds * 1e6)
+        if microseconds:
+            lines.append('{} {}'.format(';'.join(stack), microseconds))
+    return lines
+
+
+class Profiler:
+    """Profile the application while it answers the requests of browsers.
+
+    Assign a profiler to ``Browser.profiler``, of a browser or the class to
+    profile all browsers, or to ``zope.testbrowser.wsgi.Layer.profiler``.
+    Profiles are aggregated per URL given by `key`, by default the URL of the
+    request without query string, and written to `directory` by `save`.
+
+    `factory` creates the profilers, which need the interface of
+    ``cProfile.Profile``.  Only one request is profiled at a time, requests
+    sent by other threads meanwhile wait, those sent by the application while
+    answering a request are part of its profile.
+    """
+
+    def __init__(self, directory=None, key=url_key, factory=cProfile.Profile):
+        self.directory = directory
+        self.key = key
+        self.factory = factory
+        self.profiles = {}
+        self._lock = threading.RLock()
+        self._active = False
+
+    @contextmanager
+    def profiling(self, url):
+        """Profile the code run in the context, as a request to `url`."""
+        with self._lock:
+            if self._active:
+                # a request sent while answering one is part of its profile
+                yield
+                return
+            key = self.key(url)
+            profile = self.profiles.get(key)
+            if profile is None:
+                profile = self.profiles[key] = self.factory()
+            self._active = True
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                self._active = False
+
+    @property
+    def stats(self):
+        """The ``pstats.Stats`` of the profiles, by their key."""
+        return {key: pstats.Stats(profile)
+                for key, profile in sorted(self.profiles.items())}
+
+    def clear(self):
+        self.profiles.clear()
+
+    def save(self, directory=None):
+        """Write the profiles to `directory`, returning the paths written.
+
+        Each profile is written as a ``.pstats`` file of ``pstats`` and a
+        ``.collapsed`` file of collapsed stacks, named after its key.  All
+        profiles together are written to ``_total.pstats`` and
+        ``_total.collapsed``.
+        """
+        directory = directory or self.directory
+        os.makedirs(directory, exist_ok=True)
+        stats = self.stats
+        if stats:
+            total = pstats.Stats(*self.profiles.values())
+            stats[TOTAL] = total
+        paths = []
+        names = set()
+        for key, key_stats in stats.items():
+            name = self._name(key)
+            if name in names:
+                name = f'{name}-{len(names)}'
+            names.add(name)
+            path = os.path.join(directory, name)
+            key_stats.dump_stats(path + '.pstats')
+            with open(path + '.collapsed', 'w', encoding='utf-8') as f:
+                for line in collapsed(key_stats):
+                    f.write(line + '\n')
+            paths.extend([path + '.pstats', path + '.collapsed'])
+        return paths
+
+    def _name(self, key):
+        if key == TOTAL:
+            return key
+        key = re.sub(r'^\w+://', '', str(key))
+        return re.sub(r'[^\w.-]+', '_', key).strip('_') or 'root'
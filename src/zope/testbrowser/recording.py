@@ -0,0 +1,216 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Recording the requests of browsers and replaying them
+"""
+
+import base64
+import concurrent.futures
+import gzip
+import http.cookiejar
+import json
+import threading
+import time
+
+import webob
+import webtest.utils
+
+from zope.testbrowser.load import LoadResult
+from zope.testbrowser.load import LoadStats
+from zope.testbrowser.load import url_key
+
+
+__docformat__ = "reStructuredText"
+
+FORMAT_VERSION = 1
+
+
+class RecordedRequest:
+    """A request sent by a browser, with the status and time of its response.
+
+    `offset` is the time the request was sent at, in seconds since the
+    recorder was started.  `cookies` is the ``Cookie`` header, which also is
+    part of `headers`.
+    """
+
+    def __init__(self, method, url, headers, body, status, seconds, offset):
+        self.method = method
+        self.url = url
+        self.headers = headers
+        self.body = body
+        self.status = status
+        self.seconds = seconds
+        self.offset = offset
+
+    @property
+    def cookies(self):
+        for name, value in self.headers:
+            if name.lower() == 'cookie':
+                return value
+        return None
+
+    def __repr__(self):
+        return '<RecordedRequest {} {} {}>'.format(
+            self.method, self.url, self.status)
+
+    def asDict(self):
+        data = {'method': self.method, 'url': self.url,
+                'headers': self.headers, 'status': self.status,
+                'seconds': round(self.seconds, 6),
+                'offset': round(self.offset, 6)}
+        if self.body:
+            try:
+                data['body'] = self.body.decode('utf-8')
+            except UnicodeDecodeError:
+                data['body64'] = base64.b64encode(self.body).decode('ascii')
+        return data
+
+    @classmethod
+    def fromDict(cls, data):
+        if 'body64' in data:
+            body = base64.b64decode(data['body64'])
+        else:
+            body = data.get('body', '').encode('utf-8')
+        return cls(data['method'], data['url'],
+                   [tuple(header) for header in data['headers']], body,
+                   data['status'], data['seconds'], data['offset'])
+
+
+class Recorder:
+    """Record the requests browsers send to applications.
+
+    Assign a recorder to ``Browser.recorder``, of a browser or the class to
+    record all browsers.  Every request sent is recorded, including each hop
+    of a redirect; responses served by ``Browser.httpCache`` are not.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.started = time.perf_counter()
+
+    def record(self, req, response, seconds):
+        """Record the webob request `req`, answered by `response`."""
+        self.requests.append(RecordedRequest(
+            req.method, req.url, list(req.headers.items()), req.body,
+            response.status_int, seconds,
+            time.perf_counter() - seconds - self.started))
+
+    def clear(self):
+        del self.requests[:]
+        self.started = time.perf_counter()
+
+    def save(self, path):
+        """Save the requests as gzip compressed JSON lines."""
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            f.write(json.dumps({'version': FORMAT_VERSION}) + '\n')
+            for request in self.requests:
+                f.write(json.dumps(request.asDict(),
+                                   separators=(',', ':')) + '\n')
+
+
+def load(path):
+    """Return the `RecordedRequest` objects saved by `Recorder.save`."""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        if header.get('version') != FORMAT_VERSION:
+            raise ValueError(f'unknown recording format in {path}')
+        return [RecordedRequest.fromDict(json.loads(line)) for line in f]
+
+
+class ReplayResult(LoadResult):
+    """A `LoadResult` with the time of each request replayed.
+
+    `timings` are (session, method, url, status, seconds) tuples.
+    """
+
+    def __init__(self, stats, seconds, timings):
+        super().__init__(stats, seconds)
+        self.timings = timings
+
+
+class Replayer:
+    """Send recorded requests to `wsgi_app` again, without parsing responses.
+
+    The requests are replayed as `sessions` sessions, at most `concurrency`
+    at a time in a thread pool, each sending all requests one after the
+    other without waiting.  With `cookies`, each session keeps the cookies
+    set by the application in a cookie jar of its own and sends them instead
+    of the recorded ``Cookie`` headers.  Requests answered with another
+    status than the recorded one count as errors.
+    """
+
+    def __init__(self, requests, wsgi_app, sessions=1, concurrency=1,
+                 cookies=True, key=url_key):
+        self.requests = requests
+        self.wsgi_app = wsgi_app
+        self.sessions = sessions
+        self.concurrency = concurrency
+        self.cookies = cookies
+        self.key = key
+
+    def _session(self, number):
+        stats = LoadStats()
+        timings = []
+        jar = http.cookiejar.CookieJar() if self.cookies else None
+        for recorded in self.requests:
+            headers = recorded.headers
+            if jar is not None:
+                headers = [(name, value) for name, value in headers
+                           if name.lower() != 'cookie']
+            req = webob.Request.blank(
+                recorded.url, method=recorded.method, headers=headers)
+            if recorded.body:
+                req.body = recorded.body
+            if jar is not None:
+                jar.add_cookie_header(webtest.utils._RequestCookieAdapter(req))
+            start = time.perf_counter()
+            try:
+                response = req.get_response(self.wsgi_app)
+                response.body
+            except Exception as e:
+                seconds = time.perf_counter() - start
+                stats.failures[repr(e)] += 1
+                status = None
+            else:
+                seconds = time.perf_counter() - start
+                status = response.status_int
+                if jar is not None:
+                    jar.extract_cookies(
+                        webtest.utils._ResponseCookieAdapter(response),
+                        webtest.utils._RequestCookieAdapter(req))
+            stats.add(self.key(recorded.url), seconds,
+                      status != recorded.status)
+            timings.append(
+                (number, recorded.method, recorded.url, status, seconds))
+        stats.iterations = 1
+        return stats, timings
+
+    def run(self):
+        """Replay the requests, returning a `ReplayResult`."""
+        stats = LoadStats()
+        timings = []
+        lock = threading.Lock()
+
+        def session(number):
+            session_stats, session_timings = self._session(number)
+            with lock:
+                stats.merge(session_stats)
+                timings.extend(session_timings)
+
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(
+                self.concurrency) as executor:
+            for future in [executor.submit(session, number)
+                           for number in range(self.sessions)]:
+                future.result()
+        return ReplayResult(stats, time.perf_counter() - start, timings)
@@ -0,0 +1,190 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Tests for zope.testbrowser.asgi
+"""
+
+import asyncio
+import threading
+import unittest
+import urllib.parse
+
+import zope.testbrowser.wsgi
+from zope.testbrowser.asgi import ASGIAdapter
+from zope.testbrowser.asgi import get_loop
+from zope.testbrowser.asgi import is_asgi_app
+from zope.testbrowser.asyncbrowser import AsyncBrowser
+from zope.testbrowser.browser import Browser
+from zope.testbrowser.testing import demo_app
+
+
+PAGE = '''<html><head><title>%(title)s</title></head><body>
+<a href="/redirect">Redirect</a>
+<form method="post" action="/echo">
+  <label for="name">Name</label><input id="name" name="name" />
+  <input type="submit" name="save" value="Save" />
+</form>
+</body></html>'''
+
+
+# The thread of the shared event loop outlives the tests, start it before
+# the test runner looks for threads left behind.
+get_loop()
+
+
+class App:
+    """A small ASGI application."""
+
+    def __init__(self):
+        self.loops = set()
+        self.waiting = None
+
+    async def __call__(self, scope, receive, send):
+        assert scope['type'] == 'http'
+        self.loops.add(asyncio.get_running_loop())
+        path = scope['path']
+        headers = dict(scope['headers'])
+        message = await receive()
+        status = 200
+        response_headers = [(b'content-type', b'text/html; charset=UTF-8')]
+        if path == '/':
+            title = 'Cookie: %s' % headers.get(b'cookie', b'').decode()
+            response_headers.append((b'set-cookie', b'seen=yes; Path=/'))
+        elif path == '/echo':
+            title = '{} {} {}'.format(
+                scope['method'], scope['query_string'].decode(),
+                urllib.parse.unquote_plus(message['body'].decode()))
+        elif path == '/redirect':
+            status = 302
+            response_headers.append((b'location', b'/echo?redirected=1'))
+            title = 'Redirect'
+        elif path == '/wait':
+            # answered once a second request arrives
+            if self.waiting is None:
+                self.waiting = asyncio.Event()
+                await asyncio.wait_for(self.waiting.wait(), 5)
+            else:
+                self.waiting.set()
+            title = 'Waited'
+        else:
+            status = 404
+            title = 'Not found'
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': response_headers})
+        body = (PAGE % {'title': title}).encode()
+        # send the body in two parts
+        await send({'type': 'http.response.body', 'body': body[:10],
+                    'more_body': True})
+        await send({'type': 'http.response.body', 'body': body[10:]})
+
+
+class TestIsASGIApp(unittest.TestCase):
+
+    def test_detection(self):
+        async def asgi(scope, receive, send):
+            pass
+
+        self.assertTrue(is_asgi_app(asgi))
+        self.assertTrue(is_asgi_app(App()))
+        self.assertFalse(is_asgi_app(demo_app))
+        self.assertFalse(is_asgi_app(ASGIAdapter(asgi)))
+
+
+class TestBrowserASGI(unittest.TestCase):
+    """The synchronous browser calling an ASGI application."""
+
+    def setUp(self):
+        super().setUp()
+        self.app = App()
+        self.browser = Browser(wsgi_app=self.app)
+
+    def test_adapter(self):
+        self.assertIsInstance(self.browser.testapp.app, ASGIAdapter)
+
+    def test_cookies_forms_and_redirects(self):
+        browser = self.browser
+        browser.open('http://localhost/')
+        self.assertEqual(browser.title, 'Cookie: ')
+        browser.open('http://localhost/')
+        self.assertEqual(browser.title, 'Cookie: seen=yes')
+        browser.getControl('Name').value = 'Jürgen'
+        browser.getControl('Save').click()
+        self.assertEqual(browser.title, 'POST  name=Jürgen&save=Save')
+        browser.getLink('Redirect').click()
+        self.assertEqual(browser.url, 'http://localhost/echo?redirected=1')
+        self.assertEqual(browser.title, 'GET redirected=1 ')
+
+    def test_errors(self):
+        with self.assertRaises(Exception) as err:
+            self.browser.open('http://localhost/missing')
+        self.assertEqual(str(err.exception), 'HTTP Error 404: Not Found')
+
+    def test_requests_are_not_serialized(self):
+        titles = []
+
+        def open():
+            browser = Browser(wsgi_app=self.app)
+            browser.open('http://localhost/wait')
+            titles.append(browser.title)
+
+        threads = [threading.Thread(target=open) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(titles, ['Waited', 'Waited'])
+
+    def test_layer(self):
+        class Layer(zope.testbrowser.wsgi.Layer):
+            def make_wsgi_app(self):
+                return App()
+
+        layer = Layer()
+        layer.setUp()
+        try:
+            browser = zope.testbrowser.wsgi.Browser('http://localhost/')
+        finally:
+            layer.tearDown()
+        self.assertEqual(browser.title, 'Cookie: ')
+
+
+class TestAsyncBrowserASGI(unittest.TestCase):
+    """The asyncio browser calling an ASGI application."""
+
+    def test_runs_in_the_loop_of_the_browser(self):
+        app = App()
+
+        async def session():
+            browser = AsyncBrowser(wsgi_app=app)
+            await browser.open('http://localhost/')
+            await browser.open('http://localhost/')
+            self.assertEqual(browser.title, 'Cookie: seen=yes')
+            browser.getControl('Name').value = 'x'
+            await browser.getControl('Save').click()
+            self.assertEqual(browser.title, 'POST  name=x&save=Save')
+            await browser.follow('Redirect')
+            return browser.title
+
+        async def main():
+            titles = await asyncio.gather(
+                session(), session(), self.wait(app), self.wait(app))
+            return titles, asyncio.get_running_loop()
+
+        titles, loop = asyncio.run(main())
+        self.assertEqual(titles, ['GET redirected=1 '] * 2 + ['Waited'] * 2)
+        self.assertEqual(app.loops, {loop})
+
+    async def wait(self, app):
+        browser = AsyncBrowser(wsgi_app=app)
+        await browser.open('http://localhost/wait')
+        return browser.title
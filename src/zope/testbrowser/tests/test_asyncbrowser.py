@@ -0,0 +1,237 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Tests for zope.testbrowser.asyncbrowser
+"""
+
+import asyncio
+import http.server
+import threading
+import time
+import unittest
+import urllib.parse
+
+from zope.testbrowser.asyncbrowser import AsyncBrowser
+from zope.testbrowser.browser import BrowserStateError
+from zope.testbrowser.ftests.wsgitestapp import WSGITestApplication
+
+
+class SessionApp:
+    """Counts the requests of each session, identified by a cookie."""
+
+    def __init__(self):
+        self.threads = set()
+        self.lock = threading.Lock()
+        self.sessions = {}
+
+    def __call__(self, environ, start_response):
+        self.threads.add(threading.current_thread())
+        cookie = environ.get('HTTP_COOKIE', '')
+        qs = urllib.parse.parse_qs(environ.get('QUERY_STRING', ''))
+        headers = [('Content-Type', 'text/html; charset=UTF-8')]
+        if not cookie:
+            cookie = 'session=%s' % qs['name'][0]
+            headers.append(('Set-Cookie', cookie + '; Path=/'))
+        with self.lock:
+            count = self.sessions[cookie] = self.sessions.get(cookie, 0) + 1
+        body = b'<html><title>%s %d</title></html>' % (cookie.encode(), count)
+        start_response('200 OK', headers)
+        return [body]
+
+
+class TestAsyncBrowserWSGI(unittest.TestCase):
+    """AsyncBrowser running a WSGI application in an executor."""
+
+    def test_navigation(self):
+        async def session():
+            browser = AsyncBrowser(wsgi_app=WSGITestApplication())
+            await browser.open('http://localhost/@@/testbrowser/navigate.html')
+            await browser.follow('Link Text')
+            self.assertIn('Message: <em>By Link Text</em>', browser.contents)
+            await browser.getLink('Link Text').click()
+            await browser.reload()
+            browser.goBack()
+            self.assertEqual(
+                browser.url, 'http://localhost/@@/testbrowser/navigate.html'
+                '?message=By+Link+Text')
+
+            await browser.open('http://localhost/@@/testbrowser/forms.html')
+            form = browser.getForm(name='one')
+            form.getControl(name='text-value').value = 'Changed'
+            await form.getControl(name='submit-1').click()
+            self.assertIn('<em>Changed</em>', browser.contents)
+
+            await browser.getForm(name='two').submit('Submit')
+            self.assertIn('<em>Second Text</em>', browser.contents)
+            return browser
+
+        browser = asyncio.run(session())
+        self.assertIsNotNone(browser.lastRequestSeconds)
+
+    def test_concurrent_sessions(self):
+        app = SessionApp()
+
+        async def session(name):
+            browser = AsyncBrowser(wsgi_app=app)
+            for i in range(3):
+                await browser.open('http://localhost/?name=%s' % name)
+            return browser.title
+
+        async def main():
+            return await asyncio.gather(
+                *[session('s%d' % i) for i in range(20)])
+
+        self.assertEqual(asyncio.run(main()),
+                         ['session=s%d 3' % i for i in range(20)])
+        self.assertNotIn(threading.current_thread(), app.threads)
+
+    def test_trace_memory_of_concurrent_sessions(self):
+        def slow(environ, start_response):
+            time.sleep(0.2)
+            start_response('200 OK', [('Content-Type', 'text/html')])
+            return [b'<html></html>']
+
+        async def session():
+            browser = AsyncBrowser(wsgi_app=slow)
+            browser.traceMemory = True
+            await browser.open('http://localhost/')
+            return browser.lastRequestMemory.byPhase()['app']['count']
+
+        async def main():
+            return await asyncio.gather(
+                session(), session(), return_exceptions=True)
+
+        # tracemalloc cannot measure the requests of both sessions at once
+        first, second = asyncio.run(main())
+        self.assertEqual(first, 1)
+        self.assertIsInstance(second, BrowserStateError)
+
+    def test_errors(self):
+        async def session():
+            browser = AsyncBrowser(wsgi_app=WSGITestApplication())
+            with self.assertRaises(Exception) as err:
+                await browser.open('http://localhost/set_status.html'
+                                   '?status=404&reason=Not+Found')
+            self.assertEqual(str(err.exception),
+                             'HTTP Error 404: Not Found')
+            browser.raiseHttpErrors = False
+            await browser.open('http://localhost/set_status.html'
+                               '?status=404&reason=Not+Found')
+            self.assertEqual(browser.responseHeaders.status_code, 404)
+
+        asyncio.run(session())
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def respond(self, status, body, headers=(), chunked=False):
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=UTF-8')
+        for name, value in headers:
+            self.send_header(name, value)
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for i in range(0, len(body), 10):
+                chunk = body[i:i + 10]
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+            self.wfile.write(b'0\r\n\r\n')
+        else:
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.requests.append((self.client_address[1], self.path))
+        if self.path == '/robots.txt':
+            self.respond(404, b'')
+        elif self.path == '/login':
+            self.respond(302, b'', [('Location', '/home'),
+                                    ('Set-Cookie', 'user=bob; Path=/')])
+        elif self.path == '/home':
+            self.respond(200, b'<html><title>Home of %s</title><form '
+                         b'method="post" action="/save"><input name="q" />'
+                         b'<input type="submit" value="Save" /></form>'
+                         b'</html>' % self.headers['Cookie'].encode(),
+                         chunked=True)
+        else:
+            self.respond(404, b'<html><title>Not found</title></html>')
+
+    def do_POST(self):
+        self.server.requests.append((self.client_address[1], self.path))
+        data = self.rfile.read(int(self.headers['Content-Length']))
+        self.respond(200, b'<html><title>Saved %s</title></html>' % data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAsyncBrowserHTTP(unittest.TestCase):
+    """AsyncBrowser talking to a real server over asyncio."""
+
+    def setUp(self):
+        super().setUp()
+        self.server = http.server.ThreadingHTTPServer(
+            ('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.server.requests = []
+        thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={'poll_interval': 0.01})
+        thread.daemon = True
+        thread.start()
+        self.base = 'http://127.0.0.1:%d' % self.server.server_port
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def test_session(self):
+        async def session():
+            browser = AsyncBrowser()
+            await browser.open(self.base + '/login')
+            self.assertEqual(browser.title, 'Home of user=bob')
+            self.assertEqual(browser.cookies['user'], 'bob')
+            browser.getControl(name='q').value = 'a b'
+            await browser.getControl('Save').click()
+            self.assertEqual(browser.title, 'Saved q=a+b')
+            browser.raiseHttpErrors = False
+            await browser.open(self.base + '/missing')
+            self.assertEqual(browser.responseHeaders.status_code, 404)
+            stats = browser.stats['connections']
+            browser.close()
+            return stats
+
+        stats = asyncio.run(session())
+        self.assertEqual(
+            [path for port, path in self.server.requests],
+            ['/robots.txt', '/login', '/home', '/save', '/missing'])
+        # robots.txt is fetched by the connection pool of the thread
+        self.assertEqual(
+            len({port for port, path in self.server.requests[1:]}), 1)
+        self.assertEqual(stats, {'requests': 4, 'connections': 1,
+                                 'reused': 3, 'idle': 1, 'busy': 0})
+
+    def test_concurrent_sessions(self):
+        async def session():
+            browser = AsyncBrowser()
+            browser.asyncConnectionPool.maxsize = 1
+            await browser.open(self.base + '/login')
+            browser.close()
+            return browser.title
+
+        async def main():
+            return await asyncio.gather(*[session() for i in range(10)])
+
+        self.assertEqual(asyncio.run(main()), ['Home of user=bob'] * 10)
@@ -15,13 +15,30 @@
 """
 
 import doctest
+import email.message
 import io
+import os
+import socket
+import tracemalloc
 import unittest
+import urllib.error
+import urllib.parse
+from unittest import mock
+
+import webtest
 
 import zope.testbrowser.tests.helper
 from zope.testbrowser.browser import Browser
+from zope.testbrowser.browser import BrowserStateError
+from zope.testbrowser.browser import History
 from zope.testbrowser.browser import ItemCountError
 from zope.testbrowser.browser import ItemNotFoundError
+from zope.testbrowser.browser import RedirectCache
+from zope.testbrowser.browser import RequestMemory
+from zope.testbrowser.browser import RequestTimings
+from zope.testbrowser.browser import RobotExclusionError
+from zope.testbrowser.browser import RobotsCache
+from zope.testbrowser.ftests.wsgitestapp import WSGITestApplication
 
 
 class TestApp:
@@ -203,6 +220,797 @@ class TestMechRepr(unittest.TestCase):
         self.assertEqual(mech_repr, '<SubmitControl(sub1=Yës)>')
 
 
+class FakeRobotsResponse(io.BytesIO):
+
+    def __init__(self, body, **headers):
+        super().__init__(body)
+        self.headers = email.message.Message()
+        for name, value in headers.items():
+            self.headers[name.replace('_', '-')] = value
+
+
+class TestRobotsCache(unittest.TestCase):
+    """Testing ..browser.RobotsCache."""
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch('urllib.request.urlopen')
+        self.urlopen = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.urlopen.side_effect = (
+            lambda url: FakeRobotsResponse(b'User-agent: *\nDisallow: /no'))
+        # proxies configured for the tests would be used instead of the pool
+        environ = mock.patch.dict('os.environ')
+        environ.start()
+        self.addCleanup(environ.stop)
+        for name in list(os.environ):
+            if name.lower().endswith('_proxy'):
+                del os.environ[name]
+        self.cache = RobotsCache()
+        self.now = 1000.0
+        self.cache._now = lambda: self.now
+
+    def test_caches_per_scheme_and_host(self):
+        self.cache.get('http://example.com/a')
+        self.cache.get('http://example.com/b')
+        self.cache.get('https://example.com/a')
+        self.cache.get('http://example.com:8080/a')
+        self.assertEqual(
+            [c.args[0] for c in self.urlopen.call_args_list],
+            ['http://example.com/robots.txt',
+             'https://example.com/robots.txt',
+             'http://example.com:8080/robots.txt'])
+        self.assertEqual(self.cache.stats(),
+                         {'hits': 1, 'misses': 3, 'size': 3})
+
+    def test_entries_expire_after_ttl(self):
+        self.cache.ttl = 10
+        self.cache.get('http://example.com/')
+        self.now += 9
+        self.cache.get('http://example.com/')
+        self.assertEqual(self.urlopen.call_count, 1)
+        self.now += 1
+        self.cache.get('http://example.com/')
+        self.assertEqual(self.urlopen.call_count, 2)
+
+    def test_honors_max_age(self):
+        self.urlopen.side_effect = lambda url: FakeRobotsResponse(
+            b'', Cache_Control='public, max-age=100')
+        self.cache.get('http://example.com/')
+        self.now += 99
+        self.cache.get('http://example.com/')
+        self.assertEqual(self.urlopen.call_count, 1)
+        self.now += 1
+        self.cache.get('http://example.com/')
+        self.assertEqual(self.urlopen.call_count, 2)
+
+    def test_honors_expires(self):
+        self.now = 784111777  # Sun, 06 Nov 1994 08:49:37 GMT
+        self.urlopen.side_effect = lambda url: FakeRobotsResponse(
+            b'', Expires='Sun, 06 Nov 1994 08:50:37 GMT')
+        self.cache.get('http://example.com/')
+        self.assertEqual(self.cache._entries[('http', 'example.com')][0],
+                         self.now + 60)
+
+    def test_no_store_is_not_cached(self):
+        self.urlopen.side_effect = lambda url: FakeRobotsResponse(
+            b'', Cache_Control='no-store')
+        self.cache.get('http://example.com/')
+        self.cache.get('http://example.com/')
+        self.assertEqual(self.urlopen.call_count, 2)
+        self.assertEqual(self.cache.stats()['size'], 0)
+
+    def test_lifetime_is_capped(self):
+        self.urlopen.side_effect = lambda url: FakeRobotsResponse(
+            b'', Cache_Control='max-age=31536000')
+        self.cache.get('http://example.com/')
+        self.assertEqual(self.cache._entries[('http', 'example.com')][0],
+                         self.now + 86400)
+
+    def test_size_is_bounded(self):
+        self.cache.maxsize = 2
+        self.cache.get('http://a.example.com/')
+        self.cache.get('http://b.example.com/')
+        self.cache.get('http://a.example.com/')
+        self.cache.get('http://c.example.com/')
+        self.assertEqual(
+            list(self.cache._entries),
+            [('http', 'a.example.com'), ('http', 'c.example.com')])
+
+    def test_invalidate(self):
+        self.cache.get('http://a.example.com/')
+        self.cache.get('http://b.example.com/')
+        self.cache.invalidate('http://a.example.com/some/page')
+        self.assertEqual(list(self.cache._entries),
+                         [('http', 'b.example.com')])
+        self.cache.invalidate()
+        self.assertEqual(self.cache.stats()['size'], 0)
+
+    def test_http_errors(self):
+        def urlopen(url):
+            code = 403 if url.startswith('http://forbidden') else 404
+            raise urllib.error.HTTPError(url, code, 'Error', None, None)
+        self.urlopen.side_effect = urlopen
+        self.assertFalse(
+            self.cache.get('http://forbidden/').can_fetch('*', '/'))
+        self.assertTrue(
+            self.cache.get('http://missing/').can_fetch('*', '/'))
+        self.assertEqual(self.cache.stats()['size'], 2)
+
+    def test_server_errors_are_not_cached(self):
+        def urlopen(url):
+            raise urllib.error.HTTPError(url, 503, 'Unavailable', None, None)
+        self.urlopen.side_effect = urlopen
+        self.assertFalse(self.cache.get('http://example.com/').can_fetch(
+            '*', 'http://example.com/'))
+        self.assertEqual(self.cache.stats()['size'], 0)
+
+    def test_browser_uses_cache_in_unrestricted_mode(self):
+        browser = Browser()
+        browser.testapp.robots._now = lambda: self.now
+        # fetch through the mocked urlopen instead of the connection pool
+        browser.testapp.robots.pool = None
+        with self.assertRaises(RobotExclusionError):
+            browser.open('http://example.com/no')
+        with self.assertRaises(RobotExclusionError):
+            browser.open('http://example.com/not-here-either')
+        self.assertEqual(self.urlopen.call_count, 1)
+        self.assertEqual(browser.stats['robots'],
+                         {'hits': 1, 'misses': 1, 'size': 1})
+
+    def test_fetch_through_pool(self):
+        def request(method, url):
+            if url == 'http://example.com/robots.txt':
+                return mock.Mock(status=301, headers={},
+                                 getheader=lambda name: '/moved.txt'), b''
+            self.assertEqual(url, 'http://example.com/moved.txt')
+            return (mock.Mock(status=200, headers={}),
+                    b'User-agent: *\nDisallow: /no')
+
+        self.cache.pool = mock.Mock(request=mock.Mock(side_effect=request))
+        rp = self.cache.get('http://example.com/')
+        self.assertFalse(rp.can_fetch('*', 'http://example.com/no'))
+        self.assertEqual(self.cache.pool.request.call_count, 2)
+        self.assertEqual(self.urlopen.call_count, 0)
+
+    def test_network_errors_of_pool_are_url_errors(self):
+        self.cache.pool = mock.Mock(request=mock.Mock(
+            side_effect=socket.gaierror(-2, 'Name or service not known')))
+        with self.assertRaises(urllib.error.URLError) as err:
+            self.cache.get('http://example.com/')
+        self.assertIsInstance(err.exception.reason, socket.gaierror)
+
+    def test_fetch_through_proxy(self):
+        self.cache.pool = mock.Mock(request=mock.Mock(
+            return_value=(mock.Mock(status=404, headers={}), b'')))
+        with mock.patch.dict('os.environ', {
+                'http_proxy': 'http://proxy:3128', 'no_proxy': 'example.org'}):
+            self.cache.get('http://example.com/')
+            self.cache.get('http://example.org/')
+        self.assertEqual(
+            [c.args[0] for c in self.urlopen.call_args_list],
+            ['http://example.com/robots.txt'])
+        self.assertEqual(
+            [c.args[1] for c in self.cache.pool.request.call_args_list],
+            ['http://example.org/robots.txt'])
+
+
+class TestDocument(unittest.TestCase):
+    """Testing ..document.Document as used by the browser."""
+
+    body = b'''\
+        <html>
+          <head>
+            <title>Several forms</title>
+            <base href="https://localhost/base/" />
+          </head>
+          <body>
+            <a href="one">Link one</a>
+            <form id="first" name="first-form">
+              <label for="text1">Text one</label>
+              <input id="text1" name="text1" value="1" />
+            </form>
+            <form name="second-form">
+              <label>Check <input type="checkbox" name="check2" /></label>
+              <input type="submit" name="submit2" value="Go" />
+            </form>
+            <label for="outside">Outside</label>
+            <select id="outside" name="outside" form="first">
+              <option value="a">A</option>
+            </select>
+            <map><area id="area1" href="area-one" /></map>
+          </body>
+        </html>'''
+
+    def setUp(self):
+        super().setUp()
+        app = QuietTestApp()
+        app.set_next_response(self.body)
+        self.browser = Browser(wsgi_app=app)
+
+    def test_body_is_parsed_once(self):
+        import zope.testbrowser.document
+        with mock.patch.object(
+                zope.testbrowser.document, 'BeautifulSoup',
+                wraps=zope.testbrowser.document.BeautifulSoup) as soup:
+            self.browser.open('https://localhost/')
+            self.assertEqual(self.browser.title, 'Several forms')
+            self.assertEqual(self.browser.getLink('one').url,
+                             'https://localhost/base/one')
+            self.assertEqual(self.browser.getLink(id='area1').url,
+                             'https://localhost/base/area-one')
+            self.assertEqual(
+                self.browser.getForm(name='second-form').name, 'second-form')
+            self.assertEqual(
+                self.browser.getControl('Text one').value, '1')
+            self.assertEqual(
+                self.browser.getControl('Check').control.name, 'check2')
+            self.assertEqual(len(self.browser.getForm(index=0).controls), 3)
+        self.assertEqual(soup.call_count, 1)
+
+    def test_controls_associated_by_form_attribute(self):
+        self.browser.open('https://localhost/')
+        form = self.browser.getForm(id='first')
+        control = form.getControl(name='outside')
+        self.assertEqual(control.type, 'select')
+        self.assertEqual(control.value, ['a'])
+        self.assertEqual(form.getControl(name='text1').labels, ['Text one'])
+
+    def test_labels_of_controls_associated_by_form_attribute(self):
+        app = QuietTestApp()
+        app.set_next_response(b'''\
+            <html><body>
+              <form id="f"><input name="text" /></form>
+              <button form="f" name="go">Go outside</button>
+              <select form="f" name="s">
+                <option value="1">Uno outside</option>
+              </select>
+            </body></html>''')
+        browser = Browser(wsgi_app=app)
+        browser.open('https://localhost/')
+        self.assertEqual(browser.getControl('Go outside').name, 'go')
+        self.assertEqual(browser.getControl('Uno outside').optionValue, '1')
+
+    def test_response_forms_and_html(self):
+        self.browser.open('https://localhost/')
+        response = self.browser._response
+        self.assertIs(response.html, response.document.soup)
+        self.assertIs(response.forms['first'], response.forms[0])
+        self.assertEqual(response.forms[1].text[:5], '<form')
+
+
+class TestRadioGroups(unittest.TestCase):
+    """Testing radio buttons grouped by name in ..browser._findAllControls."""
+
+    def setUp(self):
+        super().setUp()
+        app = QuietTestApp()
+        app.set_next_response(b'''\
+            <html><body><form>
+              <input type="radio" name="a" value="1" checked="checked" />
+              <input type="radio" name="b" value="3" />
+              <input type="radio" name="a" value="2" />
+              <input type="text" name="c" />
+              <input type="radio" name="b" value="4" />
+            </form></body></html>''')
+        self.browser = Browser(wsgi_app=app)
+        self.browser.open('https://localhost')
+
+    def test_groups(self):
+        a = self.browser.getControl(name='a')
+        b = self.browser.getControl(name='b')
+        self.assertEqual(a.options, ['1', '2'])
+        self.assertEqual(a.value, ['1'])
+        self.assertEqual(b.options, ['3', '4'])
+        b.getControl(value='4').selected = True
+        self.assertEqual(b.value, ['4'])
+        self.assertEqual(a.value, ['1'])
+
+    def test_without_index(self):
+        from ..browser import RadioListControl
+        from ..browser import simpleControlFactory
+        form = self.browser._response.forms[0]
+        wtcontrol = form.fields['b'][0]
+        control = simpleControlFactory(
+            wtcontrol, form, form.elements, self.browser)
+        self.assertIsInstance(control, RadioListControl)
+        self.assertEqual(control.options, ['3', '4'])
+
+
+class TestLinkIndex(unittest.TestCase):
+    """Testing ..browser.LinkIndex as used by getLink()."""
+
+    def setUp(self):
+        super().setUp()
+        app = QuietTestApp()
+        app.set_next_response(b'''\
+            <html><body>
+              <a href="/one" id="first">Link   one</a>
+              <a href="two">Link two</a>
+              <a id="first" href="http://example.com/x/../three">Three</a>
+              <a>No href</a>
+              <map><area href="area" id="area" /></map>
+            </body></html>''')
+        self.browser = Browser(wsgi_app=app)
+        self.browser.open('https://localhost/dir/page')
+
+    def test_index_is_built_once_per_response(self):
+        index = self.browser._linkIndex
+        self.assertIs(self.browser._linkIndex, index)
+        self.assertEqual(
+            [entry[1:] for entry in index.links],
+            [('Link one', '/one', 'https://localhost/one'),
+             ('Link two', 'two', 'https://localhost/dir/two'),
+             ('Three', 'http://example.com/x/../three',
+              'http://example.com/x/../three'),
+             ('No href', '', None),
+             ('', 'area', 'https://localhost/dir/area')])
+        self.browser.reload()
+        self.assertIsNot(self.browser._linkIndex, index)
+
+    def test_lookups(self):
+        import re
+        getLink = self.browser.getLink
+        self.assertEqual(getLink('Link one').url, 'https://localhost/one')
+        self.assertEqual(getLink('Link', index=1).url,
+                         'https://localhost/dir/two')
+        self.assertEqual(getLink(url=re.compile('^t')).text, 'Link two')
+        self.assertEqual(getLink(id='first', index=1).text, 'Three')
+        self.assertEqual(getLink(id='area').tag, 'area')
+        self.assertRaises(IndexError, getLink, id='first', index=2)
+        self.assertRaises(IndexError, getLink, 'Link', url='three')
+        self.assertRaises(KeyError, lambda: getLink('No href').url)
+
+
+class TestLazyControls(unittest.TestCase):
+    """Controls are only built for the forms and fields a lookup needs."""
+
+    def setUp(self):
+        super().setUp()
+        forms = [b'''
+            <form action="search">
+              <label for="q">Search</label><input id="q" name="q" />
+              <input type="submit" value="Go" />
+            </form>''']
+        for i in range(5):
+            forms.append(b'''
+                <form action="edit%d">
+                  <label>Title <input name="title" /></label>
+                  <select name="choice"><option>A</option></select>
+                  <input type="submit" value="Save" />
+                </form>''' % i)
+        app = QuietTestApp()
+        app.set_next_response(b'<html><body>%s</body></html>' %
+                              b''.join(forms))
+        self.browser = Browser(wsgi_app=app)
+        self.browser.open('https://localhost')
+        self.forms = self.browser._getAllResponseForms()
+
+    def parsed(self):
+        return ['fields' in form.__dict__ for form in self.forms]
+
+    def built(self):
+        return [len(self.browser._controls[form]._built)
+                if form in self.browser._controls else 0
+                for form in self.forms]
+
+    def test_lookup_by_name_touches_only_forms_with_that_name(self):
+        self.assertEqual(self.browser.getControl(name='q').value, '')
+        self.assertEqual(self.parsed(), [True] + [False] * 5)
+        self.assertEqual(self.built(), [1, 0, 0, 0, 0, 0])
+
+    def test_lookup_by_label_skips_forms_without_that_text(self):
+        self.assertEqual(self.browser.getControl('Search').name, 'q')
+        self.assertEqual(self.parsed(), [True] + [False] * 5)
+
+    def test_lookup_stops_at_index(self):
+        self.assertEqual(
+            self.browser.getControl('Title', index=1).name, 'title')
+        self.assertEqual(self.built(), [0, 3, 1, 0, 0, 0])
+        self.assertEqual(
+            self.browser.getControl(name='choice', index=1).value, ['A'])
+        self.assertEqual(self.built(), [0, 3, 2, 0, 0, 0])
+
+    def test_ambiguity_lists_all_matches(self):
+        from ..browser import AmbiguityError
+        with self.assertRaises(AmbiguityError) as err:
+            self.browser.getControl('Save')
+        self.assertEqual(str(err.exception).count('SubmitControl'), 5)
+
+    def test_index_out_of_range_lists_all_matches(self):
+        with self.assertRaises(LookupError) as err:
+            self.browser.getControl(name='title', index=5)
+        self.assertIn('available choices are 0...4', str(err.exception))
+
+    def test_form_lookups(self):
+        form = self.browser.getForm(action='edit3')
+        self.assertEqual(form.getControl(name='title').name, 'title')
+        self.assertEqual(self.built(), [0, 0, 0, 0, 1, 0])
+        self.assertEqual(form.getControl('Title').name, 'title')
+        self.assertEqual(self.built(), [0, 0, 0, 0, 3, 0])
+        self.assertEqual(len(form.controls), 4)
+
+
+class TestHeaderView(unittest.TestCase):
+    """Testing ..browser.Browser.responseHeaders."""
+
+    def open(self, status='200', reason='OK', raiseHttpErrors=False):
+        app = QuietTestApp()
+        app.set_next_response(b'<p>body</p>', headers=[
+            ('Content-Type', 'text/html; charset=UTF-8'),
+            ('Set-Cookie', 'b=2'),
+            ('set-cookie', 'a=1'),
+            ('X-Powered-By', 'ZServer')], status=status, reason=reason)
+        browser = Browser(wsgi_app=app)
+        browser.raiseHttpErrors = raiseHttpErrors
+        browser.open('http://localhost/')
+        return browser
+
+    def test_mapping(self):
+        browser = self.open()
+        view = browser.responseHeaders
+        self.assertIs(browser.responseHeaders, view)
+        self.assertEqual((view.status_code, view.reason), (200, 'OK'))
+        self.assertEqual(view['x-powered-by'], 'ZServer')
+        self.assertIn('CONTENT-TYPE', view)
+        self.assertNotIn('Status', view)
+        self.assertEqual(view.get('Location'), None)
+        self.assertEqual(len(view), 4)  # with the Content-Length
+        self.assertEqual(view.get_all('Set-Cookie'), ['b=2', 'a=1'])
+        self.assertIsNone(view.get_all('Location'))
+
+    def test_message_is_compatible(self):
+        browser = self.open('404', 'Not Found')
+        self.assertEqual(str(browser.headers), '\n'.join([
+            'Status: 404 Not Found',
+            'Content-Length: 11',
+            'Content-Type: text/html; charset=UTF-8',
+            'Set-Cookie: b=2',
+            'X-Powered-By: ZServer',
+            'set-cookie: a=1',
+            '', '']))
+        self.assertEqual(browser.headers.get_all('set-cookie'),
+                         ['b=2', 'a=1'])
+        self.assertIsNot(browser.headers, browser.headers)
+        self.assertEqual(browser.responseHeaders.status_code, 404)
+
+    def test_errors_raised_from_status(self):
+        with self.assertRaises(urllib.error.HTTPError) as err:
+            self.open('500', 'Internal Server Error', raiseHttpErrors=True)
+        self.assertEqual(err.exception.code, 500)
+        self.assertEqual(err.exception.msg, 'Internal Server Error')
+
+
+class TestHistory(unittest.TestCase):
+    """Testing ..browser.History and its limits."""
+
+    def setUp(self):
+        super().setUp()
+        self.app = YetAnotherTestApp()
+        self.browser = Browser(wsgi_app=self.app)
+        self.history = self.browser.history
+
+    def visit(self, *pages):
+        for page in pages:
+            body = b'<html><title>%s</title><body>%s</body></html>' % (
+                page.encode(), b'x' * 100)
+            self.app.add_response(body)
+            self.browser.open('http://localhost/%s' % page)
+
+    def test_unbounded_by_default(self):
+        self.visit('a', 'b', 'c', 'd')
+        self.assertEqual(self.browser.stats['history'], {
+            'size': 4, 'live': 3, 'bodies': 0, 'bytes': 3 * 142})
+        self.browser.goBack(3)
+        self.assertEqual(self.browser.title, 'a')
+
+    def test_maxlen(self):
+        self.history.maxlen = 2
+        self.visit('a', 'b', 'c', 'd')
+        self.browser.goBack(2)
+        self.assertEqual(self.browser.title, 'b')
+        with self.assertRaises(BrowserStateError):
+            self.browser.goBack()
+
+    def test_compressed_entries_are_restored(self):
+        self.history.live = 1
+        self.app.add_response(b'<form method="post"><input name="q" />'
+                              b'<input type="submit" /></form>')
+        self.browser.open('http://localhost/form')
+        self.browser.getControl(name='q').value = 'query'
+        self.app.add_response(b'<p>result</p>')
+        self.browser.getForm(index=0).submit()
+        self.visit('a', 'b')
+        self.assertEqual(self.history.stats()['live'], 1)
+
+        self.browser.goBack(2)
+        self.assertEqual(self.browser.contents, '<p>result</p>')
+        self.assertEqual(self.browser.url, 'http://localhost/form')
+        self.assertEqual(self.browser.headers['Content-Length'], '13')
+        self.app.add_response(b'reloaded', headers=[
+            ('Content-Type', 'text/plain; charset=UTF-8')])
+        self.browser.reload()
+        self.assertEqual(self.app.last_input, 'q=query')
+        self.assertEqual(self.browser.contents, 'reloaded')
+
+    def test_identical_bodies_are_stored_once(self):
+        self.history.live = 0
+        self.visit('a', 'b', 'a', 'b', 'a', 'c')
+        self.assertEqual(self.history.stats()['bodies'], 2)
+        self.browser.goBack(2)
+        self.assertEqual(self.browser.title, 'b')
+        self.assertEqual(self.browser.url, 'http://localhost/b')
+        self.browser.goBack()
+        self.assertEqual(self.browser.title, 'a')
+        self.assertEqual(self.history.stats()['bodies'], 2)
+        self.browser.goBack(2)
+        self.assertEqual(self.browser.title, 'a')
+        self.assertEqual(self.history.stats(),
+                         {'size': 1, 'live': 0, 'bodies': 0, 'bytes': 0})
+
+    def test_maxbytes(self):
+        # The pages are 142 bytes, 43 bytes compressed.
+        self.history.maxbytes = 300
+        self.visit('a', 'b', 'c', 'd')
+        self.assertEqual(self.history.stats(), {
+            'size': 4, 'live': 1, 'bodies': 2, 'bytes': 142 + 2 * 43})
+        self.history.maxbytes = 100
+        self.visit('e')
+        self.assertEqual(self.history.stats(), {
+            'size': 2, 'live': 0, 'bodies': 2, 'bytes': 2 * 43})
+        self.browser.goBack(2)
+        self.assertEqual(self.browser.title, 'c')
+        with self.assertRaises(BrowserStateError):
+            self.browser.goBack()
+
+    def test_maxbytes_with_other_responses(self):
+        # Responses of other classes cannot be compressed, they are dropped.
+        history = History(maxbytes=150)
+        history.add(webtest.TestResponse(body=b'x' * 100))
+        self.assertEqual(history.stats()['size'], 1)
+        history.add(webtest.TestResponse(body=b'y' * 100))
+        self.assertEqual(history.stats(),
+                         {'size': 1, 'live': 1, 'bodies': 0, 'bytes': 100})
+        history.maxbytes = 5
+        history.add(webtest.TestResponse(body=b'z' * 100))
+        self.assertEqual(history.stats(),
+                         {'size': 0, 'live': 0, 'bodies': 0, 'bytes': 0})
+
+
+class TestRequestTimings(unittest.TestCase):
+    """Testing ..browser.RequestTimings and Browser.lastRequestTimings."""
+
+    def test_nested_phases_are_not_counted_twice(self):
+        timings = RequestTimings()
+        wall = iter([0.0, 1.0, 3.0, 10.0]).__next__
+        cpu = iter([0.0, 1.0, 3.0, 10.0]).__next__
+        with mock.patch('time.perf_counter', wall), \
+                mock.patch('time.thread_time', cpu):
+            with timings.phase('outer'):
+                with timings.phase('inner', 'detail'):
+                    pass
+        self.assertEqual(
+            [(p.name, p.wall, p.cpu, p.detail) for p in timings.phases],
+            [('inner', 2.0, 2.0, 'detail'), ('outer', 8.0, 8.0, None)])
+        self.assertEqual(timings.wall, 10.0)
+        self.assertEqual(timings.byPhase(), {
+            'inner': {'wall': 2.0, 'cpu': 2.0, 'count': 1},
+            'outer': {'wall': 8.0, 'cpu': 8.0, 'count': 1}})
+        self.assertEqual(
+            repr(timings),
+            '<RequestTimings inner=2000.000ms outer=8000.000ms>')
+
+    def test_browser(self):
+        app = YetAnotherTestApp()
+        browser = Browser(wsgi_app=app)
+        self.assertIsNone(browser.lastRequestTimings)
+        app.add_response(b'', status='302', reason='Found',
+                         headers=[('Location', 'http://localhost/form')])
+        app.add_response(b'<form><input name="q" /></form><a href="/">x</a>',
+                         headers=[('Content-Type', 'text/html'),
+                                  ('Set-Cookie', 'a=b')])
+        browser.open('http://localhost/')
+        timings = browser.lastRequestTimings
+        self.assertEqual([p.detail for p in timings.hops],
+                         ['http://localhost/', 'http://localhost/form'])
+        self.assertEqual(
+            {name: total['count']
+             for name, total in timings.byPhase().items()},
+            {'cookies': 4, 'app': 2, 'prepare': 1})
+        self.assertGreater(timings.wall, 0)
+
+        # parsing and indexing are added when they happen
+        browser.getControl(name='q')
+        browser.getLink('x')
+        names = {p.name for p in timings.phases}
+        self.assertEqual(names,
+                         {'cookies', 'app', 'prepare', 'parse', 'index'})
+        self.assertIs(browser.lastRequestTimings, timings)
+
+        app.add_response(b'<p>other</p>')
+        browser.open('http://localhost/other')
+        self.assertIsNot(browser.lastRequestTimings, timings)
+        self.assertEqual(len(browser.lastRequestTimings.hops), 1)
+
+
+class TestRedirectCache(unittest.TestCase):
+    """Testing ..browser.RedirectCache and Browser.redirectCache."""
+
+    def test_resolve(self):
+        cache = RedirectCache(maxsize=3)
+        self.assertEqual(cache.resolve('http://localhost/a'),
+                         ('http://localhost/a', []))
+        cache.add('http://localhost/a#top', 'http://localhost/b')
+        cache.add('http://localhost/b', 'http://localhost/c')
+        # redirects to the URL itself are not remembered
+        cache.add('http://localhost/d', 'http://localhost/d#x')
+        self.assertEqual(cache.resolve('http://localhost/a#here'), (
+            'http://localhost/c#here',
+            [('http://localhost/a', 'http://localhost/b'),
+             ('http://localhost/b', 'http://localhost/c')]))
+        self.assertEqual(cache.resolve('http://localhost/b')[0],
+                         'http://localhost/c')
+        self.assertEqual(cache.stats(), {'hits': 2, 'misses': 1, 'size': 2})
+
+        # loops end
+        cache.add('http://localhost/c', 'http://localhost/a#top')
+        url, hops = cache.resolve('http://localhost/a')
+        self.assertEqual(url, 'http://localhost/a#top')
+        self.assertEqual(len(hops), 3)
+
+        # the least recently used URL is dropped
+        cache.add('http://localhost/e', 'http://localhost/f')
+        self.assertEqual(cache.resolve('http://localhost/b')[1], [
+            ('http://localhost/b', 'http://localhost/c'),
+            ('http://localhost/c', 'http://localhost/a#top')])
+        cache.invalidate('http://localhost/c')
+        self.assertEqual(cache.resolve('http://localhost/b')[0],
+                         'http://localhost/c')
+        cache.invalidate()
+        self.assertEqual(cache.stats()['size'], 0)
+
+    def test_browser(self):
+        app = WSGITestApplication()
+        browser = Browser(wsgi_app=app)
+        url = 'http://localhost/redirect.html?to=/echo.html&type=308'
+        browser.open(url)
+        self.assertEqual(browser.url, 'http://localhost/echo.html')
+
+        browser.redirectCache = RedirectCache()
+        browser.open(url)
+        del app.request_log[:]
+        browser.open(url)
+        self.assertEqual(browser.url, 'http://localhost/echo.html')
+        self.assertEqual([req.path_info for req in app.request_log],
+                         ['/echo.html'])
+        timings = browser.lastRequestTimings
+        self.assertEqual(timings.skipped,
+                         [(url, 'http://localhost/echo.html')])
+        self.assertEqual(len(timings.hops), 1)
+        self.assertEqual(browser.stats['redirects'],
+                         {'hits': 1, 'misses': 2, 'size': 1})
+
+    def test_chains_and_temporary_redirects(self):
+        app = WSGITestApplication()
+        browser = Browser(wsgi_app=app)
+        browser.redirectCache = RedirectCache()
+        temporary = ('http://localhost/redirect.html'
+                     '?to=/echo.html&type=307')
+        permanent = ('http://localhost/redirect.html?to=' +
+                     urllib.parse.quote(temporary) + '&type=301')
+        browser.open(permanent)
+        browser.open(permanent)
+        self.assertEqual(browser.lastRequestTimings.skipped,
+                         [(permanent, temporary)])
+        # the temporary redirect is followed every time
+        self.assertEqual([hop.detail for hop in
+                          browser.lastRequestTimings.hops],
+                         [temporary, 'http://localhost/echo.html'])
+
+        # permanent redirects of other methods are not remembered
+        browser.redirectCache.invalidate()
+        browser.post(permanent, 'x=1')
+        self.assertEqual(browser.redirectCache.stats()['size'], 0)
+
+
+MiB = 1024 * 1024
+
+
+def big_page(environ, start_response):
+    # a page of more than 100 KiB, allocated while answering
+    body = b'<html><title>big</title><body>%s</body></html>' % (
+        b'<p>%d</p>' * 10000 % tuple(range(10000)))
+    start_response('200 OK', [('Content-Type', 'text/html; charset=UTF-8')])
+    return [body]
+
+
+class TestRequestMemory(unittest.TestCase):
+    """Testing ..browser.RequestMemory and Browser.lastRequestMemory."""
+
+    def setUp(self):
+        super().setUp()
+        if not tracemalloc.is_tracing():
+            self.addCleanup(tracemalloc.stop)
+
+    def test_nested_phases(self):
+        memory = RequestMemory()
+        with memory.phase('outer'):
+            self.assertTrue(tracemalloc.is_tracing())
+            kept = bytearray(MiB)
+            with memory.phase('inner'):
+                bytearray(2 * MiB)
+        inner, outer = memory.phases
+        self.assertEqual((inner.name, outer.name), ('inner', 'outer'))
+        self.assertGreaterEqual(inner.peak, 2 * MiB)
+        self.assertLess(inner.retained, MiB // 10)
+        # the peak of the outer phase includes the nested one
+        self.assertGreaterEqual(outer.peak, 3 * MiB)
+        self.assertGreaterEqual(outer.retained, MiB)
+        self.assertLess(outer.retained, MiB + MiB // 10)
+        self.assertEqual(memory.peak, outer.peak)
+        self.assertEqual(sorted(memory.byPhase()), ['inner', 'outer'])
+        del kept
+
+    def test_tracemalloc_is_only_started_for_the_phases(self):
+        tracing = tracemalloc.is_tracing()
+        tracemalloc.stop()
+        try:
+            memory = RequestMemory()
+            self.assertFalse(tracemalloc.is_tracing())
+            with memory.phase('outer'):
+                with memory.phase('inner'):
+                    pass
+                self.assertTrue(tracemalloc.is_tracing())
+            self.assertFalse(tracemalloc.is_tracing())
+            # tracing started by the caller is left on
+            tracemalloc.start()
+            with memory.phase('again'):
+                pass
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+
+    def test_one_request_at_a_time(self):
+        first, second = RequestMemory(), RequestMemory()
+        with first.phase('app'):
+            with self.assertRaises(BrowserStateError):
+                with second.phase('app'):
+                    pass
+            # nested phases of the same request are fine
+            with first.phase('parse'):
+                pass
+        with second.phase('app'):
+            pass
+        self.assertEqual([phase.name for phase in first.phases],
+                         ['parse', 'app'])
+        self.assertEqual([phase.name for phase in second.phases], ['app'])
+
+    def test_browser(self):
+        browser = Browser(wsgi_app=big_page)
+        browser.open('http://localhost/')
+        self.assertIsNone(browser.lastRequestMemory)
+
+        browser.traceMemory = True
+        browser.open('http://localhost/')
+        memory = browser.lastRequestMemory
+        self.assertEqual(
+            {name: total['count']
+             for name, total in memory.byPhase().items()},
+            {'history': 1, 'app': 1})
+        # the response body is kept by the browser
+        self.assertGreaterEqual(memory.byPhase()['app']['retained'],
+                                100 * 1024)
+
+        browser.title
+        parse = memory.phases[-1]
+        self.assertEqual(parse.name, 'parse')
+        # the tree is much bigger than the page
+        self.assertGreater(parse.retained, MiB)
+        self.assertGreaterEqual(parse.peak, parse.retained)
+        self.assertIn('parse=', repr(memory))
+
+
 def test_open_no_referrer(self):
     """
     Successive calls to open() do not send a referrer.
@@ -13,11 +13,16 @@
 ##############################################################################
 
 import datetime
+import http.cookiejar
 import locale
+import time
 import unittest
+import urllib.request
+from unittest import mock
 
 import pytz
 
+from zope.testbrowser.cookies import IndexedCookieJar
 from zope.testbrowser.cookies import expiration_string
 
 
@@ -203,6 +208,91 @@ class TestCookieInfo(unittest.TestCase):
         self.assertEqual(infos[1]['secure'], True)
 
 
+def make_cookie(domain, name, path='/', expires=None):
+    return http.cookiejar.Cookie(
+        0, name, 'value', None, False, domain, True, domain.startswith('.'),
+        path, True, False, expires, False, None, None, {})
+
+
+class TestIndexedCookieJar(unittest.TestCase):
+
+    DOMAINS = ('localhost.local', '.localhost', 'example.com', '.example.com',
+               'a.example.com', '.a.example.com', 'b.a.example.com',
+               'other.org', '127.0.0.1', '.com', '')
+    URLS = ('http://localhost/', 'http://localhost/x/y',
+            'http://a.example.com/x', 'http://example.com/',
+            'http://b.a.example.com/', 'http://c.b.a.example.com:8080/x/',
+            'http://127.0.0.1/', 'http://other.org/', 'http://org/')
+
+    def fill(self, jar):
+        for domain in self.DOMAINS:
+            for path in ('/', '/x'):
+                jar.set_cookie(make_cookie(domain, 'c', path))
+                jar.set_cookie(make_cookie(domain, 'd', path))
+        return jar
+
+    def cookies(self, jar, url):
+        # as CookieJar.add_cookie_header does
+        jar._policy._now = jar._now = int(time.time())
+        return sorted((c.domain, c.path, c.name)
+                      for c in jar._cookies_for_request(
+                          urllib.request.Request(url)))
+
+    def test_same_cookies_as_cookie_jar(self):
+        plain = self.fill(http.cookiejar.CookieJar())
+        indexed = self.fill(IndexedCookieJar())
+        for url in self.URLS:
+            with self.subTest(url=url):
+                self.assertEqual(self.cookies(indexed, url),
+                                 self.cookies(plain, url))
+
+    def test_only_domains_of_the_host_are_looked_at(self):
+        jar = self.fill(IndexedCookieJar())
+        for i in range(1000):
+            jar.set_cookie(make_cookie('host%d.example.org' % i, 'c'))
+        plain = self.fill(http.cookiejar.CookieJar())
+        policy = jar._policy
+        with mock.patch.object(policy, 'domain_return_ok',
+                               wraps=policy.domain_return_ok) as checked:
+            self.assertEqual(self.cookies(jar, 'http://localhost/'),
+                             self.cookies(plain, 'http://localhost/'))
+        self.assertEqual(
+            sorted(call.args[0] for call in checked.call_args_list),
+            ['', '.localhost', 'localhost.local'])
+
+    def test_policy_with_own_domain_check(self):
+        class Policy(http.cookiejar.DefaultCookiePolicy):
+            def domain_return_ok(self, domain, request):
+                return domain == 'other.org'
+
+        jar = self.fill(IndexedCookieJar(Policy()))
+        self.assertEqual(self.cookies(jar, 'http://other.org/'), [
+            ('other.org', '/', 'c'), ('other.org', '/', 'd')])
+
+    def test_expired_cookies(self):
+        jar = self.fill(IndexedCookieJar())
+        with mock.patch('time.time', return_value=1000):
+            jar.set_cookie(make_cookie('a.example.com', 'e', expires=1500))
+            jar.set_cookie(make_cookie('other.org', 'e', expires=1200))
+            jar.set_cookie(make_cookie('other.org', 'f', expires=2000))
+            with mock.patch.object(
+                    http.cookiejar.Cookie, 'is_expired',
+                    autospec=True,
+                    side_effect=http.cookiejar.Cookie.is_expired) as checked:
+                jar.clear_expired_cookies()
+            # no cookie has expired yet, so none is looked at
+            self.assertEqual(checked.call_count, 0)
+        with mock.patch('time.time', return_value=1600):
+            jar.clear_expired_cookies()
+        self.assertEqual(
+            sorted(c.name for c in jar if c.expires is not None), ['f'])
+        self.assertEqual(jar._next_expiry, 2000)
+        with mock.patch('time.time', return_value=2000):
+            jar.clear_expired_cookies()
+        self.assertIsNone(jar._next_expiry)
+        self.assertEqual(len(jar), 2 * 2 * len(self.DOMAINS))
+
+
 class TestExpirationString(unittest.TestCase):
 
     def test_string(self):
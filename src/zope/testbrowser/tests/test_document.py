@@ -0,0 +1,227 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Tests for zope.testbrowser.document
+"""
+
+import importlib.util
+import unittest
+
+from bs4.builder import HTMLParserTreeBuilder
+
+from zope.testbrowser.browser import Browser
+from zope.testbrowser.document import Document
+from zope.testbrowser.document import ParseCache
+from zope.testbrowser.ftests.wsgitestapp import WSGITestApplication
+from zope.testbrowser.tests.test_browser import QuietTestApp
+
+
+FIXTURES = ('forms.html', 'controls.html', 'navigate.html', 'radio.html',
+            'textarea.html', 'oneform.html')
+
+BACKENDS = {'lxml': 'lxml', 'html5lib': 'html5lib'}
+
+
+def page_signature(browser):
+    """Describe everything getControl and getLink can find on the page."""
+    signature = {'title': browser.title, 'forms': [], 'links': []}
+    for index in range(len(browser._document.forms)):
+        form = browser.getForm(index=index)
+        controls = []
+        for control in form.controls:
+            controls.append((
+                repr(control), control.labels,
+                getattr(control, 'value', None),
+                getattr(control, 'optionValue', None)))
+        signature['forms'].append((form.action, form.name, controls))
+    index = 0
+    while True:
+        try:
+            link = browser.getLink(index=index)
+        except IndexError:
+            break
+        signature['links'].append((link.tag, link.text, link.url))
+        index += 1
+    return signature
+
+
+class TestParserBackends(unittest.TestCase):
+    """getControl and getLink give the same results with all parsers."""
+
+    def open(self, parser, fixture):
+        browser = Browser(wsgi_app=WSGITestApplication())
+        browser.htmlParser = parser
+        browser.open('http://localhost/@@/testbrowser/%s' % fixture)
+        return browser
+
+    def assertSameAsDefaultParser(self, parser):
+        for fixture in FIXTURES:
+            with self.subTest(parser=parser, fixture=fixture):
+                self.assertEqual(
+                    page_signature(self.open(parser, fixture)),
+                    page_signature(self.open('html.parser', fixture)))
+
+    def test_lxml(self):
+        if importlib.util.find_spec('lxml') is None:
+            raise unittest.SkipTest('lxml is not installed')
+        self.assertSameAsDefaultParser(BACKENDS['lxml'])
+
+    def test_html5lib(self):
+        if importlib.util.find_spec('html5lib') is None:
+            raise unittest.SkipTest('html5lib is not installed')
+        self.assertSameAsDefaultParser(BACKENDS['html5lib'])
+
+    def test_tree_builder(self):
+        self.assertSameAsDefaultParser(HTMLParserTreeBuilder)
+        self.assertSameAsDefaultParser(HTMLParserTreeBuilder())
+
+    def test_lookups_by_label_and_name(self):
+        for parser in ['html.parser'] + [
+                p for p in BACKENDS.values()
+                if importlib.util.find_spec(p) is not None]:
+            with self.subTest(parser=parser):
+                browser = self.open(parser, 'controls.html')
+                self.assertEqual(
+                    browser.getControl('Text Control').name, 'text-value')
+                self.assertEqual(
+                    browser.getControl(name='single-select-value').value,
+                    ['1'])
+                self.assertEqual(
+                    browser.getControl('Zwei').optionValue, '2')
+                browser = self.open(parser, 'navigate.html')
+                self.assertEqual(
+                    browser.getLink('Link Text').url,
+                    'http://localhost/@@/testbrowser/navigate.html?'
+                    'message=By+Link+Text')
+
+    def test_default_parser_is_per_class(self):
+        self.assertEqual(Browser.htmlParser, 'html.parser')
+        browser = self.open('html.parser', 'simple.html')
+        self.assertEqual(browser._document.features, 'html.parser')
+        self.assertEqual(Browser().htmlParser, 'html.parser')
+
+
+class TestLabelIndex(unittest.TestCase):
+    """Testing ..document.Document.label_index()."""
+
+    body = '''\
+        <form>
+          <label for="a">First   label
+            for a</label>
+          <label for="b">Label for b</label>
+          <label for='say "hi"'>Quoted</label>
+          <label>No for</label>
+          <label for="a">Second label for a</label>
+          <input id="a" name="a" />
+          <input id='say "hi"' name="hi" />
+        </form>
+        <label for="a">Outside of the form</label>'''
+
+    def test_index(self):
+        document = Document(self.body)
+        form = document.forms[0]
+        index = document.label_index(form)
+        self.assertEqual(index, {
+            'a': ['First label for a', 'Second label for a'],
+            'b': ['Label for b'],
+            'say "hi"': ['Quoted']})
+        self.assertIs(document.label_index(form), index)
+        self.assertEqual(document.label_index(document.soup)['a'][-1],
+                         'Outside of the form')
+
+    def test_control_labels(self):
+        app = QuietTestApp()
+        app.set_next_response(self.body.encode())
+        browser = Browser(wsgi_app=app)
+        browser.open('http://localhost/')
+        self.assertEqual(browser.getControl(name='a').labels,
+                         ['First label for a', 'Second label for a'])
+        self.assertEqual(browser.getControl('Quoted').name, 'hi')
+
+
+class TestParseCache(unittest.TestCase):
+    """Testing ..document.ParseCache."""
+
+    def setUp(self):
+        super().setUp()
+        self.app = WSGITestApplication()
+        self.cache = ParseCache()
+
+    def browser(self):
+        browser = Browser(wsgi_app=self.app)
+        browser.parseCache = self.cache
+        return browser
+
+    def test_shared_between_browsers(self):
+        url = 'http://localhost/@@/testbrowser/forms.html'
+        first = self.browser()
+        first.open(url)
+        second = self.browser()
+        second.open(url)
+        self.assertIs(first._document, second._document)
+        self.assertIs(first._linkIndex, second._linkIndex)
+        self.assertEqual(second.stats['parse']['hits'], 1)
+        self.assertEqual(second.stats['parse']['misses'], 1)
+
+        # but the forms and their values are not shared
+        first.getControl(name='text-value', index=0).value = 'changed'
+        self.assertNotEqual(
+            second.getControl(name='text-value', index=0).value, 'changed')
+
+    def test_reload_and_navigation(self):
+        browser = self.browser()
+        browser.open('http://localhost/@@/testbrowser/navigate.html')
+        document = browser._document
+        browser.reload()
+        self.assertIs(browser._document, document)
+        browser.open('http://localhost/@@/testbrowser/navigate.html'
+                     '?message=Hello')
+        self.assertIsNot(browser._document, document)
+        browser.goBack()
+        self.assertIs(browser._document, document)
+        self.assertEqual(self.cache.stats()['size'], 2)
+
+    def test_key(self):
+        body = b'<html><title>x</title></html>'
+        document = self.cache.get(body, 'utf-8', 'html.parser', body.decode())
+        self.assertIs(
+            self.cache.get(body, 'utf-8', 'html.parser', 'ignored'),
+            document)
+        self.assertIsNot(
+            self.cache.get(body, 'latin-1', 'html.parser', body.decode()),
+            document)
+        self.assertIsNot(
+            self.cache.get(
+                body, 'utf-8', HTMLParserTreeBuilder, body.decode()),
+            document)
+        self.assertEqual(self.cache.stats(), {
+            'hits': 1, 'misses': 3, 'size': 3,
+            'bytes': 3 * len(body) * ParseCache.tree_factor})
+
+    def test_memory_bound(self):
+        self.cache.tree_factor = 1
+        self.cache.maxbytes = 25
+        for body in (b'<p>aaa</p>', b'<p>bbb</p>', b'<p>ccc</p>'):
+            self.cache.get(body, None, 'html.parser', body.decode())
+        self.assertEqual(self.cache.stats()['size'], 2)
+        self.assertEqual(self.cache.size, 20)
+        body = b'<p>%s</p>' % (b'd' * 23)
+        self.cache.get(body, None, 'html.parser', body.decode())
+        self.assertEqual(self.cache.stats()['size'], 2)
+        self.cache.clear()
+        self.assertEqual(self.cache.size, 0)
+
+    def test_off_by_default(self):
+        browser = Browser(wsgi_app=self.app)
+        self.assertIsNone(browser.parseCache)
+        self.assertNotIn('parse', browser.stats)
@@ -0,0 +1,103 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Tests for zope.testbrowser.har
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from zope.testbrowser.browser import Browser
+from zope.testbrowser.ftests.wsgitestapp import WSGITestApplication
+from zope.testbrowser.har import HARLog
+
+
+class TestHARLog(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'session.har')
+        self.browser = Browser(wsgi_app=WSGITestApplication())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+        super().tearDown()
+
+    def read(self):
+        with open(self.path, encoding='utf-8') as f:
+            return f.read()
+
+    def test_log(self):
+        browser = self.browser
+        with HARLog(self.path) as log:
+            browser.recorder = log
+            browser.open('http://localhost/set_cookie.html?name=foo&value=bar')
+            browser.open('http://localhost/redirect.html?to=/echo.html')
+            browser.post('http://localhost/echo.html', 'x=1')
+        self.assertTrue(log.closed)
+
+        har = json.loads(self.read())['log']
+        self.assertEqual(har['version'], '1.2')
+        self.assertEqual(har['creator']['name'], 'zope.testbrowser')
+        entries = har['entries']
+        self.assertEqual(
+            [(e['request']['method'], e['request']['url'],
+              e['response']['status']) for e in entries], [
+                ('GET', 'http://localhost/set_cookie.html'
+                 '?name=foo&value=bar', 200),
+                ('GET', 'http://localhost/redirect.html?to=/echo.html', 302),
+                ('GET', 'http://localhost/echo.html', 200),
+                ('POST', 'http://localhost/echo.html', 200)])
+
+        first, redirect, target, post = entries
+        self.assertEqual(first['request']['queryString'], [
+            {'name': 'name', 'value': 'foo'},
+            {'name': 'value', 'value': 'bar'}])
+        self.assertEqual(first['response']['cookies'],
+                         [{'name': 'foo', 'value': 'bar'}])
+        self.assertEqual(redirect['request']['cookies'],
+                         [{'name': 'foo', 'value': 'bar'}])
+        self.assertEqual(redirect['response']['redirectURL'],
+                         'http://localhost/echo.html')
+        self.assertEqual(redirect['response']['statusText'], 'Found')
+        self.assertIn({'name': 'Cookie', 'value': 'foo=bar'},
+                      target['request']['headers'])
+        self.assertEqual(post['request']['bodySize'], 3)
+        self.assertEqual(post['request']['postData']['text'], 'x=1')
+        self.assertEqual(post['response']['bodySize'],
+                         post['response']['content']['size'])
+        self.assertNotIn('text', post['response']['content'])
+        self.assertGreater(post['time'], 0)
+        self.assertEqual(post['timings']['wait'], post['time'])
+        self.assertTrue(post['startedDateTime'].endswith('+00:00'))
+
+    def test_streamed(self):
+        log = HARLog(self.path, bodies=True)
+        self.browser.recorder = log
+        self.browser.open('http://localhost/@@/testbrowser/simple.html')
+        self.browser.open('http://localhost/@@/testbrowser/simple.html')
+        # written before the log is closed
+        self.assertEqual(self.read().count('"startedDateTime"'), 2)
+        log.close()
+        log.close()
+        entries = json.loads(self.read())['log']['entries']
+        self.assertIn('<title>Simple Page</title>',
+                      entries[0]['response']['content']['text'])
+
+    def test_empty(self):
+        HARLog(self.path).close()
+        self.assertEqual(json.loads(self.read())['log']['entries'], [])
@@ -0,0 +1,151 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Tests for zope.testbrowser.httpcache
+"""
+
+import unittest
+
+from zope.testbrowser.browser import Browser
+from zope.testbrowser.httpcache import HTTPCache
+
+
+class CachingApp:
+    """Answers with the caching headers configured for each path."""
+
+    def __init__(self):
+        self.requests = []
+        self.headers = {
+            '/fresh': [('Cache-Control', 'max-age=60')],
+            '/etag': [('Cache-Control', 'no-cache'), ('ETag', '"v1"')],
+            '/modified': [
+                ('Last-Modified', 'Sun, 06 Nov 1994 08:49:37 GMT')],
+            '/no-store': [('Cache-Control', 'no-store'), ('ETag', '"v1"')],
+            '/vary': [('Cache-Control', 'max-age=60'),
+                      ('Vary', 'Accept-Language')],
+            '/plain': [],
+        }
+
+    def __call__(self, environ, start_response):
+        path = environ['PATH_INFO']
+        self.requests.append((
+            environ['REQUEST_METHOD'], path,
+            environ.get('HTTP_IF_NONE_MATCH'),
+            environ.get('HTTP_IF_MODIFIED_SINCE'),
+            environ.get('HTTP_CACHE_CONTROL')))
+        if environ['REQUEST_METHOD'] == 'POST':
+            start_response('303 See Other', [('Location', '/fresh')])
+            return [b'']
+        headers = self.headers[path]
+        conditions = {environ.get('HTTP_IF_NONE_MATCH'),
+                      environ.get('HTTP_IF_MODIFIED_SINCE')}
+        validators = dict(headers)
+        if conditions & {validators.get('ETag'),
+                         validators.get('Last-Modified')} - {None}:
+            start_response('304 Not Modified', headers)
+            return [b'']
+        body = b'<html><title>%s %d</title></html>' % (
+            path.encode(), len(self.requests))
+        start_response('200 OK', [
+            ('Content-Type', 'text/html; charset=UTF-8'),
+            ('Content-Length', str(len(body)))] + headers)
+        return [body]
+
+
+class TestHTTPCache(unittest.TestCase):
+    """Testing ..httpcache.HTTPCache as used by the browser."""
+
+    def setUp(self):
+        super().setUp()
+        self.app = CachingApp()
+        self.browser = Browser(wsgi_app=self.app)
+        self.browser.httpCache = self.cache = HTTPCache()
+        self.now = 1000.0
+        self.cache._now = lambda: self.now
+
+    def open(self, path):
+        self.browser.open('http://localhost' + path)
+        return self.browser.title
+
+    def test_fresh_responses_are_reused(self):
+        self.assertEqual(self.open('/fresh'), '/fresh 1')
+        self.now += 59
+        self.assertEqual(self.open('/fresh'), '/fresh 1')
+        self.assertEqual(self.browser.headers['Age'], '59')
+        self.assertEqual(len(self.app.requests), 1)
+        self.now += 1
+        self.assertEqual(self.open('/fresh'), '/fresh 2')
+        self.assertEqual(self.browser.stats['http'], {
+            'hits': 1, 'revalidated': 0, 'misses': 2, 'size': 1})
+
+    def test_revalidation_with_etag(self):
+        self.assertEqual(self.open('/etag'), '/etag 1')
+        self.assertEqual(self.open('/etag'), '/etag 1')
+        self.assertEqual(self.app.requests[-1][:3], ('GET', '/etag', '"v1"'))
+        self.assertEqual(self.browser.responseHeaders.status_code, 200)
+        self.assertEqual(self.cache.stats()['revalidated'], 1)
+
+        self.app.headers['/etag'] = [('ETag', '"v2"')]
+        self.assertEqual(self.open('/etag'), '/etag 3')
+        self.assertEqual(self.open('/etag'), '/etag 3')
+        self.assertEqual(self.app.requests[-1][:3], ('GET', '/etag', '"v2"'))
+
+    def test_revalidation_with_last_modified(self):
+        self.open('/modified')
+        self.assertEqual(self.open('/modified'), '/modified 1')
+        self.assertEqual(self.app.requests[-1][3],
+                         'Sun, 06 Nov 1994 08:49:37 GMT')
+
+    def test_reload_validates(self):
+        self.open('/fresh')
+        self.browser.reload()
+        self.assertEqual(self.browser.title, '/fresh 2')
+        self.assertEqual(self.app.requests[-1],
+                         ('GET', '/fresh', None, None, 'max-age=0'))
+        self.open('/etag')
+        self.browser.reload()
+        self.browser.reload()
+        self.assertEqual(self.browser.title, '/etag 3')
+        # the conditional headers are not kept by the reloaded request
+        self.assertNotIn('If-None-Match',
+                         self.browser._response.request.headers)
+        self.assertEqual(self.cache.stats()['revalidated'], 2)
+
+    def test_not_stored(self):
+        self.open('/no-store')
+        self.assertEqual(self.open('/no-store'), '/no-store 2')
+        self.open('/plain')
+        self.assertEqual(self.open('/plain'), '/plain 4')
+        self.assertEqual(self.cache.stats()['size'], 0)
+
+    def test_vary(self):
+        self.open('/vary')
+        self.assertEqual(self.open('/vary'), '/vary 1')
+        self.browser.addHeader('Accept-Language', 'de')
+        self.assertEqual(self.open('/vary'), '/vary 2')
+        self.assertEqual(self.open('/vary'), '/vary 2')
+
+    def test_unsafe_requests_invalidate(self):
+        self.open('/fresh')
+        self.browser.post('http://localhost/fresh', 'a=1')
+        self.assertEqual(self.browser.title, '/fresh 3')
+        self.assertEqual([r[:2] for r in self.app.requests], [
+            ('GET', '/fresh'), ('POST', '/fresh'), ('GET', '/fresh')])
+
+    def test_off_by_default(self):
+        browser = Browser(wsgi_app=self.app)
+        self.assertIsNone(browser.httpCache)
+        browser.open('http://localhost/fresh')
+        browser.open('http://localhost/fresh')
+        self.assertEqual(len(self.app.requests), 2)
+        self.assertNotIn('http', browser.stats)
@@ -0,0 +1,192 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Tests for zope.testbrowser.load
+"""
+
+import threading
+import time
+import unittest
+
+from zope.testbrowser.ftests.wsgitestapp import WSGITestApplication
+from zope.testbrowser.load import LatencyHistogram
+from zope.testbrowser.load import LoadBrowser
+from zope.testbrowser.load import LoadRunner
+from zope.testbrowser.load import ProcessLoadRunner
+
+
+class CountingApp(WSGITestApplication):
+
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.threads = set()
+        self.started = []
+
+    def __call__(self, environ, start_response):
+        with self.lock:
+            self.threads.add(threading.current_thread())
+            self.started.append(time.perf_counter())
+        return super().__call__(environ, start_response)
+
+
+def scenario(browser):
+    browser.open('http://localhost/@@/testbrowser/navigate.html?x=1')
+    browser.follow('Link Text')
+    browser.open('http://localhost/@@/testbrowser/forms.html')
+    browser.getForm(name='one').submit()
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def histogram(self, values):
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.add(value)
+        return histogram
+
+    def test_percentiles(self):
+        # exact below 128 microseconds
+        histogram = self.histogram([i / 1e6 for i in range(1, 101)])
+        self.assertEqual(histogram.percentile(50), 50 / 1e6)
+        self.assertEqual(histogram.percentile(99), 99 / 1e6)
+        self.assertEqual(histogram.percentile(100), 100 / 1e6)
+        self.assertIsNone(LatencyHistogram().percentile(50))
+
+        values = [i / 1000 for i in range(1, 1001)]
+        histogram = self.histogram(values)
+        for p in (1, 50, 90, 99, 99.9):
+            exact = values[int(p * 10) - 1]
+            self.assertAlmostEqual(
+                histogram.percentile(p), exact, delta=exact / 64)
+        self.assertEqual(histogram.percentile(100), 1.0)
+        self.assertEqual(histogram.count, 1000)
+        self.assertAlmostEqual(histogram.mean, 0.5005)
+        self.assertLess(len(histogram.buckets), 400)
+
+    def test_merge(self):
+        merged = self.histogram([0.001, 0.5])
+        merged.merge(self.histogram([0.002, 2.0]))
+        merged.merge(LatencyHistogram())
+        self.assertEqual(merged.buckets,
+                         self.histogram([0.001, 0.5, 0.002, 2.0]).buckets)
+        self.assertEqual((merged.count, merged.min, merged.max),
+                         (4, 0.001, 2.0))
+        self.assertAlmostEqual(merged.total, 2.503)
+
+
+class TestLoadRunner(unittest.TestCase):
+
+    def test_iterations(self):
+        app = CountingApp()
+        result = LoadRunner(scenario, app, users=3, iterations=2).run()
+        self.assertEqual(result.iterations, 6)
+        self.assertEqual(result.requests, 24)
+        self.assertEqual(result.errors, 0)
+        self.assertGreater(result.throughput, 0)
+        self.assertEqual(len(app.threads), 3)
+        self.assertEqual(sorted(result.urls), [
+            'http://localhost/@@/testbrowser/forms.html',
+            'http://localhost/@@/testbrowser/navigate.html'])
+        navigate = result.urls['http://localhost/@@/testbrowser/navigate.html']
+        self.assertEqual(navigate.count, 12)
+        stats = navigate.asDict()
+        self.assertLessEqual(stats['p50'], stats['p90'])
+        self.assertLessEqual(stats['p99'], stats['max'])
+        report = result.report()
+        self.assertIn('navigate.html', report)
+        self.assertIn('24 requests in', report)
+
+    def test_failures(self):
+        def failing(browser):
+            browser.open('http://localhost/@@/testbrowser/forms.html')
+            browser.open('http://localhost/set_status.html?status=500')
+
+        result = LoadRunner(failing, WSGITestApplication(), users=2).run()
+        self.assertEqual(result.requests, 4)
+        self.assertEqual(result.errors, 2)
+        self.assertEqual(
+            result.urls['http://localhost/set_status.html'].errors, 2)
+        self.assertEqual(list(result.failures.values()), [2])
+
+    def test_duration_rampup_and_think_time(self):
+        app = CountingApp()
+
+        def single(browser):
+            browser.open('http://localhost/@@/testbrowser/simple.html')
+
+        result = LoadRunner(single, app, users=2, duration=0.2, rampup=0.1,
+                            think_time=0.05).run()
+        # the second user starts after the first one
+        self.assertGreaterEqual(app.started[1] - app.started[0], 0.04)
+        self.assertGreaterEqual(result.seconds, 0.2)
+        # four or so requests per user
+        self.assertLess(result.requests, 12)
+        self.assertEqual(result.iterations, result.requests)
+
+
+class TestLoadBrowser(unittest.TestCase):
+
+    def test_redirect(self):
+        def app(environ, start_response):
+            if environ['PATH_INFO'] == '/slow':
+                time.sleep(0.2)
+                start_response('302 Found', [('Location', '/fast')])
+                return [b'']
+            start_response('200 OK', [('Content-Type', 'text/html')])
+            return [b'<html><title>fast</title></html>']
+
+        browser = LoadBrowser(wsgi_app=app)
+        browser.open('http://localhost/slow')
+        self.assertEqual(browser.title, 'fast')
+        [(url, seconds, failed)] = browser.samples
+        self.assertEqual(url, 'http://localhost/slow')
+        # the time of the redirected request is part of the sample
+        self.assertGreaterEqual(seconds, 0.2)
+        self.assertFalse(failed)
+
+
+def make_app():
+    return WSGITestApplication()
+
+
+def broken_app():
+    raise ValueError('no app')
+
+
+class TestProcessLoadRunner(unittest.TestCase):
+
+    def test_run(self):
+        result = ProcessLoadRunner(
+            scenario, make_app, processes=2, users=4, iterations=3).run()
+        self.assertEqual(result.iterations, 12)
+        self.assertEqual(result.requests, 48)
+        self.assertEqual(result.errors, 0)
+        self.assertEqual(
+            result.urls['http://localhost/@@/testbrowser/forms.html'].count,
+            24)
+        self.assertGreater(result.seconds, 0)
+
+    def test_streamed_reports(self):
+        runner = ProcessLoadRunner(scenario, make_app, processes=1,
+                                   duration=0.2)
+        runner.reportInterval = 0.05
+        result = runner.run()
+        self.assertGreater(result.iterations, 1)
+        self.assertEqual(result.requests, result.iterations * 4)
+
+    def test_failing_factory(self):
+        with self.assertRaises(RuntimeError) as err:
+            ProcessLoadRunner(scenario, broken_app, processes=1).run()
+        self.assertEqual(str(err.exception),
+                         "a load worker failed: ValueError('no app')")
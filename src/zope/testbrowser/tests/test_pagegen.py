@@ -0,0 +1,71 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Tests for zope.testbrowser.ftests.pagegen
+"""
+
+import unittest
+
+from zope.testbrowser.browser import Browser
+from zope.testbrowser.ftests.pagegen import PageApplication
+from zope.testbrowser.ftests.pagegen import make_page
+
+
+class TestPageApplication(unittest.TestCase):
+
+    def browser(self, url='http://localhost/', **shape):
+        browser = Browser(wsgi_app=PageApplication(**shape))
+        browser.open(url)
+        return browser
+
+    def test_shape(self):
+        browser = self.browser(forms=3, controls=4, links=7, selects=2,
+                               options=20, radio_groups=5, radios=3)
+        self.assertEqual(browser.title, 'Generated')
+        self.assertEqual(len(browser._response.forms), 3)
+        # controls, selects, radio groups and the submit button
+        self.assertEqual(len(browser._response.forms[2].fields), 4 + 2 + 5 + 1)
+        self.assertEqual(browser.getLink('Item 6').url,
+                         'http://localhost/item/6')
+        self.assertEqual(browser.getControl('Field 2.3').name, 'f2.c3')
+        select = browser.getControl('Select 2.1')
+        self.assertEqual(len(select.options), 20)
+        select.displayValue = ['Option 19']
+        self.assertEqual(select.value, ['19'])
+        radio = browser.getControl('Answer 2.4.2')
+        self.assertEqual((radio.control.name, radio.optionValue),
+                         ('f2.q4', '2'))
+
+    def test_nested_labels(self):
+        browser = self.browser(controls=3, nesting=50)
+        self.assertEqual(browser.getControl('Field 0.2').name, 'f0.c2')
+        self.assertIn('<span>' * 50 + 'Field 0.2', browser.contents)
+
+    def test_shape_in_query(self):
+        app = PageApplication(controls=1, cookies=3)
+        browser = Browser(wsgi_app=app)
+        browser.open('http://localhost/any/path?controls=2&links=0')
+        self.assertEqual(browser.getControl(name='f0.c1').value, 'value 1')
+        self.assertEqual(browser.contents.count('<a '), 0)
+        self.assertEqual(sorted(browser.cookies),
+                         ['cookie0', 'cookie1', 'cookie2'])
+        browser.open('http://localhost/?controls=2&links=0')
+        self.assertEqual(len(app.pages), 1)
+        browser.getForm().submit()
+        self.assertEqual(browser.url, 'http://localhost/')
+
+    def test_unknown_shape(self):
+        with self.assertRaises(TypeError) as err:
+            PageApplication(fields=3)
+        self.assertEqual(str(err.exception), 'unknown page shape: fields')
+        self.assertRaises(TypeError, make_page, links=1, tables=2)
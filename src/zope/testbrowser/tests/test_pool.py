@@ -0,0 +1,155 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Tests for zope.testbrowser.pool, against a local HTTP server
+"""
+
+import gc
+import http.server
+import threading
+import unittest
+
+from zope.testbrowser.browser import Browser
+from zope.testbrowser.pool import ConnectionPool
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.requests.append((self.client_address[1], self.path))
+        headers = {'Content-Type': 'text/html; charset=UTF-8'}
+        status = 200
+        body = b'<html><title>%s</title></html>' % self.path.encode()
+        if self.path == '/robots.txt':
+            status, body = 404, b''
+        elif self.path == '/redirect':
+            status, body = 302, b''
+            headers['Location'] = '/target'
+        elif self.path == '/close':
+            headers['Connection'] = 'close'
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.path == '/hangup':
+            # close the connection without announcing it
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Testing ..pool.ConnectionPool."""
+
+    def setUp(self):
+        super().setUp()
+        self.server = http.server.ThreadingHTTPServer(
+            ('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.server.requests = []
+        thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={'poll_interval': 0.01})
+        thread.daemon = True
+        thread.start()
+        self.base = 'http://127.0.0.1:%d' % self.server.server_port
+        self.pool = ConnectionPool()
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def connections(self):
+        return len({port for port, path in self.server.requests})
+
+    def test_browser_keeps_connection_alive(self):
+        browser = Browser()
+        browser.open(self.base + '/one')
+        browser.open(self.base + '/two')
+        browser.open(self.base + '/redirect')
+        self.assertEqual(browser.title, '/target')
+        self.assertEqual(
+            [path for port, path in self.server.requests],
+            ['/robots.txt', '/one', '/two', '/redirect', '/target'])
+        self.assertEqual(self.connections(), 1)
+        self.assertEqual(browser.stats['connections'], {
+            'requests': 5, 'connections': 1, 'reused': 4, 'idle': 1,
+            'busy': 0})
+        browser.close()
+        self.assertEqual(browser.stats['connections']['idle'], 0)
+
+    def test_shared_pool(self):
+        Browser.connectionPool = self.pool
+        try:
+            Browser().open(self.base + '/one')
+            browser = Browser()
+            browser.open(self.base + '/two')
+            browser.close()
+        finally:
+            Browser.connectionPool = None
+        self.assertEqual(self.connections(), 1)
+        # the shared pool is left open
+        self.assertEqual(self.pool.stats()['idle'], 1)
+        self.assertNotIn('connections', Browser(wsgi_app=object()).stats)
+
+    def test_discarded_browser(self):
+        browser = Browser()
+        browser.open(self.base + '/one')
+        pool = browser.connectionPool
+        self.assertEqual(pool.stats()['idle'], 1)
+        del browser
+        gc.collect()
+        self.assertEqual(pool.stats()['idle'], 0)
+
+    def test_connection_close(self):
+        self.pool.request('GET', self.base + '/close')
+        self.pool.request('GET', self.base + '/one')
+        self.assertEqual(self.connections(), 2)
+        self.assertEqual(self.pool.stats()['reused'], 0)
+
+    def test_retries_when_server_closed_connection(self):
+        self.pool.request('GET', self.base + '/hangup')
+        response, body = self.pool.request('GET', self.base + '/one')
+        self.assertEqual(body, b'<html><title>/one</title></html>')
+        self.assertEqual(self.connections(), 2)
+
+    def test_idle_timeout(self):
+        now = [0]
+        self.pool._now = lambda: now[0]
+        self.pool.request('GET', self.base + '/one')
+        now[0] += 29
+        self.pool.request('GET', self.base + '/two')
+        self.assertEqual(self.connections(), 1)
+        now[0] += 30
+        self.pool.request('GET', self.base + '/three')
+        self.assertEqual(self.connections(), 2)
+
+    def test_per_host_limit(self):
+        self.pool.maxsize = 1
+        key = ('http', '127.0.0.1', self.server.server_port)
+        conn, reused = self.pool._acquire(key)
+        thread = threading.Thread(
+            target=self.pool.request, args=('GET', self.base + '/one'))
+        thread.start()
+        thread.join(0.1)
+        self.assertTrue(thread.is_alive())
+        self.assertEqual(self.server.requests, [])
+        self.pool._release(key, conn, False)
+        thread.join()
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(self.pool.stats()['connections'], 2)
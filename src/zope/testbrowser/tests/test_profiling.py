@@ -0,0 +1,143 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Tests for zope.testbrowser.profiling
+"""
+
+import os
+import pstats
+import shutil
+import tempfile
+import unittest
+
+import zope.testbrowser.wsgi
+from zope.testbrowser.browser import Browser
+from zope.testbrowser.ftests.wsgitestapp import WSGITestApplication
+from zope.testbrowser.profiling import Profiler
+from zope.testbrowser.profiling import collapsed
+
+
+def render(environ, start_response):
+    start_response('200 OK', [('Content-Type', 'text/html; charset=UTF-8')])
+    return [page(environ['PATH_INFO']).encode('utf-8')]
+
+
+def page(path):
+    return '<html><body>%s</body></html>' % escape(path)
+
+
+def escape(text):
+    return text.replace('<', '&lt;')
+
+
+class ProfiledLayer(zope.testbrowser.wsgi.Layer):
+
+    def make_wsgi_app(self):
+        return render
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+        super().tearDown()
+
+    def test_browser(self):
+        browser = Browser(wsgi_app=render)
+        browser.profiler = profiler = Profiler()
+        browser.open('http://localhost/a?x=1')
+        browser.open('http://localhost/a?x=2')
+        browser.open('http://localhost/b')
+        self.assertEqual(sorted(profiler.profiles),
+                         ['http://localhost/a', 'http://localhost/b'])
+        stats = profiler.stats['http://localhost/a']
+        calls = {func[2]: nc for func, (cc, nc, tt, ct, callers)
+                 in stats.stats.items()}
+        self.assertEqual(calls['render'], 2)
+        self.assertEqual(calls['escape'], 2)
+
+        # the stacks of the application are rebuilt from the call graph
+        stacks = [line.rsplit(' ', 1)[0].split(';')
+                  for line in collapsed(stats)]
+        for stack in stacks:
+            if stack[-1].startswith('escape '):
+                self.assertEqual(
+                    [label.split(' ')[0] for label in stack[-3:]],
+                    ['render', 'page', 'escape'])
+                break
+        else:
+            self.fail('escape not in the collapsed stacks')
+
+        profiler.clear()
+        self.assertEqual(profiler.profiles, {})
+
+    def test_save(self):
+        browser = Browser(wsgi_app=WSGITestApplication())
+        browser.profiler = profiler = Profiler(self.tmp)
+        browser.open('http://localhost/@@/testbrowser/simple.html')
+        browser.open('http://localhost/redirect.html?to=/echo.html')
+        paths = profiler.save()
+        self.assertEqual(sorted(os.path.basename(path) for path in paths), [
+            '_total.collapsed', '_total.pstats',
+            'localhost_echo.html.collapsed', 'localhost_echo.html.pstats',
+            'localhost_redirect.html.collapsed',
+            'localhost_redirect.html.pstats',
+            'localhost_testbrowser_simple.html.collapsed',
+            'localhost_testbrowser_simple.html.pstats'])
+        total = pstats.Stats(os.path.join(self.tmp, '_total.pstats'))
+        self.assertIn('__call__', {func[2] for func in total.stats})
+        with open(os.path.join(self.tmp, '_total.collapsed')) as f:
+            line = f.readline()
+        stack, microseconds = line.rsplit(' ', 1)
+        self.assertGreater(int(microseconds), 0)
+
+    def test_nested_requests(self):
+        profiler = Profiler()
+
+        def app(environ, start_response):
+            if environ['PATH_INFO'] == '/outer':
+                inner = Browser(wsgi_app=render)
+                inner.profiler = profiler
+                inner.open('http://localhost/inner')
+            return render(environ, start_response)
+
+        browser = Browser(wsgi_app=app)
+        browser.profiler = profiler
+        browser.open('http://localhost/outer')
+        # the inner request is part of the profile of the outer one
+        self.assertEqual(list(profiler.profiles), ['http://localhost/outer'])
+
+    def test_layer(self):
+        layer = ProfiledLayer()
+        layer.profiler = Profiler(self.tmp)
+        layer.setUp()
+        try:
+            browser = zope.testbrowser.wsgi.Browser()
+            self.assertIs(browser.profiler, layer.profiler)
+            browser.open('http://localhost/page')
+            # the url passed to the browser is profiled, too
+            zope.testbrowser.wsgi.Browser('http://localhost/first')
+            self.assertEqual(sorted(layer.profiler.profiles), [
+                'http://localhost/first', 'http://localhost/page'])
+        finally:
+            layer.tearDown()
+        self.assertIsNone(zope.testbrowser.wsgi.Browser(
+            wsgi_app=render).profiler)
+        self.assertEqual(sorted(os.listdir(self.tmp)), [
+            '_total.collapsed', '_total.pstats',
+            'localhost_first.collapsed', 'localhost_first.pstats',
+            'localhost_page.collapsed', 'localhost_page.pstats'])
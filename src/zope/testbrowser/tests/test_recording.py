@@ -0,0 +1,164 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Tests for zope.testbrowser.recording
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+
+from zope.testbrowser.asyncbrowser import AsyncBrowser
+from zope.testbrowser.browser import Browser
+from zope.testbrowser.ftests.wsgitestapp import WSGITestApplication
+from zope.testbrowser.httpcache import HTTPCache
+from zope.testbrowser.recording import Recorder
+from zope.testbrowser.recording import Replayer
+from zope.testbrowser.recording import load
+
+
+class SessionApp:
+    """Sets a session cookie and requires it afterwards."""
+
+    def __init__(self):
+        self.sessions = 0
+
+    def __call__(self, environ, start_response):
+        headers = [('Content-Type', 'text/html; charset=UTF-8')]
+        if environ['PATH_INFO'] == '/login':
+            self.sessions += 1
+            headers.append(('Set-Cookie', 'session=%d' % self.sessions))
+            status = '200 OK'
+        elif environ.get('HTTP_COOKIE') == 'session=%d' % self.sessions:
+            status = '200 OK'
+        else:
+            status = '403 Forbidden'
+        start_response(status, headers)
+        return [b'<html></html>']
+
+
+class TestRecorder(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.browser = Browser(wsgi_app=WSGITestApplication())
+        self.browser.recorder = self.recorder = Recorder()
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+        super().tearDown()
+
+    def browse(self):
+        browser = self.browser
+        browser.open('http://localhost/set_cookie.html?name=foo&value=bar')
+        browser.open('http://localhost/redirect.html?to=/echo.html')
+        browser.open('http://localhost/@@/testbrowser/forms.html')
+        browser.post('http://localhost/echo.html',
+                     'text-value=Gr%C3%B6%C3%9Fe')
+
+    def test_record(self):
+        self.browse()
+        requests = self.recorder.requests
+        self.assertEqual(
+            [(r.method, r.url, r.status) for r in requests], [
+                ('GET', 'http://localhost/set_cookie.html'
+                 '?name=foo&value=bar', 200),
+                ('GET', 'http://localhost/redirect.html?to=/echo.html', 302),
+                ('GET', 'http://localhost/echo.html', 200),
+                ('GET', 'http://localhost/@@/testbrowser/forms.html', 200),
+                ('POST', 'http://localhost/echo.html', 200)])
+        self.assertIsNone(requests[0].cookies)
+        self.assertEqual(requests[1].cookies, 'foo=bar')
+        self.assertIn(('Cookie', 'foo=bar'), requests[2].headers)
+        self.assertEqual(requests[4].body, b'text-value=Gr%C3%B6%C3%9Fe')
+        self.assertLessEqual(requests[0].offset, requests[1].offset)
+        self.assertGreater(requests[0].seconds, 0)
+
+    def test_cached_responses_are_not_recorded(self):
+        self.browser.httpCache = HTTPCache()
+        self.browser.open('http://localhost/set_header.html'
+                          '?Cache-Control=max-age%3D60')
+        self.browser.open('http://localhost/set_header.html'
+                          '?Cache-Control=max-age%3D60')
+        self.assertEqual(len(self.recorder.requests), 1)
+
+    def test_async_browser(self):
+        async def session():
+            browser = AsyncBrowser(wsgi_app=WSGITestApplication())
+            browser.recorder = self.recorder
+            await browser.open(
+                'http://localhost/redirect.html?to=/echo.html')
+
+        asyncio.run(session())
+        self.assertEqual([r.status for r in self.recorder.requests],
+                         [302, 200])
+
+    def test_save_and_load(self):
+        self.browse()
+        self.recorder.requests[0].body = b'\xff\x00'
+        self.recorder.requests[4].body = 'Größe'.encode()
+        path = os.path.join(self.tmp, 'session.jsonl.gz')
+        self.recorder.save(path)
+        loaded = load(path)
+        self.assertEqual(
+            [r.asDict() for r in loaded],
+            [r.asDict() for r in self.recorder.requests])
+        self.assertEqual(loaded[0].body, b'\xff\x00')
+        self.assertEqual(loaded[1].body, b'')
+        self.assertEqual(loaded[4].body, 'Größe'.encode())
+
+        self.recorder.clear()
+        self.assertEqual(self.recorder.requests, [])
+
+
+class TestReplayer(unittest.TestCase):
+
+    def record(self, app):
+        browser = Browser(wsgi_app=app)
+        browser.recorder = recorder = Recorder()
+        browser.open('http://localhost/login')
+        browser.open('http://localhost/page?x=1')
+        browser.open('http://localhost/page?x=2')
+        return recorder.requests
+
+    def test_replay(self):
+        requests = self.record(SessionApp())
+        app = SessionApp()
+        result = Replayer(requests, app, sessions=6, concurrency=3).run()
+        self.assertEqual(result.requests, 18)
+        self.assertEqual(result.iterations, 6)
+        self.assertEqual(sorted(result.urls), [
+            'http://localhost/login', 'http://localhost/page'])
+        self.assertEqual(result.urls['http://localhost/page'].count, 12)
+        self.assertEqual(len(result.timings), 18)
+        self.assertEqual(sorted({t[0] for t in result.timings}),
+                         list(range(6)))
+        self.assertEqual(app.sessions, 6)
+
+    def test_replay_sequential_sessions_with_cookie_jar(self):
+        requests = self.record(SessionApp())
+        result = Replayer(requests, SessionApp(), sessions=2).run()
+        self.assertEqual(result.errors, 0)
+        self.assertEqual([t[3] for t in result.timings], [200] * 6)
+
+    def test_recorded_cookies(self):
+        requests = self.record(SessionApp())
+        app = SessionApp()
+        app.sessions = 5
+        result = Replayer(requests, app, cookies=False).run()
+        # the recorded session is unknown to the application
+        self.assertEqual([t[3] for t in result.timings], [200, 403, 403])
+        self.assertEqual(result.errors, 2)
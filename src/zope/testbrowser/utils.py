@@ -20,6 +20,7 @@ import re
 import time
 import urllib.parse
 from calendar import timegm
+from contextlib import nullcontext
 
 
 strict_re = re.compile(r"^[SMTWF][a-z][a-z], (\d\d) ([JFMASOND][a-z][a-z]) "
@@ -227,3 +228,66 @@ def effective_request_host(request):
     if '.' not in erhn and not IPV4_RE.search(erhn):
         erhn = erhn + ".local"
     return erhn
+
+
+def parse_cache_control(value):
+    """Parse a ``Cache-Control`` header value into a dictionary.
+
+    Directive names are lowercased.  Directives without an argument map to
+    ``None``, quoted arguments are unquoted.
+    """
+    directives = {}
+    if not value:
+        return directives
+    for part in value.split(','):
+        name, sep, arg = part.strip().partition('=')
+        name = name.strip().lower()
+        if not name:
+            continue
+        directives[name] = arg.strip().strip('"') if sep else None
+    return directives
+
+
+def freshness_lifetime(headers, now, default):
+    """Return for how many seconds a response with `headers` is fresh.
+
+    ``Cache-Control: max-age`` takes precedence over ``Expires``; ``no-store``
+    and ``no-cache`` make a response stale right away.  If neither header is
+    present, `default` is returned.
+    """
+    directives = parse_cache_control(headers.get('Cache-Control'))
+    if 'no-store' in directives or 'no-cache' in directives:
+        return 0
+    if 'max-age' in directives:
+        try:
+            return max(0, int(directives['max-age']))
+        except (TypeError, ValueError):
+            return 0
+    expires = headers.get('Expires')
+    if expires is not None:
+        expires = http2time(expires)
+        if expires is None:
+            # invalid dates mean "already expired", RFC 9111, 5.3
+            return 0
+        return max(0, expires - now)
+    return default
+
+
+def timed(timings, name, detail=None):
+    """Time a phase of a request if there are `timings` to record it in.
+
+    `timings` is a ``zope.testbrowser.browser.RequestTimings`` or None.
+    """
+    if timings is None:
+        return nullcontext()
+    return timings.phase(name, detail)
+
+
+def traced(memory, name):
+    """Trace the memory of a phase if there is `memory` to record it in.
+
+    `memory` is a ``zope.testbrowser.browser.RequestMemory`` or None.
+    """
+    if memory is None:
+        return nullcontext()
+    return memory.phase(name)
@@ -28,6 +28,9 @@ class Browser(zope.testbrowser.browser.Browser):
         if wsgi_app is None:
             raise AssertionError("wsgi_app not provided or "
                                  "zope.testbrowser.wsgi.Layer not setup")
+        if _PROFILER is not None:
+            # before the url is opened, so that its request is profiled, too
+            self.profiler = _PROFILER
         super().__init__(url, wsgi_app)
 
 
@@ -84,6 +87,7 @@ class AuthorizationMiddleware:
 
 
 _APP_UNDER_TEST = None  # setup and torn down by the Layer class
+_PROFILER = None  # the profiler of the layer set up, if any
 
 
 class Layer:
@@ -98,6 +102,11 @@ class Layer:
     __bases__ = ()
     __name__ = 'Layer'
 
+    # A zope.testbrowser.profiling.Profiler for the browsers of the layer.
+    # Its profiles are saved when the layer is torn down if it has a
+    # directory.
+    profiler = None
+
     @classmethod
     def get_app(cls):
         return _APP_UNDER_TEST
@@ -115,14 +124,18 @@ class Layer:
 
     def setUp(self):
         self.cooperative_super('setUp')
-        global _APP_UNDER_TEST
+        global _APP_UNDER_TEST, _PROFILER
         if _APP_UNDER_TEST is not None:
             raise AssertionError("Already Setup")
         _APP_UNDER_TEST = self.make_wsgi_app()
+        _PROFILER = self.profiler
 
     def tearDown(self):
-        global _APP_UNDER_TEST
+        global _APP_UNDER_TEST, _PROFILER
         _APP_UNDER_TEST = None
+        _PROFILER = None
+        if self.profiler is not None and self.profiler.directory:
+            self.profiler.save()
         self.cooperative_super('tearDown')
 
 
@@ -145,6 +158,10 @@ class TestBrowserLayer:
 
     """
 
+    # A zope.testbrowser.profiling.Profiler for the browsers of the layer,
+    # aggregating over all tests.  Call its `save` to write the profiles.
+    profiler = None
+
     def cooperative_super(self, method_name):
         # Calling `super` for multiple inheritance:
         method = getattr(super(), method_name, None)
@@ -158,12 +175,14 @@ class TestBrowserLayer:
 
     def testSetUp(self):
         self.cooperative_super('testSetUp')
-        global _APP_UNDER_TEST
+        global _APP_UNDER_TEST, _PROFILER
         if _APP_UNDER_TEST is not None:
             raise AssertionError("Already Setup")
         _APP_UNDER_TEST = self.make_wsgi_app()
+        _PROFILER = self.profiler
 
     def testTearDown(self):
-        global _APP_UNDER_TEST
+        global _APP_UNDER_TEST, _PROFILER
         _APP_UNDER_TEST = None
+        _PROFILER = None
         self.cooperative_super('testTearDown')